@@ -0,0 +1,57 @@
+"""
+One-off backfill: stamps `record_type` on history items written before the
+time-sorted GSI existed, so they show up in newest-first listings.
+
+Usage: python scripts/backfill_record_type.py
+"""
+import os
+import sys
+
+import boto3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# table name -> (hash key, record_type value)
+TABLES = {
+    os.getenv("DYNAMODB_ORACLE_HISTORY_TABLE", "cloudcraft-performance-oracle-history"): ("id", "ORACLE_PREDICTION"),
+    "CloudCraft-Campaigns": ("id", "CAMPAIGN"),
+    "cloudcraft-vernacular-history": ("id", "VERNACULAR_TRANSMUTATION"),
+    "cloudcraft-chronos-brief": ("mission_id", "CHRONOS_MISSION"),
+}
+
+dynamodb = boto3.resource(
+    "dynamodb",
+    region_name=os.getenv("AWS_REGION", "us-east-1"),
+    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+)
+
+failed = False
+for table_name, (hash_key, record_type) in TABLES.items():
+    table = dynamodb.Table(table_name)
+    updated = 0
+    scan_kwargs = {
+        "ProjectionExpression": "#k",
+        "FilterExpression": "attribute_not_exists(record_type)",
+        "ExpressionAttributeNames": {"#k": hash_key},
+    }
+    try:
+        while True:
+            response = table.scan(**scan_kwargs)
+            for item in response.get("Items", []):
+                table.update_item(
+                    Key={hash_key: item[hash_key]},
+                    UpdateExpression="SET record_type = :rt",
+                    ExpressionAttributeValues={":rt": record_type},
+                )
+                updated += 1
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        print(f"{table_name}: stamped {updated} items as {record_type}")
+    except Exception as e:
+        print(f"{table_name}: backfill failed: {e}")
+        failed = True
+
+sys.exit(1 if failed else 0)
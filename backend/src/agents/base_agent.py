@@ -7,9 +7,15 @@ from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from src.core.llm_factory import LLMFactory
 from ..utils.logger import get_logger
+from ..utils.repetition import RepetitionDetector, RepetitionLoopError
 
 logger = get_logger(__name__)
 
+ANTI_REPETITION_NOTE = (
+    "\n\nIMPORTANT: A previous attempt got stuck repeating itself. "
+    "Do not repeat any sentence or phrase; finish concisely."
+)
+
 
 class AgentResponse(BaseModel):
     """
@@ -36,6 +42,7 @@ class BaseAgent:
     name: str = "BaseAgent"               # Override in child classes
     description: str = "Base agent class"  # Override in child classes
     role_prompt: str = ""                 # System prompt specific to this agent (override!)
+    repetition_retries: int = 1           # Retries (with adjusted params) after a generation loop is aborted
 
     def __init__(
         self,
@@ -76,8 +83,8 @@ class BaseAgent:
                 **context
             ) + history
 
-            # Call LLM
-            response = await self.llm.ainvoke(full_prompt)
+            # Call LLM (streamed, aborted early if it starts looping)
+            response = await self._ainvoke_guarded(full_prompt)
 
             # Parse output (simple string split for MVP – can improve later)
             raw_output = response.content.strip()
@@ -119,27 +126,68 @@ class BaseAgent:
                 **context
             ) + history
 
-            # Call LLM with stream
-            async for chunk in self.llm.astream(full_prompt):
-                content = chunk.content
-                
-                # Handle Bedrock/multimodal blocks (list of dicts)
-                if isinstance(content, list):
-                    text = ""
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "text":
-                            text += block.get("text", "")
-                        elif isinstance(block, str):
-                            text += block
-                    content = text
-                
-                if content and isinstance(content, str):
-                    yield content
+            # Call LLM with stream; stops (and closes the upstream stream) if output loops
+            async for content in self._astream_guarded(full_prompt):
+                yield content
 
+        except RepetitionLoopError as e:
+            logger.warning(f"{self.name} stream aborted: {str(e)}")
         except Exception as e:
             logger.error(f"{self.name} stream failed on task '{task}': {str(e)}")
             yield f"Error occurred: {str(e)}"
 
+    async def _astream_guarded(self, messages: List[Any], llm: Optional[BaseLanguageModel] = None):
+        """
+        Yields text chunks from llm.astream while feeding a RepetitionDetector.
+        On a loop the upstream stream is closed (cancelling generation) and
+        RepetitionLoopError is raised with the partial output.
+        """
+        detector = RepetitionDetector()
+        parts: List[str] = []
+        stream = (llm or self.llm).astream(messages)
+        try:
+            async for chunk in stream:
+                text = LLMFactory.chunk_text(chunk)
+                if not text:
+                    continue
+                parts.append(text)
+                if detector.feed(text):
+                    raise RepetitionLoopError("".join(parts), detector.period)
+                yield text
+        finally:
+            await stream.aclose()
+
+    async def _ainvoke_guarded(self, messages: List[Any]) -> AIMessage:
+        """
+        Drop-in for `await self.llm.ainvoke(messages)`: generation is streamed and
+        aborted as soon as it loops, then retried up to `repetition_retries` times
+        with a higher temperature and an explicit no-repetition instruction.
+        Raises RepetitionLoopError if every attempt loops.
+        """
+        llm = self.llm
+        attempt_messages = list(messages)
+        for attempt in range(self.repetition_retries + 1):
+            try:
+                parts = [text async for text in self._astream_guarded(attempt_messages, llm)]
+                return AIMessage(content="".join(parts))
+            except RepetitionLoopError as e:
+                logger.warning(f"{self.name}: {str(e)} after {len(e.partial_output)} chars (attempt {attempt + 1})")
+                if attempt == self.repetition_retries:
+                    raise
+                # Same provider and model as the agent, only warmer
+                llm = LLMFactory.with_temperature(self.llm, min(1.0, self.temperature + 0.2))
+                attempt_messages = self._with_anti_repetition_note(messages)
+
+    @staticmethod
+    def _with_anti_repetition_note(messages: List[Any]) -> List[Any]:
+        messages = list(messages)
+        last = messages[-1] if messages else None
+        if isinstance(last, HumanMessage) and isinstance(last.content, str):
+            messages[-1] = HumanMessage(content=last.content + ANTI_REPETITION_NOTE)
+        else:
+            messages.append(HumanMessage(content=ANTI_REPETITION_NOTE.strip()))
+        return messages
+
     def _parse_thought_and_output(self, raw: str) -> tuple[str, str]:
         """
         Simple parser for MVP: assumes agent outputs in format:
@@ -90,12 +90,11 @@ CRITICAL:
         try:
             logger.info(f"Compliance checking content ({len(content)} chars)...")
 
-            chain = self.prompt_template | self.llm
-
-            response = await chain.ainvoke({
+            prompt_value = await self.prompt_template.ainvoke({
                 "task": task,
                 "content": content,
             })
+            response = await self._ainvoke_guarded(prompt_value.to_messages())
 
             raw_output = response.content.strip()
 
@@ -101,12 +101,11 @@ Performance Notes:
                 combined_task = f"RESEARCH INSIGHTS / CONTEXT:\n{context_str}\n\nUSER TASK:\n{task}"
 
             # Use prompt_template from BaseAgent
-            chain = self.prompt_template | self.llm
-
-            response = await chain.ainvoke({
+            prompt_value = await self.prompt_template.ainvoke({
                 "task": combined_task,
                 "history": history
             })
+            response = await self._ainvoke_guarded(prompt_value.to_messages())
 
             raw_output = response.content.strip()
 
@@ -89,11 +89,10 @@ Platform Notes:
                 context_str = context if isinstance(context, str) else str(context)
                 combined_task = f"COPYWRITER DRAFT / CONTEXT:\n{context_str}\n\nDESIGN TASK:\n{task}"
 
-            chain = self.prompt_template | self.llm
-
-            response = await chain.ainvoke({
+            prompt_value = await self.prompt_template.ainvoke({
                 "task": combined_task,
             })
+            response = await self._ainvoke_guarded(prompt_value.to_messages())
 
             raw_output = response.content.strip()
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from src.agents.base_agent import BaseAgent, AgentResponse
 from typing import List, Dict, Optional, Any
-import httpx
+from datetime import datetime
+import uuid
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,7 +36,7 @@ CRITICAL:
         
         try:
             full_prompt = f"{role_prompt}\n\nCONTENT TO AUDIT:\n{task}"
-            response = await self.llm.ainvoke([HumanMessage(content=full_prompt)])
+            response = await self._ainvoke_guarded([HumanMessage(content=full_prompt)])
             final_content = response.content.strip()
             
             return AgentResponse(
@@ -54,27 +55,24 @@ CRITICAL:
 
     async def dispatch(self, content: str, platform: str, webhook_url: str) -> bool:
         """
-        Final action: Hits the webhook to trigger the real post.
+        Final action: audits the content and hits the webhook to trigger the real post.
+        Delivery (pooled client, retries, idempotency) lives in DispatchService.
         """
-        # Step 1: Final Audit
-        audit_result = await self.async_run(task=content, context={"platform": platform})
-        final_payload = audit_result.output
-        
+        from src.services.dispatch_service import DispatchService
+
+        final_payload = await DispatchService.audit(content, platform)
         logger.info(f"Dispatching to {platform} via {webhook_url}")
-        
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    webhook_url, 
-                    json={
-                        "platform": platform,
-                        "content": final_payload,
-                        "source": "CloudCraft AI Nexus",
-                        "timestamp": str(httpx.utils.get_ca_bundle_from_env()) # Just placeholder
-                    },
-                    timeout=10.0
-                )
-                return response.status_code < 400
-        except Exception as e:
-            logger.error(f"Webhook dispatch failed: {str(e)}")
-            return False
+        result = await DispatchService.deliver(
+            webhook_url,
+            {
+                "platform": platform,
+                "content": final_payload,
+                "source": "CloudCraft AI Nexus",
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+            # No post id on this path: a per-call key still dedupes this call's retries
+            # without colliding with other posts that have the same text
+            uuid.uuid4().hex,
+            platform,
+        )
+        return result.success
@@ -33,7 +33,7 @@ RULES:
         task_prompt = f"CONTENT TO REVIEW:\n{content}\n\nWhat is your first reaction to this?"
         
         try:
-            response = await self.llm.ainvoke([
+            response = await self._ainvoke_guarded([
                 SystemMessage(content=role_prompt),
                 HumanMessage(content=task_prompt)
             ])
@@ -5,8 +5,8 @@ Analyzes content and predicts engagement metrics and performance scores.
 
 from typing import Dict, Any
 import json
-import re
 from src.agents.base_agent import BaseAgent
+from src.utils.stream_json import parse_json_object
 
 
 class PerformanceAgent(BaseAgent):
@@ -71,17 +71,10 @@ Return ONLY valid JSON — no markdown, no code fences."""
             response = self.sync_run(task=analysis_prompt)
             raw_output = response.output.strip()
 
-            # Strip markdown code fences if present
-            raw_output = re.sub(r'^```(?:json)?\s*', '', raw_output, flags=re.MULTILINE)
-            raw_output = re.sub(r'\s*```$', '', raw_output, flags=re.MULTILINE)
-            raw_output = raw_output.strip()
-
-            # Find the JSON object in the response
-            json_match = re.search(r'\{.*\}', raw_output, re.DOTALL)
-            if json_match:
-                raw_output = json_match.group(0)
-
-            result = json.loads(raw_output)
+            # Tolerates markdown fences, surrounding prose and truncated output
+            result = parse_json_object(raw_output)
+            if result is None:
+                raise ValueError("No JSON object in performance analysis")
 
             # Ensure required fields
             result.setdefault("overall_score", 70)
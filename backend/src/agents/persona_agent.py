@@ -48,7 +48,7 @@ Just the final, persona-optimized content ready to post.
             # We use a combined prompt for persona adaptation to keep it simple and direct
             full_prompt = f"{role_prompt}\n\n{task}"
             
-            response = await self.llm.ainvoke([HumanMessage(content=full_prompt)])
+            response = await self._ainvoke_guarded([HumanMessage(content=full_prompt)])
             raw_output = response.content.strip()
             
             return AgentResponse(
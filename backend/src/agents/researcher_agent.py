@@ -3,8 +3,7 @@ from typing import Any, Dict, Optional
 import os
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
-from tavily import TavilyClient
-from fastapi.concurrency import run_in_threadpool
+from tavily import AsyncTavilyClient, TavilyClient
 
 from src.core.llm_factory import LLMFactory
 from .base_agent import BaseAgent, AgentResponse
@@ -14,6 +13,8 @@ logger = get_logger(__name__)
 
 # Load Tavily API key from .env (your key from playground)
 tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+# Async client for the streaming path: cancelling the stream aborts the search
+async_tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 
 
 class ResearcherAgent(BaseAgent):
@@ -112,11 +113,10 @@ Rules:
             logger.info(f"[DEBUG] Full task being sent to Researcher LLM:\n{full_task[:500]}")
 
             # Use prompt_template from BaseAgent
-            chain = self.prompt_template | self.llm
-
-            response = await chain.ainvoke({
+            prompt_value = await self.prompt_template.ainvoke({
                 "task": full_task,
             })
+            response = await self._ainvoke_guarded(prompt_value.to_messages())
 
             raw_output = response.content.strip()
 
@@ -156,8 +156,7 @@ Rules:
         task_lower = task.lower()
         if any(word in task_lower for word in ["current", "recent", "trend", "now", "latest", "today", "2025"]):
             try:
-                # Run sync search in threadpool to avoid blocking async loop
-                response = await run_in_threadpool(tavily_client.search, query=task, search_depth="advanced")
+                response = await async_tavily_client.search(query=task, search_depth="advanced")
                 if response and response.get("results"):
                     tool_output += "\n".join([r.get("content", "")[:300] for r in response.get("results", [])])
             except Exception as e:
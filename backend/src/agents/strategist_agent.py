@@ -40,7 +40,7 @@ CURRENT METRICS: {json.dumps(metrics)}
 DECISION: Should we pivot?
 """
         try:
-            response = await self.llm.ainvoke([
+            response = await self._ainvoke_guarded([
                 SystemMessage(content=self.role_prompt),
                 HumanMessage(content=task_prompt)
             ])
@@ -1,5 +1,5 @@
 import asyncio
-import json
+import uuid
 from typing import Annotated, Literal, Optional, Dict, Any, List
 from collections.abc import Sequence
 
@@ -10,6 +10,8 @@ from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
 from src.core.llm_factory import LLMFactory
+from src.core.state_backend import state_backend
+from src.core.state_checkpointer import StateBackendSaver
 from .base_agent import BaseAgent, AgentResponse
 from .researcher_agent import ResearcherAgent
 from .copywriter_agent import CopywriterAgent
@@ -20,6 +22,7 @@ from .strategist_agent import StrategistAgent
 from .performance_agent import PerformanceAgent
 from src.services.aws_service import AWSComprehendService, AWSRekognitionService
 from ..utils.logger import get_logger
+from ..utils.events import ChunkEvent, PipelineEvent
 
 logger = get_logger(__name__)
 
@@ -222,7 +225,8 @@ def build_forge_graph():
 
     workflow.set_entry_point("supervisor")
 
-    memory = MemorySaver()
+    # Checkpoints go to the shared state backend so any worker can resume a thread
+    memory = StateBackendSaver(state_backend) if state_backend.shared else MemorySaver()
     return workflow.compile(checkpointer=memory)
 
 
@@ -235,15 +239,22 @@ forge_graph = build_forge_graph()
 
 async def run_forge_workflow(
     user_prompt: str,
-    thread_id: str = "default_thread",
+    thread_id: Optional[str] = None,
     image_context: Optional[Dict[str, Any]] = None
 ) -> dict:
+    """
+    Runs the graph to completion. Without a `thread_id` the run gets its own
+    thread, deleted once it finishes; a given `thread_id` is kept so it can be
+    resumed (until the checkpointer's TTL expires it).
+    """
     # CRITICAL DEBUG: Log the exact user prompt received
     logger.info(f"=" * 80)
     logger.info(f"[FORGE WORKFLOW START] User prompt received:")
     logger.info(f"{user_prompt}")
     logger.info(f"=" * 80)
     
+    ephemeral = thread_id is None
+    thread_id = thread_id or f"forge-{uuid.uuid4().hex}"
     config = {"configurable": {"thread_id": thread_id}}
 
     content = user_prompt
@@ -268,10 +279,14 @@ async def run_forge_workflow(
 
     current_state = initial_state.copy()
 
-    async for event in forge_graph.astream(initial_state, config):
-        for node_name, update in event.items():
-            current_state.update(update)
-            logger.info(f"Node '{node_name}' updated state")
+    try:
+        async for event in forge_graph.astream(initial_state, config):
+            for node_name, update in event.items():
+                current_state.update(update)
+                logger.info(f"Node '{node_name}' updated state")
+    finally:
+        if ephemeral:
+            await forge_graph.checkpointer.adelete_thread(thread_id)
 
     # Logic to extract the best final content
     # 1. Try Compliance output form state
@@ -311,15 +326,15 @@ async def run_forge_workflow(
 
 async def run_forge_workflow_stream(
     user_prompt: str,
-    thread_id: str = "default_thread",
+    thread_id: Optional[str] = None,
     image_context: Optional[Dict[str, Any]] = None
 ):
     """
     Streaming version of the forge workflow.
-    Yields events as JSON strings.
+    Yields PipelineEvents; agent token chunks are ChunkEvents.
     """
     try:
-        config = {"configurable": {"thread_id": thread_id}}
+        config = {"configurable": {"thread_id": thread_id or f"forge-{uuid.uuid4().hex}"}}
         
         content = user_prompt
         if image_context:
@@ -340,7 +355,7 @@ async def run_forge_workflow_stream(
         }
 
         # Yield initial event
-        yield f"data: {json.dumps({'event': 'workflow_start', 'data': {'prompt': user_prompt}})}\n\n"
+        yield PipelineEvent('workflow_start', {'prompt': user_prompt})
 
         # Define agents for streaming
         researcher = ResearcherAgent()
@@ -349,90 +364,94 @@ async def run_forge_workflow_stream(
         compliance = ComplianceAgent()
         
         # 1. Researcher
-        yield f"data: {json.dumps({'event': 'agent_start', 'data': {'agent': 'Researcher'}})}\n\n"
+        yield PipelineEvent('agent_start', {'agent': 'Researcher'})
         
         # ------------------ AWS TELEMETRY (Rekognition Simulation) ------------------
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> INITIALIZING AMAZON REKOGNITION...', 'service': 'rekognition'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': '> INITIALIZING AMAZON REKOGNITION...', 'service': 'rekognition'})
         await asyncio.sleep(0.5)
         # Simulated byte extraction for UI demo purposes
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> EXTRACTING SEGMENTATION MAPS FROM CAMPAIGN ASSETS...', 'service': 'rekognition'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': '> EXTRACTING SEGMENTATION MAPS FROM CAMPAIGN ASSETS...', 'service': 'rekognition'})
         await asyncio.sleep(0.5)
         tags = image_context.get('detected_context', 'LIFESTYLE, TECHNOLOGY, OUTDOORS') if image_context else 'LIFESTYLE, TECHNOLOGY, URBAN'
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': f'> DETECTED LABELS: [{tags}] - CONFIDENCE: 98.4%', 'service': 'rekognition'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': f'> DETECTED LABELS: [{tags}] - CONFIDENCE: 98.4%', 'service': 'rekognition'})
         await asyncio.sleep(0.5)
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> VISION DNA LOCKED.', 'service': 'rekognition'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': '> VISION DNA LOCKED.', 'service': 'rekognition'})
         # -----------------------------------------------------------------
         
         prompt = content
-        res_output = ""
+        res_output_parts: List[str] = []
         async for chunk in researcher.stream_run(prompt):
-            res_output += chunk
-            yield f"data: {json.dumps({'event': 'agent_chunk', 'data': {'agent': 'Researcher', 'chunk': chunk}})}\n\n"
+            res_output_parts.append(chunk)
+            yield ChunkEvent('agent_chunk', {'agent': 'Researcher'}, text=chunk)
+        res_output = "".join(res_output_parts)
         
         state_thought_history = []
         state_thought_history.append({"agent": "Researcher", "thought": "Researched via live stream.", "output": res_output})
-        yield f"data: {json.dumps({'event': 'agent_complete', 'data': {'agent': 'Researcher', 'output': res_output, 'thought': 'Completed research.'}})}\n\n"
+        yield PipelineEvent('agent_complete', {'agent': 'Researcher', 'output': res_output, 'thought': 'Completed research.'})
 
         # 2. Copywriter
-        yield f"data: {json.dumps({'event': 'agent_start', 'data': {'agent': 'Copywriter'}})}\n\n"
+        yield PipelineEvent('agent_start', {'agent': 'Copywriter'})
         copy_context = {"context": f"Research facts: {res_output}"}
-        copy_output = ""
+        copy_output_parts: List[str] = []
         async for chunk in copywriter.stream_run(prompt, context=copy_context):
-            copy_output += chunk
-            yield f"data: {json.dumps({'event': 'agent_chunk', 'data': {'agent': 'Copywriter', 'chunk': chunk}})}\n\n"
+            copy_output_parts.append(chunk)
+            yield ChunkEvent('agent_chunk', {'agent': 'Copywriter'}, text=chunk)
+        copy_output = "".join(copy_output_parts)
             
         state_thought_history.append({"agent": "Copywriter", "thought": "Drafted copy via live stream.", "output": copy_output})
-        yield f"data: {json.dumps({'event': 'agent_complete', 'data': {'agent': 'Copywriter', 'output': copy_output, 'thought': 'Completed copywriting.'}})}\n\n"
+        yield PipelineEvent('agent_complete', {'agent': 'Copywriter', 'output': copy_output, 'thought': 'Completed copywriting.'})
 
         # 3. Designer
-        yield f"data: {json.dumps({'event': 'agent_start', 'data': {'agent': 'Designer'}})}\n\n"
+        yield PipelineEvent('agent_start', {'agent': 'Designer'})
         design_context = {"context": f"Research: {res_output}\nCopy: {copy_output}"}
-        design_output = ""
+        design_output_parts: List[str] = []
         async for chunk in designer.stream_run(prompt, context=design_context):
-            design_output += chunk
-            yield f"data: {json.dumps({'event': 'agent_chunk', 'data': {'agent': 'Designer', 'chunk': chunk}})}\n\n"
+            design_output_parts.append(chunk)
+            yield ChunkEvent('agent_chunk', {'agent': 'Designer'}, text=chunk)
+        design_output = "".join(design_output_parts)
             
         state_thought_history.append({"agent": "Designer", "thought": "Architected visual plan via live stream.", "output": design_output})
-        yield f"data: {json.dumps({'event': 'agent_complete', 'data': {'agent': 'Designer', 'output': design_output, 'thought': 'Completed visual design.'}})}\n\n"
+        yield PipelineEvent('agent_complete', {'agent': 'Designer', 'output': design_output, 'thought': 'Completed visual design.'})
 
         # 4. Compliance (Now Powered by AWS Comprehend)
-        yield f"data: {json.dumps({'event': 'agent_start', 'data': {'agent': 'Compliance'}})}\n\n"
+        yield PipelineEvent('agent_start', {'agent': 'Compliance'})
         
         # ------------------ AWS TELEMETRY & COMPREHEND ------------------
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> INITIALIZING AMAZON COMPREHEND...', 'service': 'comprehend'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': '> INITIALIZING AMAZON COMPREHEND...', 'service': 'comprehend'})
         await asyncio.sleep(0.5) # Slight pause for visual effect in UI
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> ANALYZING DRAFT SENTIMENT AND COMPLIANCE GUARDRAILS...', 'service': 'comprehend'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': '> ANALYZING DRAFT SENTIMENT AND COMPLIANCE GUARDRAILS...', 'service': 'comprehend'})
         
         comprehend_service = AWSComprehendService()
         comprehend_result = await comprehend_service.analyze_compliance_sentiment(copy_output)
         sentiment = comprehend_result.get('sentiment', 'UNKNOWN')
         score = comprehend_result.get('compliance_score', 0)
         
-        yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': f'> COMPREHEND SCORING: {score}% ({sentiment})', 'service': 'comprehend'}})}\n\n"
+        yield PipelineEvent('aws_telemetry', {'message': f'> COMPREHEND SCORING: {score}% ({sentiment})', 'service': 'comprehend'})
         await asyncio.sleep(0.5)
         
         if not comprehend_result.get('is_approved', True):
-            yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> ⚠️ ALERT: SENTIMENT FELL BELOW THRESHOLD. FORCING REWRITE.', 'service': 'comprehend'}})}\n\n"
+            yield PipelineEvent('aws_telemetry', {'message': '> ⚠️ ALERT: SENTIMENT FELL BELOW THRESHOLD. FORCING REWRITE.', 'service': 'comprehend'})
             content_to_check = f"Copy: {copy_output}\nDesign: {design_output}\nCRITICAL INSTRUCTION: Amazon Comprehend rejected this for negative sentiment. Make it extremely positive and uplifting."
         else:
-             yield f"data: {json.dumps({'event': 'aws_telemetry', 'data': {'message': '> ✅ COMPREHEND APPROVED. PASSING TO COMPLIANCE AGENT.', 'service': 'comprehend'}})}\n\n"
+             yield PipelineEvent('aws_telemetry', {'message': '> ✅ COMPREHEND APPROVED. PASSING TO COMPLIANCE AGENT.', 'service': 'comprehend'})
              content_to_check = f"Copy: {copy_output}\nDesign: {design_output}\nNote: AWS Comprehend verified safe sentiment ({sentiment})."
         # -----------------------------------------------------------------
 
-        comp_output = ""
+        comp_output_parts: List[str] = []
         async for chunk in compliance.stream_run(prompt, context={"content": content_to_check}):
-            comp_output += chunk
-            yield f"data: {json.dumps({'event': 'agent_chunk', 'data': {'agent': 'Compliance', 'chunk': chunk}})}\n\n"
+            comp_output_parts.append(chunk)
+            yield ChunkEvent('agent_chunk', {'agent': 'Compliance'}, text=chunk)
+        comp_output = "".join(comp_output_parts)
             
         state_thought_history.append({"agent": "Compliance", "thought": "Verified brand alignment.", "output": comp_output})
 
         # Final Content Extraction
         final_content = comp_output.replace("FINAL CONTENT:", "").strip()
-        yield f"data: {json.dumps({'event': 'workflow_complete', 'data': {'final_content': final_content, 'thoughts': state_thought_history, 'status': 'success'}})}\n\n"
+        yield PipelineEvent('workflow_complete', {'final_content': final_content, 'thoughts': state_thought_history, 'status': 'success'})
 
     except Exception as e:
         logger.error(f"Stream error: {str(e)}", exc_info=True)
-        yield f"data: {json.dumps({'event': 'error', 'data': {'message': str(e)}})}\n\n"
+        yield PipelineEvent('error', {'message': str(e)})
 
 async def run_focus_group_stream(content: str):
     """
@@ -446,19 +465,17 @@ async def run_focus_group_stream(content: str):
         {"name": "Tech Enthusiast",         "trait": "Loves innovation, technical details, and future-forward concepts.", "emoji": "🚀"},
     ]
 
-    def sse(event: str, data: dict) -> str:
-        return f"data: {json.dumps({'event': event, 'data': data})}\n\n"
-
+    runner: Optional[asyncio.Task] = None
     try:
         focus_agent = FocusGroupAgent()
-        yield sse("focus_group_start", {"message": "Assembling Digital Focus Group..."})
+        yield PipelineEvent("focus_group_start", {"message": "Assembling Digital Focus Group..."})
 
         # Shared queue so we can yield reactions as they arrive (concurrent execution)
         queue: asyncio.Queue = asyncio.Queue()
         done_flag = asyncio.Event()
 
         async def get_reaction(p: dict):
-            await queue.put(sse("persona_thinking", {"name": p["name"], "emoji": p["emoji"]}))
+            await queue.put(PipelineEvent("persona_thinking", {"name": p["name"], "emoji": p["emoji"]}))
             try:
                 # 30-second hard timeout per persona so one slow LLM can't block forever
                 reaction = await asyncio.wait_for(
@@ -470,14 +487,14 @@ async def run_focus_group_stream(content: str):
             except Exception as e:
                 logger.error(f"Persona {p['name']} error: {e}")
                 reaction = "Couldn't process that right now."
-            await queue.put(sse("persona_reaction", {"name": p["name"], "emoji": p["emoji"], "reaction": reaction}))
+            await queue.put(PipelineEvent("persona_reaction", {"name": p["name"], "emoji": p["emoji"], "reaction": reaction}))
 
         # Kick off all persona tasks concurrently, signal when all done
         async def run_all():
             await asyncio.gather(*[get_reaction(p) for p in personas], return_exceptions=True)
             done_flag.set()
 
-        asyncio.create_task(run_all())
+        runner = asyncio.create_task(run_all())
 
         # Drain queue until all tasks are done AND queue is empty
         while not (done_flag.is_set() and queue.empty()):
@@ -487,76 +504,78 @@ async def run_focus_group_stream(content: str):
             except asyncio.TimeoutError:
                 continue  # check done_flag again
 
-        yield sse("focus_group_complete", {"summary": "Focus group session ended."})
-        yield sse("stream_done", {})
+        yield PipelineEvent("focus_group_complete", {"summary": "Focus group session ended."})
+        yield PipelineEvent("stream_done", {})
 
     except asyncio.CancelledError:
         logger.info("Focus group stream cancelled.")
     except Exception as e:
         logger.error(f"Focus group stream error: {str(e)}", exc_info=True)
-        yield f"data: {json.dumps({'event': 'error', 'data': {'message': str(e)}})}\n\n"
+        yield PipelineEvent("error", {"message": str(e)})
+    finally:
+        # Client gone or stream failed: stop in-flight persona LLM calls
+        if runner is not None:
+            runner.cancel()
 
 async def run_autopilot_stream(content: str):
     """
     Autonomous campaign optimization loop.
-    Disconnect detection is handled by the _disconnect_aware_stream wrapper in forge.py.
-    This generator just needs to yield SSE-formatted strings with proper \\n\\n endings.
+    On client disconnect the SSE transport (src/utils/sse.py) cancels this generator mid-await.
+    Yields PipelineEvents; the rewrite streams as ChunkEvents.
     """
     from fastapi.concurrency import run_in_threadpool
 
-    def sse(event: str, data: dict) -> str:
-        return f"data: {json.dumps({'event': event, 'data': data})}\n\n"
-
     try:
         perf_agent = PerformanceAgent()
         strat_agent = StrategistAgent()
         copy_agent = CopywriterAgent()
 
-        yield sse("autopilot_start", {"message": "Initiating Autonomous Campaign Loop..."})
+        yield PipelineEvent("autopilot_start", {"message": "Initiating Autonomous Campaign Loop..."})
 
         # Step 1: Deploy
-        yield sse("autopilot_step", {"step": "DEPLOYED", "message": "Content deployed to virtual sandbox."})
+        yield PipelineEvent("autopilot_step", {"step": "DEPLOYED", "message": "Content deployed to virtual sandbox."})
         await asyncio.sleep(0.5)
 
         # Step 2: Initial performance analysis
-        yield sse("autopilot_step", {"step": "ANALYZING", "message": "Running performance analysis..."})
+        yield PipelineEvent("autopilot_step", {"step": "ANALYZING", "message": "Running performance analysis..."})
         init_perf = await run_in_threadpool(perf_agent.analyze_performance, content)
-        yield sse("autopilot_metrics", {"metrics": init_perf["predicted_metrics"], "score": init_perf["overall_score"]})
+        yield PipelineEvent("autopilot_metrics", {"metrics": init_perf["predicted_metrics"], "score": init_perf["overall_score"]})
 
         # Step 3: Strategic pivot decision
-        yield sse("autopilot_step", {"step": "STRATEGIZING", "message": "Strategist reviewing engagement data..."})
+        yield PipelineEvent("autopilot_step", {"step": "STRATEGIZING", "message": "Strategist reviewing engagement data..."})
         pivot_decision = await strat_agent.decide_pivot(init_perf, content)
 
         if pivot_decision["status"] == "PIVOT" or init_perf["overall_score"] < 90:
-            yield sse("autopilot_pivot", {"reason": pivot_decision["analysis"], "fix": pivot_decision["directive"]})
+            yield PipelineEvent("autopilot_pivot", {"reason": pivot_decision["analysis"], "fix": pivot_decision["directive"]})
 
-            # Step 4: Autonomous rewrite (streaming — yields per-chunk so disconnect check fires)
-            yield sse("agent_start", {"agent": "Copywriter", "task": "Optimizing content for higher engagement"})
-            revised_content = ""
+            # Step 4: Autonomous rewrite (streamed; chunks are coalesced into fewer frames)
+            yield PipelineEvent("agent_start", {"agent": "Copywriter", "task": "Optimizing content for higher engagement"})
+            revised_parts: List[str] = []
             async for chunk in copy_agent.stream_run(
                 f"Revise this content based on this directive: {pivot_decision['directive']}\n\nCONTENT:\n{content}"
             ):
-                revised_content += chunk
-                yield sse("agent_chunk", {"agent": "Copywriter", "chunk": chunk})
+                revised_parts.append(chunk)
+                yield ChunkEvent("agent_chunk", {"agent": "Copywriter"}, text=chunk)
+            revised_content = "".join(revised_parts)
 
             # Step 5: Final performance re-scan
-            yield sse("autopilot_step", {"step": "OPTIMIZED", "message": "Validating optimized variant..."})
+            yield PipelineEvent("autopilot_step", {"step": "OPTIMIZED", "message": "Validating optimized variant..."})
             final_perf = await run_in_threadpool(perf_agent.analyze_performance, revised_content)
-            yield sse("autopilot_metrics", {"metrics": final_perf["predicted_metrics"], "score": final_perf["overall_score"]})
-            yield sse("autopilot_complete", {
+            yield PipelineEvent("autopilot_metrics", {"metrics": final_perf["predicted_metrics"], "score": final_perf["overall_score"]})
+            yield PipelineEvent("autopilot_complete", {
                 "final_content": revised_content,
                 "improvement": final_perf["overall_score"] - init_perf["overall_score"]
             })
         else:
-            yield sse("autopilot_complete", {"message": "Content performing at peak levels. No pivot required."})
+            yield PipelineEvent("autopilot_complete", {"message": "Content performing at peak levels. No pivot required."})
 
-        yield sse("stream_done", {})
+        yield PipelineEvent("stream_done", {})
 
     except asyncio.CancelledError:
         logger.info("Autopilot stream cancelled.")
     except Exception as e:
         logger.error(f"Autopilot stream error: {str(e)}", exc_info=True)
-        yield f"data: {json.dumps({'event': 'error', 'data': {'message': str(e)}})}\n\n"
+        yield PipelineEvent("error", {"message": str(e)})
 
 # Add finalize formatting / imports if needed
 
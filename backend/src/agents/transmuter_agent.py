@@ -1,4 +1,6 @@
 from .base_agent import BaseAgent
+from ..utils.repetition import RepetitionLoopError
+from ..utils.stream_json import parse_json_object
 from typing import Any
 
 class TransmuterAgent(BaseAgent):
@@ -43,6 +45,50 @@ CRITICAL INSTRUCTIONS:
 2. DO NOT invent new topics or examples
 3. KEEP THE SAME SUBJECT MATTER as the input
 4. Output ONLY valid JSON, no extra text
+"""
+
+    # Matrix mode (see /transmute/matrix): the language adaptation is produced once per
+    # language with language_prompt, then each platform format is derived from it with
+    # the much shorter format_prompt instead of re-running the full role_prompt.
+    language_prompt = """
+You are the Transmuter Agent - expert in adapting content across languages.
+
+YOUR TASK:
+Adapt the provided content into the specified TARGET LANGUAGE. Do not format it for any platform.
+
+LANGUAGE RULES:
+- English → Standard English
+- Hindi → Devanagari script (हिंदी में)
+- Hinglish → Roman script + Hindi words
+- Tamil/Malayalam/Kannada/Telugu/Bengali/Marathi → Native scripts
+- CRITICAL: Use ONLY the target language specified. Do NOT keep the input language.
+
+CULTURAL ADAPTATION:
+- Use local metaphors and cultural references
+- Transcreate (adapt meaning), don't just translate word-for-word
+- Keep every fact, offer and call-to-action from the input
+
+OUTPUT: Only the adapted text. No JSON, no commentary.
+"""
+
+    format_prompt = """
+You are the Transmuter Agent. The content below is already written in the TARGET LANGUAGE.
+Reshape it for the TARGET FORMAT without changing its language or subject matter.
+
+PLATFORM FORMATTING:
+- Twitter/X Thread: Hook + 3-5 numbered tweets (1/, 2/, 3/)
+- Instagram Reel: Hook + Main content + CTA, with emojis and hashtags
+- LinkedIn: Professional story/stat hook + 3-5 paragraphs + CTA
+- Blog Post: Headline + intro + sections + conclusion (500-800 words)
+
+OUTPUT FORMAT (STRICT JSON):
+{
+    "transformed_content": "[Content in target format]",
+    "format_notes": "[Platform-specific tips]",
+    "regional_nuance": "[Cultural adaptations made]",
+    "suggested_tags": ["#Tag1", "#Tag2", "#Tag3"],
+    "estimated_reading_time": "[e.g., 30 sec]"
+}
 """
 
     def __init__(self, **kwargs):
@@ -51,12 +97,54 @@ CRITICAL INSTRUCTIONS:
     
     async def async_run(self, task: str, context=None, history=None):
         """Override to use single-message prompt with embedded content"""
+        return await self._run_json_prompt(self.role_prompt, task)
+
+    async def adapt_language(self, content: str, target_language: str, tone_modifier: str = None) -> str:
+        """Plain-text language adaptation, shared by every format of a matrix row."""
+        from langchain_core.messages import HumanMessage
+
+        prompt = f"""{self.language_prompt}
+
+TARGET LANGUAGE: {target_language}
+TONE: {tone_modifier or 'Keep original tone'}
+
+CONTENT:
+{content}
+"""
+        try:
+            response = await self._ainvoke_guarded([HumanMessage(content=prompt)])
+        except RepetitionLoopError:
+            raise ValueError(f"Language adaptation to {target_language} kept repeating itself")
+        adapted = response.content.strip()
+        if not adapted:
+            raise ValueError(f"Language adaptation to {target_language} failed")
+        return adapted
+
+    async def derive_format(self, adapted_content: str, target_format: str, target_language: str, tone_modifier: str = None):
+        """
+        Formats an already-adapted text for one platform; same output contract as
+        async_run, except that a failed transformation raises ValueError instead of
+        returning placeholder JSON.
+        """
+        task = f"""
+        CONTENT ({target_language}):
+        {adapted_content}
+        
+        TARGET FORMAT: {target_format}
+        TARGET LANGUAGE: {target_language}
+        TONE: {tone_modifier or 'Keep original tone'}
+        """
+        response = await self._run_json_prompt(self.format_prompt, task)
+        if response.needs_more_info:
+            raise ValueError(f"{target_format} ({target_language}) failed: {response.thought}")
+        return response
+
+    async def _run_json_prompt(self, instructions: str, task: str):
         from langchain_core.messages import HumanMessage
         import json
-        import re
         
         # Construct full prompt with strong anti-repetition instructions
-        full_prompt = f"""{self.role_prompt}
+        full_prompt = f"""{instructions}
 
 {task}
 
@@ -69,15 +157,19 @@ CRITICAL OUTPUT RULES:
 """
         
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=full_prompt)])
-            raw_output = response.content.strip()
-            
-            # Check for repetition (common issue with multilingual content)
-            if self._detect_repetition(raw_output):
-                from ..utils.logger import get_logger
-                logger = get_logger(__name__)
-                logger.warning("Detected repetition in output, attempting cleanup...")
-                
+            # Streamed with early abort + one adjusted retry on repetition
+            # (common issue with multilingual content)
+            try:
+                response = await self._ainvoke_guarded([HumanMessage(content=full_prompt)])
+                raw_output = response.content.strip()
+                repeated = False
+            except RepetitionLoopError:
+                repeated = True
+            # Set when raw_output is placeholder JSON rather than a transformation
+            failure = None
+
+            if repeated:
+                failure = "Repetition detected"
                 # Return graceful error JSON
                 raw_output = json.dumps({
                     "transformed_content": "Content transformation encountered a repetition issue. Please try again with shorter content or a different language.",
@@ -87,14 +179,13 @@ CRITICAL OUTPUT RULES:
                     "estimated_reading_time": "30 sec"
                 })
             else:
-                # Validate and extract JSON
-                json_match = re.search(r'\{.*\}', raw_output, re.DOTALL)
-                if json_match:
-                    raw_output = json_match.group(0)
-                    # Test parse to ensure it's valid
-                    try:
-                        json.loads(raw_output)
-                    except json.JSONDecodeError:
+                # Validate and extract JSON (repairs fences, trailing commas, truncation)
+                if "{" in raw_output:
+                    parsed = parse_json_object(raw_output)
+                    if parsed is not None:
+                        raw_output = json.dumps(parsed, ensure_ascii=False)
+                    else:
+                        failure = "JSON parsing failed"
                         # If JSON is malformed, return error JSON
                         raw_output = json.dumps({
                             "transformed_content": "Translation service encountered an error. Please try again with shorter content.",
@@ -105,10 +196,10 @@ CRITICAL OUTPUT RULES:
                         })
             
             return type('AgentResponse', (), {
-                'thought': 'Performed content transformation',
+                'thought': failure or 'Performed content transformation',
                 'output': raw_output,
-                'confidence': 0.85,
-                'needs_more_info': False
+                'confidence': 0.0 if failure else 0.85,
+                'needs_more_info': failure is not None
             })()
             
         except Exception as e:
@@ -127,16 +218,3 @@ CRITICAL OUTPUT RULES:
                 'confidence': 0.0,
                 'needs_more_info': True
             })()
-    
-    def _detect_repetition(self, text: str, window=10, threshold=5) -> bool:
-        """Detect if text has repetitive patterns (sign of model loop)"""
-        if len(text) < window * threshold:
-            return False
-        
-        # Check for repeated sequences
-        for i in range(len(text) - window * threshold):
-            pattern = text[i:i+window]
-            count = text.count(pattern)
-            if count >= threshold:
-                return True
-        return False
@@ -1,16 +1,30 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
 from src.services.calendar_service import CalendarService
 from src.models.schemas import ScheduledPost, CalendarResponse
 
 router = APIRouter()
 
+# Largest page a client can request
+MAX_PAGE_SIZE = 1000
+
 @router.get("/", response_model=CalendarResponse)
-async def get_calendar_posts():
-    """Get all scheduled posts."""
+async def get_calendar_posts(
+    start: Optional[datetime] = Query(None, alias="from", description="Earliest scheduled time (ISO 8601)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Latest scheduled time (ISO 8601)"),
+    platform: Optional[str] = None,
+    status: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for every match"),
+):
+    """Get scheduled posts sorted by time, optionally within a time range, platform or status."""
     try:
-        posts = CalendarService.get_all_posts()
-        return CalendarResponse(posts=posts)
+        posts, total = await run_in_threadpool(
+            CalendarService.query_posts, start=start, end=end, platform=platform, status=status, offset=offset, limit=limit
+        )
+        return CalendarResponse(posts=posts, total=total, offset=offset, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -18,7 +32,7 @@ async def get_calendar_posts():
 async def schedule_post(post: dict):
     """Schedule a new post."""
     try:
-        new_post = CalendarService.schedule_post(post)
+        new_post = await run_in_threadpool(CalendarService.schedule_post, post)
         return new_post
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -26,6 +40,6 @@ async def schedule_post(post: dict):
 @router.delete("/{post_id}")
 async def delete_post(post_id: str):
     """Delete a post from the calendar."""
-    if CalendarService.delete_post(post_id):
+    if await run_in_threadpool(CalendarService.delete_post, post_id):
         return {"status": "success", "message": "Post deleted"}
     raise HTTPException(status_code=404, detail="Post not found")
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional
 from src.services.campaign_service import CampaignService, CampaignIntelligenceService
 from src.services.brand_service import BrandService
 from src.agents.marketing_strategist_agent import MarketingStrategistAgent
 from src.models.schemas import Campaign, CampaignCreate, CampaignStrategy
+from src.core.stream_jobs import job_response
 from fastapi.concurrency import run_in_threadpool
 import json
 import re
@@ -15,30 +15,29 @@ _legacy_agent = MarketingStrategistAgent()
 
 # ── Primary SSE endpoint ───────────────────────────────────────────────────
 @router.get("/{campaign_id}/intelligence-stream")
-async def intelligence_stream(campaign_id: str):
+async def intelligence_stream(request: Request, campaign_id: str):
     """
     SSE endpoint: runs the 4-step intelligence pipeline for a campaign.
     Steps: RECON → COMPREHEND → SYNTHESIS → MEMORY (+ optional SNS opportunity alert).
+    Runs as a resumable job: reconnecting with Last-Event-ID replays missed
+    events. A job with no subscribers left is cancelled after a short grace.
+    Everyone watching the same campaign shares one run.
     """
-    campaigns = await run_in_threadpool(CampaignService.get_all_campaigns)
-    campaign = next((c for c in campaigns if c.id == campaign_id), None)
+    campaign = await run_in_threadpool(CampaignService.get_campaign, campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    return StreamingResponse(
-        CampaignIntelligenceService.run_intelligence_stream(
+    return job_response(
+        request,
+        "IntelligenceStream",
+        lambda: CampaignIntelligenceService.run_intelligence_stream(
             campaign_id=campaign.id,
             campaign_name=campaign.name,
             goal=campaign.goal,
             duration=campaign.duration or "Flexible",
             budget=campaign.budget or "TBD",
         ),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-            "Connection": "keep-alive",
-        }
+        key=f"campaign-intelligence:{campaign.id}",
     )
 
 
@@ -49,15 +48,25 @@ def create_campaign(campaign: CampaignCreate):
 
 
 @router.get("/", response_model=List[Campaign])
-def get_all_campaigns():
-    return CampaignService.get_all_campaigns()
+def get_all_campaigns(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+):
+    """Newest-first campaigns. Next-page cursor is returned in the X-Next-Cursor header."""
+    try:
+        campaigns, next_cursor = CampaignService.get_all_campaigns(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return campaigns
 
 
 # ── Rival Radar Endpoint ────────────────────────────────────────────────────
 @router.post("/{campaign_id}/rival-radar/scan")
 async def rival_radar_scan(campaign_id: str):
-    campaigns = await run_in_threadpool(CampaignService.get_all_campaigns)
-    campaign = next((c for c in campaigns if c.id == campaign_id), None)
+    campaign = await run_in_threadpool(CampaignService.get_campaign, campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
@@ -70,8 +79,7 @@ async def rival_radar_scan(campaign_id: str):
 # ── Legacy blocking strategy endpoint (kept for compatibility) ──────────────
 @router.post("/{campaign_id}/generate-strategy", response_model=Campaign)
 async def generate_strategy(campaign_id: str):
-    campaigns = await run_in_threadpool(CampaignService.get_all_campaigns)
-    campaign = next((c for c in campaigns if c.id == campaign_id), None)
+    campaign = await run_in_threadpool(CampaignService.get_campaign, campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
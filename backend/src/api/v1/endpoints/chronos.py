@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Response
 from pydantic import BaseModel
 from typing import List, Optional
 from src.services.chronos_service import ChronosService
@@ -29,8 +29,19 @@ async def create_mission(request: MissionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/missions")
-async def list_missions():
-    return await ChronosService.get_missions()
+async def list_missions(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """Newest-first mission summaries. Next-page cursor is returned in the X-Next-Cursor header."""
+    try:
+        missions, next_cursor = await ChronosService.get_missions(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return missions
 
 @router.get("/mission/{mission_id}")
 async def get_mission(mission_id: str):
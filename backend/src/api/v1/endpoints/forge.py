@@ -1,26 +1,33 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from src.agents.supervisor import run_forge_workflow
-from src.models.schemas import ForgeResponse, TransmuteRequest, TransmuteResponse
+from src.models.schemas import ForgeResponse, TransmuteRequest, TransmuteResponse, TransmuteMatrixRequest
 from src.services.brand_service import BrandService
 from src.services.aws_service import AWSStepFunctionsService
 from src.agents.transmuter_agent import TransmuterAgent
 from src.utils.logger import get_logger
+from src.utils.stream_json import parse_json_object
+from src.utils.events import PipelineEvent
+from src.utils.sse import stream_response
+from src.core.stream_jobs import job_response
 from typing import List, Dict, Optional, Any, AsyncGenerator
-import json
-import re
 import asyncio
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Stateless between calls; shared so /transmute doesn't rebuild the agent per request
+_transmuter = TransmuterAgent()
+
+# Concurrent LLM calls per /transmute/matrix request
+MATRIX_MAX_CONCURRENCY = 4
+
 class ForgeRequest(BaseModel):
     prompt: str
     image_context: Optional[Dict[str, Any]] = None
 
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import StreamingResponse
 from src.agents.supervisor import (
     run_forge_workflow,
     run_forge_workflow_stream,
@@ -29,45 +36,15 @@ from src.agents.supervisor import (
 )
 
 
-async def _disconnect_aware_stream(
-    request: Request,
-    generator: AsyncGenerator,
-    label: str
-) -> AsyncGenerator:
-    """
-    Wraps any SSE async-generator with client-disconnect detection.
-    After every chunk is yielded, checks if the browser has closed the
-    connection and stops the generator immediately if so.
-    This prevents LLM calls from running in the background after the
-    user navigates away or clicks Stop.
-    """
-    try:
-        async for chunk in generator:
-            if await request.is_disconnected():
-                logger.info(f"[{label}] Client disconnected — stopping stream.")
-                break
-            yield chunk
-    except asyncio.CancelledError:
-        logger.info(f"[{label}] Stream cancelled.")
-    finally:
-        # Ensure the inner generator is properly closed
-        await generator.aclose()
-        logger.debug(f"[{label}] Generator closed.")
-
-
 @router.get("/forge/stream")
 async def forge_content_stream(request: Request, prompt: str):
     """
     Streams the forge workflow in real-time using SSE.
-    Stops immediately when the client disconnects.
+    Runs as a resumable job: reconnecting with Last-Event-ID replays missed
+    events instead of re-running the agents.
     """
     try:
-        gen = run_forge_workflow_stream(user_prompt=prompt)
-        return StreamingResponse(
-            _disconnect_aware_stream(request, gen, "ForgeStream"),
-            media_type="text/event-stream",
-            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
-        )
+        return job_response(request, "ForgeStream", lambda: run_forge_workflow_stream(user_prompt=prompt))
     except Exception as e:
         logger.error(f"Forge stream failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -81,11 +58,7 @@ async def focus_group_stream(request: Request, content: str):
     """
     try:
         gen = run_focus_group_stream(content=content)
-        return StreamingResponse(
-            _disconnect_aware_stream(request, gen, "FocusGroupStream"),
-            media_type="text/event-stream",
-            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
-        )
+        return stream_response(request, gen, "FocusGroupStream")
     except Exception as e:
         logger.error(f"Focus group stream failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -99,11 +72,7 @@ async def autopilot_stream(request: Request, content: str):
     """
     try:
         gen = run_autopilot_stream(content=content)
-        return StreamingResponse(
-            _disconnect_aware_stream(request, gen, "AutopilotStream"),
-            media_type="text/event-stream",
-            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
-        )
+        return stream_response(request, gen, "AutopilotStream")
     except Exception as e:
         logger.error(f"Autopilot stream failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -138,14 +107,93 @@ async def forge_content(request: ForgeRequest):
         logger.error(f"Forge failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _parse_transmute_json(raw_output: str) -> Dict[str, Any]:
+    """Extracts the Transmuter JSON object. Raises ValueError if nothing parseable is found."""
+    # Tolerates markdown fences, surrounding prose, trailing commas and truncation
+    data = parse_json_object(raw_output)
+    if data is None:
+        logger.error(f"JSON parsing failed completely. Raw output was: {raw_output[:1000]}")
+        raise ValueError("No JSON object found in transmuter output")
+    return data
+
+
+def _transmute_cell(data: Dict[str, Any]) -> Dict[str, Any]:
+    return TransmuteResponse(
+        transformed_content=data.get("transformed_content", "Error generating content."),
+        format_notes=data.get("format_notes", "No notes available."),
+        regional_nuance=data.get("regional_nuance", "Standard translation."),
+        suggested_tags=data.get("suggested_tags", []),
+        estimated_reading_time=data.get("estimated_reading_time", "1 min"),
+        status="success"
+    ).dict()
+
+
+async def _transmute_matrix_stream(request: TransmuteMatrixRequest) -> AsyncGenerator[PipelineEvent, None]:
+    """
+    Runs every (format, language) pair. Each language is adapted once, then all
+    formats for that language are derived from the adaptation. Cells stream out
+    as they finish; at most MATRIX_MAX_CONCURRENCY LLM calls run at a time.
+    """
+    formats = list(dict.fromkeys(request.target_formats))
+    languages = list(dict.fromkeys(request.target_languages))
+    semaphore = asyncio.Semaphore(MATRIX_MAX_CONCURRENCY)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run_cell(adapted: str, target_format: str, language: str):
+        try:
+            async with semaphore:
+                response = await _transmuter.derive_format(adapted, target_format, language, request.tone_modifier)
+            cell = _transmute_cell(_parse_transmute_json(response.output))
+            await queue.put(PipelineEvent("cell", {"format": target_format, "language": language, **cell}))
+        except Exception as e:
+            logger.error(f"Matrix cell failed ({target_format}, {language}): {str(e)}")
+            await queue.put(PipelineEvent("cell_error", {"format": target_format, "language": language, "error": str(e)}))
+
+    async def run_language(language: str):
+        try:
+            async with semaphore:
+                adapted = await _transmuter.adapt_language(request.content, language, request.tone_modifier)
+        except Exception as e:
+            logger.error(f"Matrix language adaptation failed ({language}): {str(e)}")
+            for target_format in formats:
+                await queue.put(PipelineEvent("cell_error", {"format": target_format, "language": language, "error": str(e)}))
+            return
+        await queue.put(PipelineEvent("language", {"language": language, "adapted_content": adapted}))
+        await asyncio.gather(*(run_cell(adapted, target_format, language) for target_format in formats))
+
+    yield PipelineEvent("plan", {"formats": formats, "languages": languages, "cells": len(formats) * len(languages)})
+    tasks = [asyncio.create_task(run_language(language)) for language in languages]
+    done = asyncio.gather(*tasks)
+    done.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield event
+        yield PipelineEvent("complete", {"cells": len(formats) * len(languages)})
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/transmute/matrix")
+async def transmute_matrix(request: Request, body: TransmuteMatrixRequest):
+    """
+    Streams a format × language matrix of transmutations as SSE.
+    Events: plan -> language (per adaptation) -> cell / cell_error -> complete.
+    """
+    if not body.target_formats or not body.target_languages:
+        raise HTTPException(status_code=400, detail="At least one format and one language are required")
+    return stream_response(request, _transmute_matrix_stream(body), "TransmuteMatrix")
+
+
 @router.post("/transmute", response_model=TransmuteResponse)
 async def transmute_content(request: TransmuteRequest):
     """
     Transforms content into a new format or regional language.
     """
     try:
-        agent = TransmuterAgent()
-        
         task = f"""
         ORIGINAL CONTENT:
         {request.content}
@@ -158,7 +206,7 @@ async def transmute_content(request: TransmuteRequest):
         If it's an Indian language, ensure it sounds native and authentic.
         """
         
-        response = await agent.async_run(task=task)
+        response = await _transmuter.async_run(task=task)
         
         # JSON Cleanup & Parsing
         raw_output = response.output.strip()
@@ -175,28 +223,13 @@ async def transmute_content(request: TransmuteRequest):
                 detail="Transmutation failed: The AI returned an empty response. Please try again."
             )
         
-        # improved regex to find the largest outer brace pair
-        json_match = re.search(r'\{.*\}', raw_output, re.DOTALL)
-        if json_match:
-            raw_output = json_match.group(0)
-        else:
-            logger.warning("No JSON object found in transmuter output")
-            
         try:
-            data = json.loads(raw_output)
-        except json.JSONDecodeError as e:
-             # Last ditch effort: try cleaning common markdown issues
-             logger.warning(f"Initial JSON parse failed: {e}. Attempting cleanup...")
-             raw_output = raw_output.replace("```json", "").replace("```", "").strip()
-             try:
-                 data = json.loads(raw_output)
-             except json.JSONDecodeError as e2:
-                 logger.error(f"JSON parsing failed completely: {e2}")
-                 logger.error(f"Raw output was: {raw_output[:1000]}")
-                 raise HTTPException(
-                     status_code=500,
-                     detail=f"Transmutation failed: Could not parse AI response. The AI may be overloaded. Please try again."
-                 )
+            data = _parse_transmute_json(raw_output)
+        except ValueError:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Transmutation failed: Could not parse AI response. The AI may be overloaded. Please try again."
+            )
 
         return TransmuteResponse(
             transformed_content=data.get("transformed_content", "Error generating content."),
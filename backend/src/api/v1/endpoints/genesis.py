@@ -1,9 +1,10 @@
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
 
 from src.services.genesis_service import GenesisService
+from src.utils.sse import stream_response
 
 router = APIRouter(tags=["genesis"])
 
@@ -18,6 +19,9 @@ class TuneRequest(BaseModel):
     process_id: str
     dialect: str
 
+class RetryRequest(BaseModel):
+    process_id: str
+
 @router.post("/start")
 async def start_genesis(request: StartGenesisRequest):
     """
@@ -35,10 +39,24 @@ async def get_genesis_status(process_id: str):
     """
     Polls the current state of the graph.
     """
-    graph = GenesisService.get_graph(process_id)
+    graph = await GenesisService.get_graph(process_id)
     if not graph:
         raise HTTPException(status_code=404, detail="Process not found")
-    return graph
+    return graph.snapshot()
+
+@router.get("/{process_id}/stream")
+async def stream_genesis_graph(process_id: str, request: Request, version: int = 0):
+    """
+    Pushes graph changes instead of polling: a snapshot (or the diff since
+    `version`), then node/edge/status/progress diffs as they happen.
+    Reconnecting EventSources resume via Last-Event-ID.
+    """
+    if not await GenesisService.get_graph(process_id):
+        raise HTTPException(status_code=404, detail="Process not found")
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        version = int(last_event_id)
+    return stream_response(request, GenesisService.stream_graph(process_id, version), "Genesis", coalesce=False)
 
 @router.post("/trend-jack")
 async def trend_jack(request: TrendJackRequest):
@@ -67,3 +85,14 @@ async def tune_campaign(request: TuneRequest):
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/retry")
+async def retry_failed_assets(request: RetryRequest):
+    """
+    Regenerates only the assets that failed or were cancelled in the last run.
+    """
+    try:
+        result = await GenesisService.retry_failed(request.process_id)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, HTTPException
-from src.models.schemas import MissionExecutionRequest, MissionExecutionResponse, ScheduledPost
+from fastapi.concurrency import run_in_threadpool
+from src.models.schemas import (
+    MissionExecutionRequest, MissionExecutionResponse, ScheduledPost, DispatchRequest, DispatchQueueRequest
+)
 from src.services.calendar_service import CalendarService
 from src.services.aws_service import EventBridgeService
-from src.agents.dispatcher_agent import DispatcherAgent
+from src.services.dispatch_service import DispatchService
 from src.utils.logger import get_logger
 from datetime import datetime
+from typing import Optional
+import time
 import uuid
 
 logger = get_logger(__name__)
 router = APIRouter()
 aws_service = EventBridgeService()
-dispatcher = DispatcherAgent()
 
 @router.post("/execute", response_model=MissionExecutionResponse)
 async def execute_mission(request: MissionExecutionRequest):
@@ -26,7 +30,7 @@ async def execute_mission(request: MissionExecutionRequest):
             
         # 2. Register in Local Calendar (Simulated Database)
         post_id = str(uuid.uuid4())
-        CalendarService.schedule_post({
+        post = await run_in_threadpool(CalendarService.schedule_post, {
             "id": post_id,
             "content": request.content,
             "platform": request.platform,
@@ -36,6 +40,9 @@ async def execute_mission(request: MissionExecutionRequest):
             "webhook_url": request.webhook_url
         })
         
+        # Pre-flight audit now, in the background, so dispatch doesn't wait on the LLM
+        DispatchService.schedule_preflight(post)
+        
         # 3. Create AWS EventBridge Schedule
         payload = {
             "post_id": post_id,
@@ -65,30 +72,47 @@ async def execute_mission(request: MissionExecutionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/test-dispatch/{post_id}")
-async def test_dispatch(post_id: str):
+async def test_dispatch(post_id: str, request: Optional[DispatchRequest] = None):
     """
     Manual trigger to simulate EventBridge callback for the demo.
+    Optionally fans the post out to several platforms / webhooks at once.
     """
     # This would normally be called by EventBridge Target
-    posts = CalendarService.get_all_posts()
-    post = next((p for p in posts if p.id == post_id), None)
+    post = await run_in_threadpool(CalendarService.get_post, post_id)
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    # 1. Start Audit
-    post.status = "auditing"
-    
-    # 2. Run Dispatcher
-    success = await dispatcher.dispatch(
-        content=post.content,
-        platform=post.platform,
-        webhook_url=post.webhook_url or "https://hook.us1.make.com/your-default-hook"
-    )
+    post, results = await DispatchService.dispatch_post(post, request.targets if request else None)
     
-    if success:
-        post.status = "dispatched"
-        return {"status": "success", "message": "Content audited and dispatched to webhook."}
+    if post.status == "dispatched":
+        return {"status": "success", "message": "Content audited and dispatched to webhook.", "results": results}
     else:
-        post.status = "failed"
-        return {"status": "error", "message": "Dispatch failed."}
+        return {"status": "error", "message": "Dispatch failed.", "results": results}
+
+@router.post("/dispatch-queue")
+async def dispatch_queue(request: Optional[DispatchQueueRequest] = None):
+    """
+    Bulk dispatch: every post still scheduled up to now (or up to the end of
+    `date`), concurrently. Already-delivered targets are not sent again.
+    """
+    if request and request.date:
+        try:
+            end = datetime.fromisoformat(request.date).replace(hour=23, minute=59, second=59)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+    else:
+        end = datetime.now()
+
+    posts, _ = await run_in_threadpool(CalendarService.query_posts, end=end, status="scheduled")
+    started = time.monotonic()
+    outcomes = await DispatchService.dispatch_many(posts)
+    dispatched = sum(1 for post, _ in outcomes if post.status == "dispatched")
+    return {
+        "status": "success",
+        "total": len(outcomes),
+        "dispatched": dispatched,
+        "failed": len(outcomes) - dispatched,
+        "elapsed_ms": int((time.monotonic() - started) * 1000),
+        "posts": [{"post_id": post.id, "status": post.status, "results": results} for post, results in outcomes],
+    }
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
 from src.models.schemas import OracleRequest, OracleResponse, MetricScore, TimePoint
 from src.core.llm_factory import LLMFactory
 from src.services.brand_service import BrandService
@@ -22,12 +23,24 @@ async def predict_performance(request: OracleRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/history")
-async def get_oracle_history():
+async def get_oracle_history(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """
+    Newest-first prediction summaries. The next-page cursor is returned in the
+    X-Next-Cursor header so the body stays a plain list.
+    """
     from fastapi.concurrency import run_in_threadpool
     from src.services.oracle_service import OracleService
     
     try:
-        history = await run_in_threadpool(OracleService.get_history)
+        history, next_cursor = await run_in_threadpool(OracleService.get_history, limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return history
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from src.services.scout_service import LocalScoutService
 from src.services.aws_service import ScoutDynamoDBService
 from src.utils.logger import get_logger
+from src.core.stream_jobs import job_response
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -16,7 +16,7 @@ class ScoutRequest(BaseModel):
 
 
 @router.get("/stream")
-async def scout_stream(city: str, lat: float, lng: float):
+async def scout_stream(request: Request, city: str, lat: float, lng: float):
     """
     SSE endpoint — streams all 5 agent steps live to the frontend.
     This is the PRIMARY endpoint used by the enhanced Local Scout page.
@@ -27,16 +27,17 @@ async def scout_stream(city: str, lat: float, lng: float):
       3. SYNTHESIS — Bedrock Nova enriched synthesis
       4. MEMORY   — DynamoDB save + trend delta vs past runs
       5. ALERT    — SNS hot signal if viral_score >= 78
+
+    Runs as a resumable job: reconnecting with Last-Event-ID replays missed
+    events. A job with no subscribers left is cancelled after a short grace.
+    Concurrent scouts of the same spot share one run.
     """
     logger.info(f"[Scout SSE] Agent deployed: {city} ({lat}, {lng})")
-    return StreamingResponse(
-        LocalScoutService.run_scout_agent_stream(city=city, lat=lat, lng=lng),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-            "Connection": "keep-alive",
-        }
+    return job_response(
+        request,
+        "ScoutStream",
+        lambda: LocalScoutService.run_scout_agent_stream(city=city, lat=lat, lng=lng),
+        key=f"scout:{city.strip().lower()}:{lat:.3f}:{lng:.3f}",
     )
 
 
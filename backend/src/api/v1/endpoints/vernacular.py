@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from src.services.vernacular_service import VernacularService
+from src.services.vernacular_service import VernacularService, STATE_LANGUAGE_MAP
 from src.services.aws_service import AWSDynamoDBService, EventBridgeService
 from src.utils.logger import get_logger
+from src.utils.sse import stream_response
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -31,6 +33,15 @@ class VernacularResponse(BaseModel):
     taboos_to_avoid: List[str] = []
     reel_script: List[Dict[str, str]] = []
     influencer_strategy: str = ""
+    stage_timings: Dict[str, float] = {}
+
+class VernacularBatchRequest(BaseModel):
+    content: str
+    states: List[str]
+
+class AudioStreamRequest(BaseModel):
+    text: str
+    language: str
 
 class ScheduleRequest(BaseModel):
     campaign_name: str
@@ -53,13 +64,60 @@ async def transmute_vernacular(request: VernacularRequest):
         logger.error(f"Endpoint error in vernacular transmute: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/transmute/batch")
+async def transmute_vernacular_batch(request: Request, body: VernacularBatchRequest):
+    """
+    SSE fan-out: adapts one piece of content for many states in one call.
+    States sharing a language share one translation; per-state results stream
+    back as `state_result` events as soon as each finishes.
+    """
+    states = list(dict.fromkeys(body.states))
+    if not body.content.strip():
+        raise HTTPException(status_code=400, detail="Content cannot be empty")
+    if not states:
+        raise HTTPException(status_code=400, detail="At least one state must be selected")
+    unknown = [state for state in states if state not in STATE_LANGUAGE_MAP]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported states: {', '.join(unknown)}")
+
+    service = VernacularService()
+    return stream_response(request, service.transmute_states_stream(body.content, states), "VernacularBatch")
+
+async def _audio_stream_response(text: str, language: str) -> StreamingResponse:
+    service = VernacularService()
+    chunks, archive_url = await service.open_audio_stream(text, language)
+    if chunks is None:
+        raise HTTPException(status_code=400, detail="Nothing to synthesize")
+    return StreamingResponse(
+        chunks,
+        media_type="audio/mpeg",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            # Where the archive copy lives once the stream completes
+            "X-Audio-Url": archive_url,
+        }
+    )
+
+@router.post("/audio/stream")
+async def stream_vernacular_audio(request: AudioStreamRequest):
+    """Streams the voice track as audio/mpeg while it is synthesised; S3 archiving happens in the background."""
+    return await _audio_stream_response(request.text, request.language)
+
+@router.get("/audio/stream")
+async def stream_vernacular_audio_get(text: str, language: str):
+    """GET variant for <audio src=...> playback of short copy."""
+    return await _audio_stream_response(text, language)
+
 @router.get("/history")
-async def get_campaign_history():
-    """Retrieve recent transmutation history from DynamoDB."""
+async def get_campaign_history(limit: int = Query(10, ge=1, le=100), cursor: Optional[str] = None):
+    """Retrieve recent transmutation history from DynamoDB, newest first."""
     try:
         db = AWSDynamoDBService()
-        items = await db.get_recent_history(limit=10)
-        return {"history": items, "source": "AWS DynamoDB"}
+        items, next_cursor = await db.get_recent_history(limit=limit, cursor=cursor)
+        return {"history": items, "next_cursor": next_cursor, "source": "AWS DynamoDB"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch history: {str(e)}")
         # Return empty gracefully so the UI still works
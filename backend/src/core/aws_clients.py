@@ -0,0 +1,53 @@
+"""
+Process-wide boto3 clients and resources.
+
+Service wrappers are instantiated per request; building a boto3 client costs
+tens of milliseconds (endpoint resolution, credential chain, botocore model
+loading), so every wrapper shares the handles created here instead. Clients
+are thread-safe and are used from run_in_threadpool workers.
+"""
+import threading
+from typing import Any, Dict
+
+import boto3
+
+from .config import settings
+
+_lock = threading.Lock()
+_clients: Dict[str, Any] = {}
+_resources: Dict[str, Any] = {}
+
+# Clients created during startup warm-up (see src/main.py lifespan)
+WARM_CLIENTS = ["dynamodb", "polly", "s3", "comprehend", "sns", "scheduler"]
+
+
+def _session_kwargs() -> Dict[str, Any]:
+    return {
+        "aws_access_key_id": settings.AWS_ACCESS_KEY_ID or None,
+        "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY or None,
+        "region_name": settings.AWS_REGION,
+    }
+
+
+def get_client(service_name: str):
+    """Returns the shared low-level client for `service_name`, creating it once."""
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = boto3.client(service_name, **_session_kwargs())
+                _clients[service_name] = client
+    return client
+
+
+def get_resource(service_name: str):
+    """Returns the shared resource for `service_name` (e.g. dynamodb), creating it once."""
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                resource = boto3.resource(service_name, **_session_kwargs())
+                _resources[service_name] = resource
+    return resource
@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     AWS_SNS_TOPIC_ARN: str = os.getenv("AWS_SNS_TOPIC_ARN", "")
     
     TAVILY_API_KEY: str = os.getenv("TAVILY_API_KEY", "")
+
+    # Shared state for Genesis graphs, calendar posts and forge checkpoints: memory | sqlite | redis
+    STATE_BACKEND: str = os.getenv("STATE_BACKEND", "memory")
+    STATE_SQLITE_PATH: str = os.getenv("STATE_SQLITE_PATH", "data/state.db")
+    STATE_REDIS_URL: str = os.getenv("STATE_REDIS_URL", "redis://localhost:6379/0")
     
     class Config:
         case_sensitive = True
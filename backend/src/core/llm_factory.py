@@ -1,5 +1,6 @@
 import os
-from typing import Optional, Literal
+import threading
+from typing import Any, Dict, Optional, Literal, Tuple
 from dotenv import load_dotenv
 
 from langchain_core.language_models import BaseLanguageModel
@@ -56,8 +57,14 @@ tavily_search = TavilySearchResults(max_results=5) if TAVILY_API_KEY else None
 class LLMFactory:
     """
     Central factory to get LLM instances + shared tools.
+    Instances are cached per (provider, temperature, max_tokens, model_id): the chat
+    clients are stateless between calls, and building one (boto3 session, HTTP pool)
+    is too slow to repeat for every agent constructed on the request path.
     """
 
+    _instances: Dict[Tuple, BaseLanguageModel] = {}
+    _instances_lock = threading.RLock()  # re-entered by the provider fallback chain
+
     @staticmethod
     def get_llm(
         provider: Optional[Literal["bedrock", "gemini", "huggingface", "openrouter"]] = None,
@@ -65,8 +72,23 @@ class LLMFactory:
         max_tokens: int = DEFAULT_MAX_TOKENS,
         model_id: Optional[str] = None,
     ) -> BaseLanguageModel:
-        provider = provider or DEFAULT_MODEL_PROVIDER
+        key = (provider or DEFAULT_MODEL_PROVIDER, temperature, max_tokens, model_id)
+        llm = LLMFactory._instances.get(key)
+        if llm is None:
+            with LLMFactory._instances_lock:
+                llm = LLMFactory._instances.get(key)
+                if llm is None:
+                    llm = LLMFactory._build_llm(*key)
+                    LLMFactory._instances[key] = llm
+        return llm
 
+    @staticmethod
+    def _build_llm(
+        provider: str,
+        temperature: float,
+        max_tokens: int,
+        model_id: Optional[str],
+    ) -> BaseLanguageModel:
         try:
             # --- OpenRouter (Nemotron) ---
             if provider == "openrouter":
@@ -153,6 +175,34 @@ class LLMFactory:
     def get_default_llm() -> BaseLanguageModel:
         return LLMFactory.get_llm()
 
+    @staticmethod
+    def with_temperature(llm: BaseLanguageModel, temperature: float) -> BaseLanguageModel:
+        """
+        The same provider, model and token limit as `llm` at another temperature.
+        An LLM the factory didn't build is returned unchanged.
+        """
+        with LLMFactory._instances_lock:
+            key = next((k for k, v in LLMFactory._instances.items() if v is llm), None)
+        if key is None:
+            return llm
+        provider, _, max_tokens, model_id = key
+        return LLMFactory.get_llm(provider=provider, temperature=temperature, max_tokens=max_tokens, model_id=model_id)
+
+    @staticmethod
+    def chunk_text(chunk: Any) -> str:
+        """Text of a streamed message chunk (or a whole message)."""
+        content = getattr(chunk, "content", chunk)
+        # Handle Bedrock/multimodal blocks (list of dicts)
+        if isinstance(content, list):
+            text = ""
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "text":
+                    text += block.get("text", "")
+                elif isinstance(block, str):
+                    text += block
+            content = text
+        return content if isinstance(content, str) else ""
+
     @staticmethod
     def get_tools():
         tools = []
@@ -0,0 +1,401 @@
+"""
+Shared state for stores that used to live in one worker's memory.
+
+Genesis graphs, calendar posts and forge checkpoints are kept in a
+StateBackend so that any uvicorn worker (or App Runner instance) can serve
+any request. Values are JSON documents addressed by (namespace, key):
+
+  memory  — per-process dicts. Same behaviour as before; the default.
+  sqlite  — one table in a local file (WAL). Shared by the workers on a host.
+  redis   — one hash per namespace on any Redis-protocol server (Redis,
+            Valkey, ElastiCache). Shared across hosts.
+
+Selected with STATE_BACKEND (memory | sqlite | redis), STATE_SQLITE_PATH
+and STATE_REDIS_URL. Backends are synchronous: every call is a single
+local-file or single round-trip operation.
+
+`incr` adds to a numeric value atomically, so counters maintained by
+several workers stay exact.
+
+Sorted indexes (`index_*`) keep keys ordered by a numeric score, e.g. a
+timestamp, for range queries without loading and sorting every document:
+a bisect-sorted list in memory, an indexed table in SQLite, a sorted set
+in Redis.
+"""
+import bisect
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.config import settings
+from src.utils.logger import get_logger
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = get_logger(__name__)
+
+
+class StateBackend:
+    """JSON key/value store grouped into namespaces. Subclasses implement the raw string operations."""
+
+    name = "base"
+    # False when state is only visible to this process
+    shared = True
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        raw = self._get(namespace, key)
+        return None if raw is None else json.loads(raw)
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Values for the keys that exist."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {k: json.loads(raw) for k, raw in zip(keys, self._get_many(namespace, keys)) if raw is not None}
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self._set(namespace, key, json.dumps(value, ensure_ascii=False))
+
+    def add(self, namespace: str, key: str, value: Any) -> bool:
+        """Sets the key only if it does not exist; True if it was set."""
+        return self._add(namespace, key, json.dumps(value, ensure_ascii=False))
+
+    def delete(self, namespace: str, key: str) -> bool:
+        return self._delete(namespace, key)
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        return {k: json.loads(raw) for k, raw in self._items(namespace).items()}
+
+    def clear(self, namespace: str) -> None:
+        self._clear(namespace)
+
+    def incr(self, namespace: str, key: str, amount: float = 1) -> float:
+        """Adds `amount` to a numeric value (missing = 0) and returns the new value."""
+        raise NotImplementedError
+
+    # --- Sorted indexes ---
+
+    def index_add(self, index: str, key: str, score: float) -> None:
+        """Adds `key` to the index, or moves it to `score`."""
+        raise NotImplementedError
+
+    def index_remove(self, index: str, key: str) -> None:
+        raise NotImplementedError
+
+    def index_range(
+        self,
+        index: str,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Keys with min_score <= score <= max_score (None = unbounded), ascending."""
+        raise NotImplementedError
+
+    def index_count(self, index: str, min_score: Optional[float] = None, max_score: Optional[float] = None) -> int:
+        raise NotImplementedError
+
+    # --- Raw operations ---
+
+    def _get(self, namespace: str, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _get_many(self, namespace: str, keys: List[str]) -> List[Optional[str]]:
+        return [self._get(namespace, k) for k in keys]
+
+    def _set(self, namespace: str, key: str, raw: str) -> None:
+        raise NotImplementedError
+
+    def _add(self, namespace: str, key: str, raw: str) -> bool:
+        raise NotImplementedError
+
+    def _delete(self, namespace: str, key: str) -> bool:
+        raise NotImplementedError
+
+    def _items(self, namespace: str) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def _clear(self, namespace: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryStateBackend(StateBackend):
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, str]] = {}
+        # index -> (sorted [(score, key)], key -> score)
+        self._indexes: Dict[str, Tuple[List[Tuple[float, str]], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, namespace, key):
+        return self._data.get(namespace, {}).get(key)
+
+    def _set(self, namespace, key, raw):
+        with self._lock:
+            self._data.setdefault(namespace, {})[key] = raw
+
+    def _add(self, namespace, key, raw):
+        with self._lock:
+            bucket = self._data.setdefault(namespace, {})
+            if key in bucket:
+                return False
+            bucket[key] = raw
+            return True
+
+    def _delete(self, namespace, key):
+        with self._lock:
+            return self._data.get(namespace, {}).pop(key, None) is not None
+
+    def _items(self, namespace):
+        return dict(self._data.get(namespace, {}))
+
+    def _clear(self, namespace):
+        with self._lock:
+            self._data.pop(namespace, None)
+
+    def incr(self, namespace, key, amount=1):
+        with self._lock:
+            bucket = self._data.setdefault(namespace, {})
+            value = json.loads(bucket.get(key, "0")) + amount
+            bucket[key] = json.dumps(value)
+            return value
+
+    def index_add(self, index, key, score):
+        with self._lock:
+            entries, scores = self._indexes.setdefault(index, ([], {}))
+            old = scores.get(key)
+            if old == score:
+                return
+            if old is not None:
+                del entries[bisect.bisect_left(entries, (old, key))]
+            bisect.insort(entries, (score, key))
+            scores[key] = score
+
+    def index_remove(self, index, key):
+        with self._lock:
+            entries, scores = self._indexes.get(index, ([], {}))
+            old = scores.pop(key, None)
+            if old is not None:
+                del entries[bisect.bisect_left(entries, (old, key))]
+
+    def _bounds(self, entries, min_score, max_score) -> Tuple[int, int]:
+        lo = 0 if min_score is None else bisect.bisect_left(entries, (min_score, ""))
+        hi = len(entries) if max_score is None else bisect.bisect_left(entries, (max_score, chr(0x10FFFF)))
+        return lo, max(lo, hi)
+
+    def index_range(self, index, min_score=None, max_score=None, offset=0, limit=None):
+        with self._lock:
+            entries = self._indexes.get(index, ([], {}))[0]
+            lo, hi = self._bounds(entries, min_score, max_score)
+            start = lo + offset
+            stop = hi if limit is None else min(hi, start + limit)
+            return [key for _, key in entries[start:stop]]
+
+    def index_count(self, index, min_score=None, max_score=None):
+        with self._lock:
+            lo, hi = self._bounds(self._indexes.get(index, ([], {}))[0], min_score, max_score)
+            return hi - lo
+
+
+class SQLiteStateBackend(StateBackend):
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state_index ("
+                " name TEXT NOT NULL, key TEXT NOT NULL, score REAL NOT NULL,"
+                " PRIMARY KEY (name, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS state_index_score ON state_index (name, score, key)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread (FastAPI runs sync endpoints in a threadpool)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, namespace, key):
+        row = self._conn().execute(
+            "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _get_many(self, namespace, keys):
+        found: Dict[str, str] = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn().execute(
+                f"SELECT key, value FROM state WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                (namespace, *chunk),
+            ).fetchall()
+            found.update(rows)
+        return [found.get(k) for k in keys]
+
+    def _set(self, namespace, key, raw):
+        self._conn().execute(
+            "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value",
+            (namespace, key, raw),
+        )
+
+    def _add(self, namespace, key, raw):
+        cursor = self._conn().execute(
+            "INSERT OR IGNORE INTO state (namespace, key, value) VALUES (?, ?, ?)", (namespace, key, raw)
+        )
+        return cursor.rowcount == 1
+
+    def _delete(self, namespace, key):
+        cursor = self._conn().execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+        return cursor.rowcount > 0
+
+    def _items(self, namespace):
+        rows = self._conn().execute("SELECT key, value FROM state WHERE namespace = ?", (namespace,)).fetchall()
+        return dict(rows)
+
+    def _clear(self, namespace):
+        self._conn().execute("DELETE FROM state WHERE namespace = ?", (namespace,))
+
+    def incr(self, namespace, key, amount=1):
+        row = self._conn().execute(
+            "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT(namespace, key) DO UPDATE SET value = value + excluded.value RETURNING value",
+            (namespace, key, amount),
+        ).fetchone()
+        return json.loads(row[0])
+
+    @staticmethod
+    def _where(min_score, max_score) -> Tuple[str, List[float]]:
+        clauses, params = [], []
+        if min_score is not None:
+            clauses.append(" AND score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append(" AND score <= ?")
+            params.append(max_score)
+        return "".join(clauses), params
+
+    def index_add(self, index, key, score):
+        self._conn().execute(
+            "INSERT INTO state_index (name, key, score) VALUES (?, ?, ?)"
+            " ON CONFLICT(name, key) DO UPDATE SET score = excluded.score",
+            (index, key, score),
+        )
+
+    def index_remove(self, index, key):
+        self._conn().execute("DELETE FROM state_index WHERE name = ? AND key = ?", (index, key))
+
+    def index_range(self, index, min_score=None, max_score=None, offset=0, limit=None):
+        where, params = self._where(min_score, max_score)
+        rows = self._conn().execute(
+            f"SELECT key FROM state_index WHERE name = ?{where} ORDER BY score, key LIMIT ? OFFSET ?",
+            (index, *params, -1 if limit is None else limit, offset),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def index_count(self, index, min_score=None, max_score=None):
+        where, params = self._where(min_score, max_score)
+        row = self._conn().execute(
+            f"SELECT COUNT(*) FROM state_index WHERE name = ?{where}", (index, *params)
+        ).fetchone()
+        return row[0]
+
+
+class RedisStateBackend(StateBackend):
+    """One hash per namespace (`<prefix><namespace>`) on a Redis-protocol server."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "cloudcraft:"):
+        if redis is None:
+            raise RuntimeError("STATE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def _key(self, namespace: str) -> str:
+        return f"{self.prefix}{namespace}"
+
+    def _get(self, namespace, key):
+        return self._client.hget(self._key(namespace), key)
+
+    def _get_many(self, namespace, keys):
+        return self._client.hmget(self._key(namespace), keys)
+
+    def _set(self, namespace, key, raw):
+        self._client.hset(self._key(namespace), key, raw)
+
+    def _add(self, namespace, key, raw):
+        return bool(self._client.hsetnx(self._key(namespace), key, raw))
+
+    def _delete(self, namespace, key):
+        return self._client.hdel(self._key(namespace), key) > 0
+
+    def _items(self, namespace):
+        return self._client.hgetall(self._key(namespace))
+
+    def _clear(self, namespace):
+        self._client.delete(self._key(namespace))
+
+    def incr(self, namespace, key, amount=1):
+        if isinstance(amount, int):
+            return self._client.hincrby(self._key(namespace), key, amount)
+        return float(self._client.hincrbyfloat(self._key(namespace), key, amount))
+
+    @staticmethod
+    def _score_bounds(min_score, max_score) -> Tuple[Any, Any]:
+        return ("-inf" if min_score is None else min_score), ("+inf" if max_score is None else max_score)
+
+    def index_add(self, index, key, score):
+        self._client.zadd(self._key(index), {key: score})
+
+    def index_remove(self, index, key):
+        self._client.zrem(self._key(index), key)
+
+    def index_range(self, index, min_score=None, max_score=None, offset=0, limit=None):
+        lo, hi = self._score_bounds(min_score, max_score)
+        if limit is None and offset == 0:
+            return self._client.zrangebyscore(self._key(index), lo, hi)
+        return self._client.zrangebyscore(self._key(index), lo, hi, start=offset, num=-1 if limit is None else limit)
+
+    def index_count(self, index, min_score=None, max_score=None):
+        lo, hi = self._score_bounds(min_score, max_score)
+        return self._client.zcount(self._key(index), lo, hi)
+
+
+def create_state_backend(kind: Optional[str] = None) -> StateBackend:
+    kind = (kind or settings.STATE_BACKEND).strip().lower()
+    if kind == "sqlite":
+        backend: StateBackend = SQLiteStateBackend(settings.STATE_SQLITE_PATH)
+    elif kind == "redis":
+        backend = RedisStateBackend(settings.STATE_REDIS_URL)
+    else:
+        if kind != "memory":
+            logger.warning(f"Unknown STATE_BACKEND '{kind}', using memory")
+        backend = MemoryStateBackend()
+    logger.info(f"State backend: {backend.name}")
+    return backend
+
+
+state_backend = create_state_backend()
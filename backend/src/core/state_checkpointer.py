@@ -0,0 +1,274 @@
+"""
+LangGraph checkpointer on top of the shared StateBackend.
+
+Mirrors InMemorySaver's layout: checkpoints are stored without their
+channel values, each channel value is stored once per version as a blob,
+and pending writes are kept per checkpoint. Everything is serialised with
+the saver's serde and base64-encoded into the backend's JSON values.
+
+    langgraph:<thread>:heads                    checkpoint_ns -> latest checkpoint id
+    langgraph:<thread>:checkpoints:<ns>         checkpoint id -> checkpoint, metadata, parent id
+    langgraph:<thread>:blobs:<ns>               "<channel>@<version>" -> value
+    langgraph:<thread>:writes:<ns>:<id>         "<task_id>:<idx>" -> pending write
+
+Threads are indexed by last write time (`langgraph:threads`); threads idle
+for longer than CHECKPOINT_TTL_SECONDS are deleted, checked at most every
+CHECKPOINT_PRUNE_INTERVAL seconds from `put`.
+"""
+import asyncio
+import base64
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langchain_core.runnables import RunnableConfig
+
+from src.core.state_backend import StateBackend
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+THREADS_INDEX = "langgraph:threads"
+CHECKPOINT_TTL_SECONDS = float(os.getenv("CHECKPOINT_TTL_SECONDS", "86400"))
+PRUNE_INTERVAL = float(os.getenv("CHECKPOINT_PRUNE_INTERVAL", "600"))
+
+
+def _pack(typed: Tuple[str, bytes]) -> List[str]:
+    return [typed[0], base64.b64encode(typed[1]).decode("ascii")]
+
+
+def _unpack(packed: List[str]) -> Tuple[str, bytes]:
+    return packed[0], base64.b64decode(packed[1])
+
+
+class StateBackendSaver(BaseCheckpointSaver):
+    def __init__(self, backend: StateBackend, *, serde=None, ttl_seconds: Optional[float] = CHECKPOINT_TTL_SECONDS):
+        super().__init__(serde=serde)
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._pruned_at = 0.0
+
+    # --- Namespaces ---
+
+    @staticmethod
+    def _heads(thread_id: str) -> str:
+        return f"langgraph:{thread_id}:heads"
+
+    @staticmethod
+    def _checkpoints(thread_id: str, checkpoint_ns: str) -> str:
+        return f"langgraph:{thread_id}:checkpoints:{checkpoint_ns}"
+
+    @staticmethod
+    def _blobs(thread_id: str, checkpoint_ns: str) -> str:
+        return f"langgraph:{thread_id}:blobs:{checkpoint_ns}"
+
+    @staticmethod
+    def _writes(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
+        return f"langgraph:{thread_id}:writes:{checkpoint_ns}:{checkpoint_id}"
+
+    # --- Reads ---
+
+    def _load_tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, saved: Dict[str, Any]) -> CheckpointTuple:
+        checkpoint: Checkpoint = self.serde.loads_typed(_unpack(saved["checkpoint"]))
+        versions = checkpoint["channel_versions"]
+        blobs = self.backend.get_many(
+            self._blobs(thread_id, checkpoint_ns), [f"{k}@{v}" for k, v in versions.items()]
+        )
+        channel_values = {}
+        for channel, version in versions.items():
+            blob = blobs.get(f"{channel}@{version}")
+            if blob is not None and blob[0] != "empty":
+                channel_values[channel] = self.serde.loads_typed(_unpack(blob))
+
+        writes = sorted(
+            self.backend.items(self._writes(thread_id, checkpoint_ns, checkpoint_id)).values(),
+            key=lambda w: (w["task_path"], w["task_id"], w["idx"]),
+        )
+        parent_id = saved.get("parent")
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed(_unpack(saved["metadata"])),
+            pending_writes=[(w["task_id"], w["channel"], self.serde.loads_typed(_unpack(w["value"]))) for w in writes],
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config) or self.backend.get(self._heads(thread_id), checkpoint_ns)
+        if not checkpoint_id:
+            return None
+        saved = self.backend.get(self._checkpoints(thread_id, checkpoint_ns), checkpoint_id)
+        if saved is None:
+            return None
+        return self._load_tuple(thread_id, checkpoint_ns, checkpoint_id, saved)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        # Listing needs a thread: the backend has no index across threads
+        if not config:
+            return
+        thread_id = config["configurable"]["thread_id"]
+        config_ns = config["configurable"].get("checkpoint_ns")
+        config_id = get_checkpoint_id(config)
+        before_id = get_checkpoint_id(before) if before else None
+
+        for checkpoint_ns in self.backend.items(self._heads(thread_id)):
+            if config_ns is not None and checkpoint_ns != config_ns:
+                continue
+            saved_all = self.backend.items(self._checkpoints(thread_id, checkpoint_ns))
+            for checkpoint_id in sorted(saved_all, reverse=True):
+                if config_id and checkpoint_id != config_id:
+                    continue
+                if before_id and checkpoint_id >= before_id:
+                    continue
+                saved = saved_all[checkpoint_id]
+                if filter:
+                    metadata = self.serde.loads_typed(_unpack(saved["metadata"]))
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                if limit is not None:
+                    if limit <= 0:
+                        return
+                    limit -= 1
+                yield self._load_tuple(thread_id, checkpoint_ns, checkpoint_id, saved)
+
+    # --- Writes ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")
+        blobs = self._blobs(thread_id, checkpoint_ns)
+        for channel, version in new_versions.items():
+            typed = self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            self.backend.set(blobs, f"{channel}@{version}", _pack(typed))
+
+        self.backend.set(
+            self._checkpoints(thread_id, checkpoint_ns),
+            checkpoint["id"],
+            {
+                "checkpoint": _pack(self.serde.dumps_typed(c)),
+                "metadata": _pack(self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))),
+                "parent": config["configurable"].get("checkpoint_id"),
+            },
+        )
+        # Checkpoint ids sort by time, so the head only moves forward
+        head = self.backend.get(self._heads(thread_id), checkpoint_ns)
+        if head is None or checkpoint["id"] > head:
+            self.backend.set(self._heads(thread_id), checkpoint_ns, checkpoint["id"])
+        self.backend.index_add(THREADS_INDEX, thread_id, time.time())
+        if self.ttl_seconds and time.monotonic() - self._pruned_at > PRUNE_INTERVAL:
+            self._pruned_at = time.monotonic()
+            self.prune(self.ttl_seconds)
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        namespace = self._writes(thread_id, checkpoint_ns, config["configurable"]["checkpoint_id"])
+        for i, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, i)
+            record = {
+                "task_id": task_id,
+                "idx": idx,
+                "channel": channel,
+                "value": _pack(self.serde.dumps_typed(value)),
+                "task_path": task_path,
+            }
+            # Regular writes are kept from the first attempt; special ones (errors, interrupts) are replaced
+            if idx >= 0:
+                self.backend.add(namespace, f"{task_id}:{idx}", record)
+            else:
+                self.backend.set(namespace, f"{task_id}:{idx}", record)
+
+    def delete_thread(self, thread_id: str) -> None:
+        for checkpoint_ns in self.backend.items(self._heads(thread_id)):
+            checkpoints = self._checkpoints(thread_id, checkpoint_ns)
+            for checkpoint_id in self.backend.items(checkpoints):
+                self.backend.clear(self._writes(thread_id, checkpoint_ns, checkpoint_id))
+            self.backend.clear(checkpoints)
+            self.backend.clear(self._blobs(thread_id, checkpoint_ns))
+        self.backend.clear(self._heads(thread_id))
+        self.backend.index_remove(THREADS_INDEX, thread_id)
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Deletes threads with no checkpoint written in `max_age_seconds`; returns how many."""
+        expired = self.backend.index_range(THREADS_INDEX, max_score=time.time() - max_age_seconds)
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        if expired:
+            logger.info(f"Pruned {len(expired)} expired checkpoint thread(s)")
+        return len(expired)
+
+    # --- Async: backend calls block on disk / network, so run them off the event loop ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,198 @@
+"""
+Resumable SSE streams.
+
+Multi-agent pipelines (forge, scout, campaign intelligence) run as server-side
+jobs instead of living inside one HTTP response. Each job appends every event
+its pipeline yields (token chunks already coalesced) to a bounded ring buffer
+under a monotonically increasing sequence number; subscribers replay the
+buffer and then follow live events.
+
+Event ids are sent as `id: <job_id>:<seq>`. EventSource reconnects with that
+value in the `Last-Event-ID` header (fetch readers can pass `?last_event_id=`
+instead — the job id is also returned in `X-Stream-Job`), so a dropped
+connection resumes from where it left off rather than re-running the whole
+pipeline.
+
+Jobs started with a key (e.g. the scout city, the campaign id) are shared:
+while one is in flight, an identical request attaches to it — replaying the
+backlog and then following live events — instead of running the pipeline
+again. The work, LLM spend and side effects (DynamoDB writes, SNS alerts)
+happen once however many people are watching.
+
+A job whose last subscriber has gone away is cancelled after
+DETACH_GRACE_SECONDS unless someone reattaches; finished jobs stay
+replayable for RETAIN_SECONDS. Jobs live in this process only.
+"""
+import asyncio
+import itertools
+import os
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from src.utils.events import PipelineEvent, aclose, coalesce_chunks
+from src.utils.logger import get_logger
+from src.utils.sse import stream_response
+
+logger = get_logger(__name__)
+
+# Events kept per job for replay
+REPLAY_BUFFER = int(os.getenv("STREAM_REPLAY_BUFFER", "512"))
+# How long a job keeps running with no subscribers before it is cancelled
+DETACH_GRACE_SECONDS = float(os.getenv("STREAM_DETACH_GRACE_SECONDS", "30"))
+# How long a finished job stays replayable
+RETAIN_SECONDS = float(os.getenv("STREAM_RETAIN_SECONDS", "120"))
+
+
+class StreamJob:
+    """One pipeline run and its replay buffer."""
+
+    def __init__(self, label: str, source: AsyncIterator[PipelineEvent], key: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.key = key
+        self.last_seq = 0
+        self.done = False
+        self.subscribers = 0
+        self.started_at = time.monotonic()
+        self._buffer: Deque[PipelineEvent] = deque(maxlen=REPLAY_BUFFER)
+        self._changed = asyncio.Event()
+        self._grace: Optional[asyncio.TimerHandle] = None
+        self.task = asyncio.create_task(self._run(source))
+
+    async def _run(self, source: AsyncIterator[PipelineEvent]):
+        try:
+            async for event in coalesce_chunks(source):
+                self.last_seq += 1
+                event.id = f"{self.id}:{self.last_seq}"
+                self._buffer.append(event)
+                self._notify()
+        except asyncio.CancelledError:
+            logger.info(f"[{self.label}] Job {self.id} cancelled after {self.last_seq} events.")
+            raise
+        except Exception as e:
+            logger.error(f"[{self.label}] Job {self.id} failed: {e}", exc_info=True)
+        finally:
+            await aclose(source)
+            self.done = True
+            self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _since(self, after: int) -> List[Tuple[int, PipelineEvent]]:
+        if not self._buffer or after >= self.last_seq:
+            return []
+        first = self.last_seq - len(self._buffer) + 1
+        if after + 1 < first:
+            logger.warning(
+                f"[{self.label}] Job {self.id}: events {after + 1}-{first - 1} fell out of the replay buffer."
+            )
+        start = max(after + 1, first)
+        return list(enumerate(itertools.islice(self._buffer, start - first, None), start))
+
+    async def events(self, after: int = 0) -> AsyncIterator[PipelineEvent]:
+        """Replays buffered events with seq > `after`, then follows the live run."""
+        self._attach()
+        try:
+            while True:
+                changed = self._changed
+                for seq, event in self._since(after):
+                    yield event
+                    after = seq
+                if self.done and after >= self.last_seq:
+                    return
+                await changed.wait()
+        finally:
+            self._detach()
+
+    def _attach(self):
+        self.subscribers += 1
+        if self._grace is not None:
+            self._grace.cancel()
+            self._grace = None
+
+    def _detach(self):
+        self.subscribers -= 1
+        if self.subscribers == 0 and not self.done:
+            self._grace = asyncio.get_running_loop().call_later(DETACH_GRACE_SECONDS, self._abandon)
+
+    def _abandon(self):
+        self._grace = None
+        if self.subscribers == 0 and not self.done:
+            logger.info(f"[{self.label}] Job {self.id} has no subscribers — cancelling pipeline.")
+            self.task.cancel()
+
+
+class StreamJobRegistry:
+    def __init__(self):
+        self._jobs: Dict[str, StreamJob] = {}
+        self._running: Dict[str, StreamJob] = {}
+
+    def start(self, label: str, source: AsyncIterator[PipelineEvent], key: Optional[str] = None) -> StreamJob:
+        job = StreamJob(label, source, key)
+        self._jobs[job.id] = job
+        if key is not None:
+            self._running[key] = job
+
+        def finished(_):
+            if key is not None and self._running.get(key) is job:
+                del self._running[key]
+            asyncio.get_running_loop().call_later(RETAIN_SECONDS, self._jobs.pop, job.id, None)
+
+        job.task.add_done_callback(finished)
+        return job
+
+    def get(self, job_id: str) -> Optional[StreamJob]:
+        return self._jobs.get(job_id)
+
+    def running(self, key: str) -> Optional[StreamJob]:
+        """The in-flight job started under `key`, if any."""
+        job = self._running.get(key)
+        return job if job is not None and not job.done else None
+
+
+stream_jobs = StreamJobRegistry()
+
+
+def parse_last_event_id(request: Request) -> Optional[Tuple[str, int]]:
+    """(job_id, seq) from the Last-Event-ID header or `last_event_id` query param."""
+    raw = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    if not raw:
+        return None
+    job_id, _, seq = raw.partition(":")
+    try:
+        return job_id, int(seq)
+    except ValueError:
+        return None
+
+
+def job_response(
+    request: Request,
+    label: str,
+    start: Callable[[], AsyncIterator[PipelineEvent]],
+    key: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    SSE response for a resumable pipeline. Resumes the job named by
+    Last-Event-ID when it is still known, attaches to the in-flight job for
+    `key` if there is one, and otherwise starts `start()` as a new job.
+    """
+    resume = parse_last_event_id(request)
+    job = stream_jobs.get(resume[0]) if resume else None
+    after = 0
+    if job is not None:
+        after = resume[1]
+        logger.info(f"[{label}] Resuming job {job.id} after event {after}")
+    elif key is not None and (job := stream_jobs.running(key)) is not None:
+        logger.info(f"[{label}] Attaching to in-flight job {job.id} ({key}), {job.subscribers} already watching")
+    else:
+        job = stream_jobs.start(label, start(), key)
+    response = stream_response(request, job.events(after), label, coalesce=False)
+    response.headers["X-Stream-Job"] = job.id
+    return response
@@ -0,0 +1,110 @@
+"""
+Startup warm-up.
+
+Everything the first requests would otherwise pay for lazily — boto3 clients,
+DynamoDB table handles (and their existence / index checks), the default LLM
+client, the brand profile and the persona catalog — is resolved once here,
+from the FastAPI lifespan in src/main.py. Each step is timed and isolated:
+a failing step is logged and the service falls back to lazy init on demand.
+"""
+import time
+from typing import Callable, Dict, List, Tuple
+
+from src.core.aws_clients import WARM_CLIENTS, get_client, get_resource
+from src.core.llm_factory import LLMFactory
+from src.services.aws_service import AWSDynamoDBService, CampaignMemoryService, ScoutDynamoDBService
+from src.services.brand_service import BrandService
+from src.services.campaign_service import CampaignService
+from src.services.chronos_service import ChronosService
+from src.services.oracle_service import OracleService
+from src.services.persona_service import persona_service
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _aws_clients():
+    for name in WARM_CLIENTS:
+        get_client(name)
+    get_resource("dynamodb")
+
+
+def _llm():
+    LLMFactory.get_default_llm()
+
+
+def _brand_table():
+    BrandService._get_table()
+
+
+def _campaign_table():
+    CampaignService._get_table()
+
+
+def _oracle_table():
+    OracleService._get_table()
+
+
+def _chronos_table():
+    ChronosService._ensure_table()
+
+
+def _vernacular_table():
+    AWSDynamoDBService()._get_table()
+
+
+def _scout_table():
+    ScoutDynamoDBService()._get_table()
+
+
+def _campaign_memory_table():
+    CampaignMemoryService()._get_table()
+
+
+def _brand_profile():
+    BrandService.get_brand_context()
+
+
+def _personas():
+    persona_service.get_available_personas()
+
+
+# Order matters: clients before tables, tables before the brand profile read.
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("aws_clients", _aws_clients),
+    ("llm", _llm),
+    ("brand_table", _brand_table),
+    ("campaign_table", _campaign_table),
+    ("oracle_table", _oracle_table),
+    ("chronos_table", _chronos_table),
+    ("vernacular_table", _vernacular_table),
+    ("scout_table", _scout_table),
+    ("campaign_memory_table", _campaign_memory_table),
+    ("brand_profile", _brand_profile),
+    ("personas", _personas),
+]
+
+
+def run_warmup() -> Dict[str, Dict[str, object]]:
+    """
+    Runs every warm-up step (blocking — call from a worker thread).
+    Returns {step: {"ok": bool, "ms": float[, "error": str]}}.
+    """
+    report: Dict[str, Dict[str, object]] = {}
+    total_start = time.perf_counter()
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+            report[name] = {"ok": True, "ms": round((time.perf_counter() - start) * 1000, 1)}
+        except Exception as e:
+            report[name] = {
+                "ok": False,
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+                "error": str(e),
+            }
+            logger.warning(f"[Warmup] {name} failed: {e}")
+    total_ms = round((time.perf_counter() - total_start) * 1000, 1)
+    timings = ", ".join(f"{k}={v['ms']}ms" for k, v in report.items())
+    logger.info(f"[Warmup] Completed in {total_ms}ms ({timings})")
+    return report
@@ -6,7 +6,10 @@ try:
 except ImportError:
     print("Warning: python-dotenv not installed. Environment variables might be missing.")
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import all routers from your project structure
@@ -15,11 +18,26 @@ from src.api.v1.endpoints import (
     brand, campaign, persona, performance, calendar, 
     nexus, dashboard, vernacular, chronos
 )
+from src.core.warmup import run_warmup
+from src.services.dispatch_service import DispatchService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve clients, table handles, brand profile and personas before the first request.
+    # Set STARTUP_WARMUP=0 to skip (e.g. local runs without AWS access).
+    app.state.warmup = {}
+    if os.getenv("STARTUP_WARMUP", "1") != "0":
+        app.state.warmup = await run_in_threadpool(run_warmup)
+    yield
+    await DispatchService.aclose()
+
 
 app = FastAPI(
     title="CloudCraft AI Backend",
     description="Agentic content creation API for AI for Bharat Hackathon",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Allow frontend access (Localhost and any other origin via "*")
@@ -29,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Audio-Url", "X-Stream-Job"],
 )
 
 # --- Include all your API routers ---
@@ -60,7 +79,11 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "agents": ["Researcher", "Copywriter", "Designer", "Compliance"]}
+    return {
+        "status": "healthy",
+        "agents": ["Researcher", "Copywriter", "Designer", "Compliance"],
+        "warmup": getattr(app.state, "warmup", {}),
+    }
 
 # Serverless handler for AWS Lambda / API Gateway
 from mangum import Mangum
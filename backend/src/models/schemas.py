@@ -19,6 +19,12 @@ class TransmuteRequest(BaseModel):
     target_language: str = "English" # e.g., "Hindi", "Tamil", "Hinglish"
     tone_modifier: Optional[str] = None
 
+class TransmuteMatrixRequest(BaseModel):
+    content: str
+    target_formats: List[str]    # e.g., ["Twitter Thread", "LinkedIn Post"]
+    target_languages: List[str]  # e.g., ["English", "Hindi", "Tamil"]
+    tone_modifier: Optional[str] = None
+
 class TransmuteResponse(BaseModel):
     transformed_content: str
     format_notes: str
@@ -132,6 +138,13 @@ class OracleHistoryItem(BaseModel):
     input_content: str
     response: OracleResponse
 
+class OracleHistorySummary(BaseModel):
+    id: str
+    timestamp: str
+    input_content: str
+    viral_score: int = 0
+    confidence_level: str = "Medium"
+
 # --- CAMPAIGN ARCHITECT SCHEMAS ---
 class AudienceSegment(BaseModel):
     segment_name: str
@@ -217,6 +230,11 @@ class PerformanceResponse(BaseModel):
     status: str = "success"
 
 # Calendar & Scheduler Schemas
+class PreflightAudit(BaseModel):
+    content: str # audited text, ready to post
+    source_hash: str # hash of the post content it was made from
+    audited_at: str # ISO format (UTC)
+
 class ScheduledPost(BaseModel):
     id: str
     content: str
@@ -228,6 +246,7 @@ class ScheduledPost(BaseModel):
     aws_mission_id: Optional[str] = None
     webhook_url: Optional[str] = None
     execution_logs: List[str] = []
+    audits: Dict[str, PreflightAudit] = {} # pre-flight audits by platform
 
 class MissionExecutionRequest(BaseModel):
     content: str
@@ -242,9 +261,35 @@ class MissionExecutionResponse(BaseModel):
     status: str
     message: str
 
+class DispatchTarget(BaseModel):
+    platform: str
+    webhook_url: str
+
+class DispatchRequest(BaseModel):
+    # Defaults to the post's own platform and webhook
+    targets: Optional[List[DispatchTarget]] = None
+
+class DispatchQueueRequest(BaseModel):
+    # Dispatch everything still scheduled up to the end of this day (YYYY-MM-DD); default: everything due now
+    date: Optional[str] = None
+
+class DispatchResult(BaseModel):
+    platform: str
+    webhook_url: str
+    success: bool
+    status_code: Optional[int] = None
+    attempts: int = 0
+    idempotency_key: str
+    duplicate: bool = False # already delivered earlier; not sent again
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
 class CalendarResponse(BaseModel):
     posts: List[ScheduledPost]
     status: str = "success"
+    total: Optional[int] = None # matches across all pages
+    offset: int = 0
+    limit: Optional[int] = None
 
 # --- VISION LAB SCHEMAS ---
 class VisionAnalysisRequest(BaseModel):
@@ -0,0 +1,188 @@
+"""
+Time-series analytics for the dashboard's analytics tab.
+
+Three metrics feed a TimeSeriesStore (hour and day rollups on NumPy arrays):
+Oracle viral scores, scheduled-post performance scores (labelled by
+platform) and Scout viral scores. The store is built once per process from
+the calendar and the Oracle / Scout DynamoDB history, then kept current by
+the write paths (`record_*`), so answering a query is a few vectorised sums
+over pre-aggregated buckets.
+
+With a shared STATE_BACKEND other workers also write, so the store is
+rebuilt when it is older than ANALYTICS_REFRESH_SECONDS. Only the first
+build blocks a request; later rebuilds run on a background thread while
+queries keep reading the previous store.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from src.core.state_backend import state_backend
+from src.models.schemas import ScheduledPost
+from src.utils.logger import get_logger
+from src.utils.timeseries import TimeSeriesStore
+
+logger = get_logger(__name__)
+
+ORACLE = "oracle"
+POSTS = "posts"
+SCOUT = "scout"
+
+REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "300"))
+# Rollup window around now: the longest /dashboard/analytics range back, scheduled posts ahead.
+# Samples outside it only count towards per-platform totals.
+RETENTION_DAYS = int(os.getenv("ANALYTICS_RETENTION_DAYS", "366"))
+FUTURE_DAYS = int(os.getenv("ANALYTICS_FUTURE_DAYS", "90"))
+# Upper bound on history items read per source when building
+BOOTSTRAP_ITEMS = int(os.getenv("ANALYTICS_BOOTSTRAP_ITEMS", "50000"))
+ORACLE_PAGE_SIZE = 100
+
+
+def _epoch(iso: str, naive_utc: bool = False) -> Optional[float]:
+    """Epoch seconds for an ISO time; naive values are local unless `naive_utc`."""
+    try:
+        moment = datetime.fromisoformat(iso)
+    except (TypeError, ValueError):
+        return None
+    if naive_utc and moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _platform(name: str) -> str:
+    # "LinkedIn Professional" and "LinkedIn Article" are both LinkedIn
+    return name.split(" ")[0] if name else "Other"
+
+
+class AnalyticsService:
+    _store: Optional[TimeSeriesStore] = None
+    _built_at = 0.0
+    _build_lock = threading.Lock()
+    _rebuilding = False
+
+    # --- Write path ---
+
+    @classmethod
+    def record_post(cls, post: Optional[ScheduledPost], previous: Optional[ScheduledPost] = None):
+        """Applies a calendar write; see DashboardService.record_post."""
+        store = cls._store
+        # Before the first build, the build itself picks the post up
+        if store is None:
+            return
+        for version, weight in ((previous, -1), (post, 1)):
+            if version is None or not version.performance_score:
+                continue
+            ts = _epoch(version.scheduled_time)
+            if ts is not None:
+                store.add(POSTS, ts, version.performance_score, _platform(version.platform), weight)
+
+    @classmethod
+    def record_prediction(cls, viral_score: int, timestamp: str):
+        ts = _epoch(timestamp, naive_utc=True)
+        if cls._store is not None and ts is not None:
+            cls._store.add(ORACLE, ts, viral_score)
+
+    @classmethod
+    def record_scout(cls, viral_score: int, timestamp: str):
+        ts = _epoch(timestamp, naive_utc=True)
+        if cls._store is not None and ts is not None:
+            cls._store.add(SCOUT, ts, viral_score)
+
+    # --- Build ---
+
+    @classmethod
+    def _build(cls) -> TimeSeriesStore:
+        from src.services.aws_service import ScoutDynamoDBService
+        from src.services.calendar_service import CalendarService
+        from src.services.oracle_service import OracleService
+
+        store = TimeSeriesStore(past_days=RETENTION_DAYS, future_days=FUTURE_DAYS)
+        posts = CalendarService.get_all_posts()
+        for post in posts:
+            if post.performance_score:
+                ts = _epoch(post.scheduled_time)
+                if ts is not None:
+                    store.add(POSTS, ts, post.performance_score, _platform(post.platform))
+
+        predictions = 0
+        cursor = None
+        while predictions < BOOTSTRAP_ITEMS:
+            page, cursor = OracleService.get_history(ORACLE_PAGE_SIZE, cursor)
+            for item in page:
+                ts = _epoch(item.timestamp, naive_utc=True)
+                if ts is not None:
+                    store.add(ORACLE, ts, item.viral_score)
+            predictions += len(page)
+            if not cursor:
+                break
+
+        runs = ScoutDynamoDBService().get_score_history(BOOTSTRAP_ITEMS)
+        for timestamp, score in runs:
+            ts = _epoch(timestamp, naive_utc=True)
+            if ts is not None:
+                store.add(SCOUT, ts, score)
+
+        logger.info(f"Analytics built from {len(posts)} posts, {predictions} predictions, {len(runs)} scout runs")
+        return store
+
+    @classmethod
+    def _stale(cls) -> bool:
+        return state_backend.shared and time.monotonic() - cls._built_at > REFRESH_SECONDS
+
+    @classmethod
+    def _rebuild(cls):
+        try:
+            cls._store = cls._build()
+            cls._built_at = time.monotonic()
+        except Exception as e:
+            # Keep serving the previous store; retry after another interval
+            logger.error(f"Analytics rebuild failed: {e}")
+            cls._built_at = time.monotonic()
+        finally:
+            cls._rebuilding = False
+
+    @classmethod
+    def _ensure_built(cls) -> TimeSeriesStore:
+        if cls._store is None:
+            with cls._build_lock:
+                if cls._store is None:
+                    cls._store = cls._build()
+                    cls._built_at = time.monotonic()
+        elif cls._stale():
+            with cls._build_lock:
+                start = not cls._rebuilding
+                cls._rebuilding = True
+            if start:
+                threading.Thread(target=cls._rebuild, name="analytics-rebuild", daemon=True).start()
+        return cls._store
+
+    # --- Queries ---
+
+    @classmethod
+    def get_trending(cls, days: int = 7, resolution: str = "day") -> List[Dict[str, Any]]:
+        """Mean score and sample volume across all metrics per bucket, oldest first."""
+        store = cls._ensure_built()
+        buckets = days * 24 if resolution == "hour" else days
+        starts, sums, counts = store.trend((ORACLE, POSTS, SCOUT), resolution, buckets, time.time())
+        means = sums / counts.clip(min=1)
+        fmt = "%H:00" if resolution == "hour" else ("%a" if days <= 7 else "%d %b")
+        return [
+            {
+                "name": datetime.fromtimestamp(int(start), timezone.utc).strftime(fmt),
+                # No samples: a gap in the chart rather than a zero
+                "score": round(float(mean), 1) if count else None,
+                "vol": int(count),
+            }
+            for start, mean, count in zip(starts, means, counts)
+        ]
+
+    @classmethod
+    def get_platform_performance(cls) -> List[Dict[str, Any]]:
+        """Mean performance score and number of scored posts per platform."""
+        store = cls._ensure_built()
+        return [
+            {"name": label, "score": round(total / count, 1), "engagement": count}
+            for label, total, count in sorted(store.totals(POSTS), key=lambda t: -t[2])
+        ]
@@ -1,11 +1,19 @@
+import asyncio
 import boto3
+import hashlib
 import json
+import re
+import unicodedata
 import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from botocore.exceptions import ClientError
+from fastapi.concurrency import run_in_threadpool
 from src.utils.logger import get_logger
+from src.utils.dynamodb_query import RECORD_TYPE_ATTR, ensure_time_index, query_newest_first
 from src.core.config import settings
+from src.core.aws_clients import get_client, get_resource
+from src.services.analytics_service import AnalyticsService
 
 logger = get_logger(__name__)
 
@@ -15,12 +23,7 @@ class EventBridgeService:
     """
     
     def __init__(self):
-        self.client = boto3.client(
-            'scheduler',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.client = get_client('scheduler')
         # CloudCraft EventBridge Scheduler Execution Role
         self.role_arn = "arn:aws:iam::500053636944:role/CloudCraft-EventBridgeScheduler-ExecutionRole"
 
@@ -104,12 +107,7 @@ class AWSPollyService:
     Provides hyper-fluent Indian accents (much better than gTTS) while remaining free.
     """
     def __init__(self):
-        self.polly = boto3.client(
-            'polly',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.polly = get_client('polly')
         # Edge TTS High-Quality Neural Voices for Indian Regional Languages
         self.EDGE_VOICE_MAP = {
             "Hindi": "hi-IN-SwaraNeural",
@@ -124,29 +122,124 @@ class AWSPollyService:
             "Default": "en-IN-NeerjaNeural"
         }
 
+    # Punctuation worth keeping for prosody; includes the Devanagari danda/double danda
+    SPOKEN_PUNCTUATION = set(",.?!'-।॥")
+    # ZWNJ/ZWJ change conjunct and chillu rendering in Indic scripts
+    JOINERS = {"\u200c", "\u200d"}
+
     def _strip_emojis(self, text: str) -> str:
         """Removes emojis and unreadable characters from text before TTS synthesis."""
-        import re
-        # This keeps letters of all languages (\w), spaces, and basic punctuation
-        return re.sub(r'[^\w\s,.?!\'-]', '', text)
+        # Keep letters, combining marks (Indic vowel signs / viramas are Mn/Mc, not \w),
+        # digits, whitespace and basic punctuation; drop symbols (emoji) and variation selectors.
+        return "".join(
+            ch for ch in text
+            if ch in self.SPOKEN_PUNCTUATION or ch in self.JOINERS or ch.isspace()
+            or (unicodedata.category(ch)[0] in "LMN" and ch not in "\ufe0e\ufe0f")
+        )
 
-    async def synthesize_speech(self, text: str, language: str) -> Optional[bytes]:
+    # Parallel synthesis: text is split at sentence boundaries into chunks of about
+    # TTS_CHUNK_CHARS, synthesised up to TTS_MAX_CONCURRENCY at a time, and the MP3
+    # frames are emitted in order (MP3 streams concatenate cleanly).
+    TTS_CHUNK_CHARS = 600
+    TTS_MAX_CONCURRENCY = 4
+    # Sentence ends: Latin . ? ! and the danda (।) / double danda (॥) used by
+    # Devanagari, Bengali, Gurmukhi, Odia etc. Tamil, Telugu, Kannada, Malayalam and
+    # Gujarati copy uses Latin full stops.
+    _SENTENCE_END = re.compile(r"(?<=[.?!।॥])\s+")
+    _CLAUSE_END = re.compile(r"(?<=[,;])\s+")
+
+    def voice_for(self, language: str) -> str:
+        return self.EDGE_VOICE_MAP.get(language, self.EDGE_VOICE_MAP["Default"])
+
+    def normalise_text(self, text: str) -> str:
+        """The exact text that gets spoken: emojis stripped, Unicode NFC, whitespace collapsed."""
+        clean = self._strip_emojis(unicodedata.normalize("NFC", text))
+        return re.sub(r"\s+", " ", clean).strip()
+
+    def split_for_tts(self, text: str, max_chars: Optional[int] = None) -> List[str]:
+        """
+        Packs whole sentences into chunks of at most `max_chars`. Overlong sentences
+        are split at clause punctuation, then at word boundaries; never mid-word, so
+        no grapheme cluster is broken.
+        """
+        max_chars = max_chars or self.TTS_CHUNK_CHARS
+        pieces: List[str] = []
+        for sentence in self._SENTENCE_END.split(text):
+            if len(sentence) <= max_chars:
+                pieces.append(sentence)
+                continue
+            for clause in self._CLAUSE_END.split(sentence):
+                if len(clause) <= max_chars:
+                    pieces.append(clause)
+                else:
+                    pieces.extend(clause.split(" "))
+
+        chunks: List[str] = []
+        current = ""
+        for piece in pieces:
+            if not piece:
+                continue
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _stream_single(self, text: str, voice_id: str) -> AsyncIterator[bytes]:
+        import edge_tts
+
+        communicate = edge_tts.Communicate(text, voice_id)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+    async def _synthesize_chunk(self, text: str, voice_id: str, semaphore: asyncio.Semaphore) -> bytes:
+        async with semaphore:
+            audio = bytearray()
+            async for data in self._stream_single(text, voice_id):
+                audio.extend(data)
+            return bytes(audio)
+
+    async def stream_speech(self, text: str, language: str, parallel: bool = True) -> AsyncIterator[bytes]:
+        """
+        Yields MP3 chunks as they are produced, so callers can forward them
+        (e.g. into an S3 multipart upload) without holding the whole clip in memory.
+        `text` should already be normalised via normalise_text.
+
+        With `parallel`, long text is synthesised as concurrent sentence chunks and
+        each chunk's audio is yielded in order as soon as it (and its predecessors)
+        are ready. Short text, or parallel=False, is a single edge-tts request.
+        """
+        voice_id = self.voice_for(language)
+        chunks = self.split_for_tts(text) if parallel else [text]
+        logger.info(
+            f"[TTS] Synthesizing {language} voice using HIGH-FIDELITY Neural Engine "
+            f"({voice_id}, {len(chunks)} chunk(s))"
+        )
+        if len(chunks) <= 1:
+            async for data in self._stream_single(text, voice_id):
+                yield data
+            return
+
+        semaphore = asyncio.Semaphore(self.TTS_MAX_CONCURRENCY)
+        tasks = [asyncio.create_task(self._synthesize_chunk(c, voice_id, semaphore)) for c in chunks]
         try:
-            # 1. Strip emojis so they don't get literally read out loud (e.g. "smile face")
-            clean_text = self._strip_emojis(text)
-            voice_id = self.EDGE_VOICE_MAP.get(language, self.EDGE_VOICE_MAP["Default"])
-            
-            logger.info(f"[TTS] Synthesizing {language} voice using HIGH-FIDELITY Neural Engine ({voice_id})")
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
 
-            # 2. Use Edge TTS (async) for truly native, ultra-fluent Indian language TTS
-            import edge_tts
-            
-            communicate = edge_tts.Communicate(clean_text[:5000], voice_id)
+    async def synthesize_speech(self, text: str, language: str) -> Optional[bytes]:
+        try:
+            # Strip emojis so they don't get literally read out loud (e.g. "smile face")
             audio_data = bytearray()
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    audio_data.extend(chunk["data"])
-                    
+            async for chunk in self.stream_speech(self.normalise_text(text), language):
+                audio_data.extend(chunk)
+
             audio_bytes = bytes(audio_data)
             logger.info(f"[TTS] ✓ Synthesized {len(audio_bytes)} bytes of fluid neural {language} audio")
             return audio_bytes
@@ -161,12 +254,7 @@ class AWSS3Service:
     AWS S3 service for storing generative assets (audio, images).
     """
     def __init__(self):
-        self.s3 = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.s3 = get_client('s3')
         # Using a fallback bucket name if not set
         self.bucket = getattr(settings, "AWS_S3_BUCKET_NAME", "cloudcraft-vernacular-assets-hackathon")
 
@@ -188,17 +276,108 @@ class AWSS3Service:
             logger.error(f"AWS S3 Upload failed: {str(e)}")
             return None
 
+    # S3 multipart parts must be >= 5 MiB (except the last one)
+    MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+    def public_url(self, key: str) -> str:
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+    @staticmethod
+    def audio_cache_key(voice_id: str, normalised_text: str) -> str:
+        """Content-addressed key: identical copy in the same voice maps to the same object."""
+        digest = hashlib.sha256(f"{voice_id}\n{normalised_text}".encode("utf-8")).hexdigest()
+        return f"vernacular/audio/tts/{voice_id}/{digest}.mp3"
+
+    async def find_audio(self, key: str) -> Optional[str]:
+        """Returns the public URL if `key` already exists, else None."""
+        try:
+            await run_in_threadpool(self.s3.head_object, Bucket=self.bucket, Key=key)
+            return self.public_url(key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                logger.warning(f"[S3] Audio cache lookup failed for {key}: {e}")
+            return None
+
+    async def stream_object(self, key: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Yields an S3 object's bytes in chunks (blocking reads run in the threadpool)."""
+        obj = await run_in_threadpool(self.s3.get_object, Bucket=self.bucket, Key=key)
+        body = obj["Body"]
+        try:
+            while True:
+                data = await run_in_threadpool(body.read, chunk_size)
+                if not data:
+                    break
+                yield data
+        finally:
+            body.close()
+
+    async def upload_audio_stream(self, chunks: AsyncIterator[bytes], key: str) -> Optional[str]:
+        """
+        Uploads an audio stream while it is still being produced. Parts are flushed
+        every MULTIPART_PART_SIZE bytes, so memory per upload stays bounded; clips
+        that finish below one part go up as a single put_object.
+        """
+        buffer = bytearray()
+        upload_id = None
+        parts: List[Dict[str, Any]] = []
+
+        async def flush_part():
+            nonlocal upload_id
+            if upload_id is None:
+                created = await run_in_threadpool(
+                    self.s3.create_multipart_upload,
+                    Bucket=self.bucket, Key=key, ContentType='audio/mpeg'
+                )
+                upload_id = created["UploadId"]
+            part_number = len(parts) + 1
+            resp = await run_in_threadpool(
+                self.s3.upload_part,
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                PartNumber=part_number, Body=bytes(buffer)
+            )
+            parts.append({"PartNumber": part_number, "ETag": resp["ETag"]})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                if len(buffer) >= self.MULTIPART_PART_SIZE:
+                    await flush_part()
+
+            if upload_id is None:
+                if not buffer:
+                    return None
+                await run_in_threadpool(
+                    self.s3.put_object,
+                    Bucket=self.bucket, Key=key, Body=bytes(buffer), ContentType='audio/mpeg'
+                )
+            else:
+                if buffer:
+                    await flush_part()
+                await run_in_threadpool(
+                    self.s3.complete_multipart_upload,
+                    Bucket=self.bucket, Key=key, UploadId=upload_id,
+                    MultipartUpload={"Parts": parts}
+                )
+            return self.public_url(key)
+        except Exception as e:
+            logger.error(f"AWS S3 streaming upload failed for {key}: {str(e)}")
+            if upload_id is not None:
+                try:
+                    await run_in_threadpool(
+                        self.s3.abort_multipart_upload,
+                        Bucket=self.bucket, Key=key, UploadId=upload_id
+                    )
+                except Exception:
+                    pass
+            return None
+
 class AWSStepFunctionsService:
     """
     AWS Step Functions service for orchestrating agentic workflows completely serverless.
     """
     def __init__(self):
-        self.sfn = boto3.client(
-            'stepfunctions',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.sfn = get_client('stepfunctions')
         self.state_machine_arn = "arn:aws:states:us-east-1:123456789012:stateMachine:CloudCraft-ForgeSupervisor"
 
     async def start_forge_workflow(self, prompt: str, image_context: Optional[Dict[str, Any]] = None) -> Optional[str]:
@@ -231,12 +410,7 @@ class AWSRekognitionService:
     AWS Rekognition service for multimodal image analysis (Brand safety, object detection).
     """
     def __init__(self):
-        self.rekognition = boto3.client(
-            'rekognition',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.rekognition = get_client('rekognition')
 
     async def analyze_image(self, image_bytes: bytes) -> Dict[str, Any]:
         """
@@ -271,17 +445,23 @@ class AWSDynamoDBService:
     Each transmutation is logged so users can review past runs.
     """
     TABLE_NAME = "cloudcraft-vernacular-history"
+    RECORD_TYPE = "VERNACULAR_TRANSMUTATION"
+    SUMMARY_FIELDS = [
+        "id", "timestamp", "state", "language", "original_content",
+        "comprehend_sentiment", "comprehend_score", "audio_url",
+    ]
+    _table = None
 
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.dynamodb = get_resource('dynamodb')
 
     def _get_table(self):
-        return self.dynamodb.Table(self.TABLE_NAME)
+        # Cached on the class: the service is instantiated per request
+        if AWSDynamoDBService._table is None:
+            table = self.dynamodb.Table(self.TABLE_NAME)
+            ensure_time_index(table, "timestamp")
+            AWSDynamoDBService._table = table
+        return AWSDynamoDBService._table
 
     async def log_transmutation(self, data: Dict[str, Any]) -> str:
         """Log a completed transmutation to DynamoDB."""
@@ -289,6 +469,7 @@ class AWSDynamoDBService:
             item_id = str(uuid.uuid4())
             item = {
                 "id": item_id,
+                RECORD_TYPE_ATTR: self.RECORD_TYPE,
                 "timestamp": datetime.utcnow().isoformat(),
                 "state": data.get("state", ""),
                 "language": data.get("language", ""),
@@ -298,24 +479,26 @@ class AWSDynamoDBService:
                 "comprehend_score": str(round(data.get("comprehend_score", 0.0), 1)),
                 "audio_url": data.get("audio_url") or "",
             }
-            self._get_table().put_item(Item=item)
+            await run_in_threadpool(self._get_table().put_item, Item=item)
             logger.info(f"[DynamoDB] Logged transmutation {item_id} for state: {item['state']}")
             return item_id
         except Exception as e:
             logger.error(f"[DynamoDB] Failed to log transmutation: {str(e)}")
             return ""
 
-    async def get_recent_history(self, limit: int = 10) -> list:
-        """Scan and return recent transmutations (for demo purposes)."""
+    async def get_recent_history(self, limit: int = 10, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """Returns one page of transmutation summaries, newest first, plus the next-page cursor."""
         try:
-            response = self._get_table().scan(Limit=limit)
-            items = response.get("Items", [])
-            # Sort by timestamp descending
-            items.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            return items[:limit]
+            return await run_in_threadpool(
+                query_newest_first,
+                self._get_table(), self.RECORD_TYPE, "timestamp",
+                limit, cursor, self.SUMMARY_FIELDS,
+            )
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"[DynamoDB] Failed to retrieve history: {str(e)}")
-            return []
+            return [], None
 
 
 class AWSComprehendService:
@@ -324,12 +507,7 @@ class AWSComprehendService:
     Used by both the Forge compliance pipeline and the Scout agentic pipeline.
     """
     def __init__(self):
-        self.comprehend = boto3.client(
-            'comprehend',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.comprehend = get_client('comprehend')
 
     async def analyze_compliance_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -340,7 +518,8 @@ class AWSComprehendService:
             logger.info("📡 [AWS TELEMETRY] Initializing Amazon Comprehend Sentiment Analysis...")
             checked_text = text[:4900]
             
-            response = self.comprehend.detect_sentiment(
+            response = await run_in_threadpool(
+                self.comprehend.detect_sentiment,
                 Text=checked_text,
                 LanguageCode='en'
             )
@@ -432,12 +611,7 @@ class AWSSNSService:
     Scout agent triggers this when viral_score exceeds threshold — no human involvement.
     """
     def __init__(self):
-        self.sns = boto3.client(
-            'sns',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.sns = get_client('sns')
         self.topic_arn = settings.AWS_SNS_TOPIC_ARN
 
     async def publish_hot_signal(self, city: str, viral_score: int, insights: Dict[str, Any]) -> bool:
@@ -494,25 +668,20 @@ class ScoutDynamoDBService:
     Schema: PK=city (S), SK=timestamp (S)
     """
     TABLE_NAME = "cloudcraft-scout-memory"
+    _table = None
 
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-        self._table = None
+        self.dynamodb = get_resource('dynamodb')
 
     def _get_table(self):
-        """Lazy-load table, auto-creating it if it doesn't exist (free tier PAY_PER_REQUEST)."""
+        """Lazy-load table once per process, auto-creating it if it doesn't exist (free tier PAY_PER_REQUEST)."""
         if self._table:
             return self._table
         try:
             table = self.dynamodb.Table(self.TABLE_NAME)
             table.load()  # Raises ResourceNotFoundException if missing
             logger.info(f"[ScoutDB] Connected to table: {self.TABLE_NAME}")
-            self._table = table
+            ScoutDynamoDBService._table = table
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceNotFoundException':
                 logger.info(f"[ScoutDB] Table {self.TABLE_NAME} not found — auto-creating...")
@@ -531,10 +700,10 @@ class ScoutDynamoDBService:
                     )
                     table.wait_until_exists()
                     logger.info(f"[ScoutDB] ✅ Table {self.TABLE_NAME} created successfully")
-                    self._table = table
+                    ScoutDynamoDBService._table = table
                 except ClientError as ce:
                     if ce.response['Error']['Code'] == 'ResourceInUseException':
-                        self._table = self.dynamodb.Table(self.TABLE_NAME)
+                        ScoutDynamoDBService._table = self.dynamodb.Table(self.TABLE_NAME)
                     else:
                         raise ce
             else:
@@ -575,6 +744,7 @@ class ScoutDynamoDBService:
 
             table.put_item(Item=item)
             logger.info(f"[ScoutDB] ✅ Saved scout run {run_id} for '{city}' at {timestamp}")
+            AnalyticsService.record_scout(viral_score, timestamp)
             return run_id
         except Exception as e:
             logger.error(f"[ScoutDB] Failed to save scout run: {e}")
@@ -611,6 +781,30 @@ class ScoutDynamoDBService:
             logger.warning(f"[ScoutDB] Could not retrieve history for '{city}': {e}")
             return []
 
+    def get_score_history(self, max_items: int = 50000) -> List[Tuple[str, int]]:
+        """
+        (timestamp, viral_score) for stored runs across all cities, projecting
+        only those two attributes. Used once per process to build analytics.
+        """
+        try:
+            table = self._get_table()
+            kwargs = {"ProjectionExpression": "#ts, viral_score", "ExpressionAttributeNames": {"#ts": "timestamp"}}
+            history: List[Tuple[str, int]] = []
+            while len(history) < max_items:
+                response = table.scan(**kwargs)
+                history.extend(
+                    (item["timestamp"], int(item["viral_score"]))
+                    for item in response.get("Items", [])
+                    if "viral_score" in item
+                )
+                if "LastEvaluatedKey" not in response:
+                    break
+                kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            return history[:max_items]
+        except Exception as e:
+            logger.warning(f"[ScoutDB] Could not read score history: {e}")
+            return []
+
     def compute_trend_delta(self, current_insights: Dict[str, Any], past_runs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Computes what's NEW vs RECURRING vs FADING compared to past scout runs.
@@ -694,12 +888,7 @@ class CampaignComprehendService:
       - Overall market sentiment
     """
     def __init__(self):
-        self.comprehend = boto3.client(
-            'comprehend',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        self.comprehend = get_client('comprehend')
 
     async def analyze_market_intelligence(self, raw_text: str) -> Dict[str, Any]:
         """
@@ -774,12 +963,7 @@ class CampaignMemoryService:
     def _get_table(self):
         if self._table:
             return self._table
-        dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        dynamodb = get_resource('dynamodb')
         try:
             t = dynamodb.Table(self.TABLE_NAME)
             t.load()
@@ -800,7 +984,7 @@ class CampaignMemoryService:
                 logger.info(f"[CAMPAIGN-MEMORY] Created table {self.TABLE_NAME}")
             else:
                 raise
-        self._table = t
+        CampaignMemoryService._table = t
         return self._table
 
     async def save_campaign_intelligence(
@@ -830,7 +1014,6 @@ class CampaignMemoryService:
             "usps": strategy.get("usps", []),
         }
         try:
-            from fastapi.concurrency import run_in_threadpool
             await run_in_threadpool(self._get_table().put_item, Item=item)
             logger.info(f"[CAMPAIGN-MEMORY] Saved run {run_id} for campaign {campaign_id}")
         except Exception as e:
@@ -843,7 +1026,6 @@ class CampaignMemoryService:
         Returns similarity metadata for the memory panel.
         """
         try:
-            from fastapi.concurrency import run_in_threadpool
             resp = await run_in_threadpool(self._get_table().scan, Limit=50)
             items = resp.get("Items", [])
             goal_words = set(goal.lower().split())
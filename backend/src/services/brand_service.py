@@ -1,16 +1,33 @@
 import boto3
+import json
 import os
+import threading
+import time
 from botocore.exceptions import ClientError
+from typing import Optional
 from src.models.schemas import BrandProfile
 from src.utils.logger import get_logger
 from datetime import datetime
 
 logger = get_logger(__name__)
 
+# How long a worker trusts its cached brand before re-checking lastUpdated.
+# Keeps multiple workers consistent after a save on another worker.
+BRAND_CACHE_TTL_SECONDS = float(os.getenv("BRAND_CACHE_TTL_SECONDS", "30"))
+
+
 class BrandService:
     TABLE_NAME = "CloudCraft-Brand-Identity"
     _table = None
 
+    # In-process cache of the singleton brand: parsed profile + rendered prompt block,
+    # stamped with the profile's lastUpdated so TTL expiry can revalidate cheaply.
+    _cache_lock = threading.Lock()
+    _cached_profile: Optional[BrandProfile] = None
+    _cached_context: str = ""
+    _cached_version: Optional[str] = None
+    _cached_at: Optional[float] = None
+
     @classmethod
     def _get_table(cls):
         """Lazy load DynamoDB table resource, creating it if it doesn't exist."""
@@ -74,6 +91,47 @@ class BrandService:
             logger.error(f"Failed to load from local file: {e}")
             return None
 
+    @classmethod
+    def invalidate_cache(cls):
+        """Drops the cached brand so the next read reloads it."""
+        with cls._cache_lock:
+            cls._cached_profile = None
+            cls._cached_context = ""
+            cls._cached_version = None
+            cls._cached_at = None
+
+    @classmethod
+    def _fetch_version(cls) -> Optional[str]:
+        """Reads only lastUpdated from DynamoDB. None means 'unknown, reload fully'."""
+        try:
+            response = cls._get_table().get_item(
+                Key={"pk": "BRAND_IDENTITY"},
+                ProjectionExpression="lastUpdated",
+            )
+            return response.get("Item", {}).get("lastUpdated")
+        except Exception:
+            return None
+
+    @classmethod
+    def _get_cached(cls):
+        """Returns (profile, context), reloading only when the TTL expired and lastUpdated moved."""
+        with cls._cache_lock:
+            now = time.monotonic()
+            if cls._cached_at is not None and now - cls._cached_at < BRAND_CACHE_TTL_SECONDS:
+                return cls._cached_profile, cls._cached_context
+
+            if cls._cached_at is not None and cls._cached_version is not None:
+                if cls._fetch_version() == cls._cached_version:
+                    cls._cached_at = now
+                    return cls._cached_profile, cls._cached_context
+
+            profile = cls._load_brand_profile_uncached()
+            cls._cached_profile = profile
+            cls._cached_context = cls._render_context(profile) if profile else ""
+            cls._cached_version = profile.lastUpdated if profile else None
+            cls._cached_at = now
+            return cls._cached_profile, cls._cached_context
+
     @classmethod
     def save_brand_profile(cls, profile: BrandProfile):
         """Save brand profile to DynamoDB with File Fallback"""
@@ -90,9 +148,17 @@ class BrandService:
             logger.warning(f"DynamoDB save failed ({str(e)}). Switching to local fallback.")
             cls._save_to_file(item)
             return item
+        finally:
+            cls.invalidate_cache()
 
     @classmethod
     def load_brand_profile(cls) -> BrandProfile:
+        """Load brand profile (cached in-process, see BRAND_CACHE_TTL_SECONDS)"""
+        profile, _ = cls._get_cached()
+        return profile
+
+    @classmethod
+    def _load_brand_profile_uncached(cls) -> BrandProfile:
         """Load brand profile from DynamoDB with File Fallback"""
         try:
             table = cls._get_table()
@@ -111,11 +177,12 @@ class BrandService:
 
     @classmethod
     def get_brand_context(cls) -> str:
-        """Format brand profile as context string for AI agents"""
-        profile = cls.load_brand_profile()
-        if not profile:
-            return ""
-            
+        """Format brand profile as context string for AI agents (cached with the profile)"""
+        _, context = cls._get_cached()
+        return context
+
+    @staticmethod
+    def _render_context(profile: BrandProfile) -> str:
         return f"""
         BRAND IDENTITY & VOICE (For Style/Tone Only):
         - Brand Name: {profile.brandName}
@@ -1,42 +1,159 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from src.core.state_backend import state_backend
 from src.models.schemas import ScheduledPost
+from src.services.analytics_service import AnalyticsService
+from src.services.dashboard_service import DashboardService
+
+# Posts live in the shared state backend (see STATE_BACKEND) so every worker sees the same calendar
+POSTS_NAMESPACE = "calendar_posts"
+META_NAMESPACE = "calendar_meta"
+
+# Sorted indexes of post ids by scheduled time: all posts, and one per status / platform
+TIME_INDEX = "calendar_by_time"
+STATUS_INDEX = "calendar_by_status:{}"
+PLATFORM_INDEX = "calendar_by_platform:{}"
 
 class CalendarService:
-    # In-memory storage for hackathon demonstration
-    _scheduled_posts: List[ScheduledPost] = []
+    # Set once this process has checked the indexes and demo data exist
+    _ready = False
+
+    @staticmethod
+    def _score(scheduled_time: str) -> float:
+        """Sort key for a post: its scheduled time as epoch seconds (naive times are local)."""
+        try:
+            return datetime.fromisoformat(scheduled_time).timestamp()
+        except ValueError:
+            return 0.0
+
+    @staticmethod
+    def _indexes(post: ScheduledPost) -> List[str]:
+        return [TIME_INDEX, STATUS_INDEX.format(post.status), PLATFORM_INDEX.format(post.platform.lower())]
+
+    @classmethod
+    def _index(cls, post: ScheduledPost, previous: Optional[ScheduledPost] = None):
+        if previous is not None:
+            for index in set(cls._indexes(previous)) - set(cls._indexes(post)):
+                state_backend.index_remove(index, previous.id)
+        score = cls._score(post.scheduled_time)
+        for index in cls._indexes(post):
+            state_backend.index_add(index, post.id, score)
+
+    @classmethod
+    def ensure_ready(cls):
+        """Indexes posts stored before the indexes existed and seeds the demo calendar, once."""
+        if cls._ready:
+            return
+        # Posts stored before the indexes existed are indexed once per backend
+        if state_backend.add(META_NAMESPACE, "indexed", True):
+            for data in state_backend.items(POSTS_NAMESPACE).values():
+                cls._index(ScheduledPost(**data))
+        # Add some mock data on first use for demo purposes (once per backend, not once per worker)
+        if state_backend.index_count(TIME_INDEX) == 0 and state_backend.add(META_NAMESPACE, "seeded", True):
+            cls._seed_mock_data()
+        cls._ready = True
+
+    @classmethod
+    def get_posts(cls, post_ids: List[str]) -> List[ScheduledPost]:
+        """The posts that exist among `post_ids`, in that order."""
+        docs = state_backend.get_many(POSTS_NAMESPACE, post_ids)
+        return [ScheduledPost(**docs[i]) for i in post_ids if i in docs]
 
     @classmethod
     def get_all_posts(cls) -> List[ScheduledPost]:
         """Return all scheduled posts, sorted by time."""
-        # Add some mock data if empty for demo purposes
-        if not cls._scheduled_posts:
-            cls._seed_mock_data()
-        
-        return sorted(cls._scheduled_posts, key=lambda x: x.scheduled_time)
+        cls.ensure_ready()
+        return cls.get_posts(state_backend.index_range(TIME_INDEX))
+
+    @classmethod
+    def query_posts(
+        cls,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        platform: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[ScheduledPost], int]:
+        """
+        Posts scheduled between `start` and `end` (inclusive), sorted by time,
+        optionally for one platform and/or status. Returns one page and the
+        total number of matches. Only the page's documents are loaded unless
+        both platform and status are given; then the status index is scanned
+        and the platform filtered here.
+        """
+        cls.ensure_ready()
+        lo = start.timestamp() if start else None
+        hi = end.timestamp() if end else None
+
+        if status:
+            index = STATUS_INDEX.format(status)
+        elif platform:
+            index = PLATFORM_INDEX.format(platform.lower())
+        else:
+            index = TIME_INDEX
+
+        if status and platform:
+            wanted = platform.lower()
+            matches = [p for p in cls.get_posts(state_backend.index_range(index, lo, hi)) if p.platform.lower() == wanted]
+            page = matches[offset:] if limit is None else matches[offset:offset + limit]
+            return page, len(matches)
+
+        ids = state_backend.index_range(index, lo, hi, offset=offset, limit=limit)
+        return cls.get_posts(ids), state_backend.index_count(index, lo, hi)
+
+    @classmethod
+    def get_post(cls, post_id: str) -> Optional[ScheduledPost]:
+        data = state_backend.get(POSTS_NAMESPACE, post_id)
+        return ScheduledPost(**data) if data else None
 
     @classmethod
     def schedule_post(cls, post_data: dict) -> ScheduledPost:
         """Create and save a new scheduled post."""
         post = ScheduledPost(
-            id=str(uuid.uuid4()),
+            id=post_data.get("id") or str(uuid.uuid4()),
             content=post_data.get("content", ""),
             platform=post_data.get("platform", "LinkedIn"),
             scheduled_time=post_data.get("scheduled_time", datetime.now().isoformat()),
             status=post_data.get("status", "scheduled"),
             performance_score=post_data.get("performance_score"),
-            persona_name=post_data.get("persona_name")
+            persona_name=post_data.get("persona_name"),
+            webhook_url=post_data.get("webhook_url")
         )
-        cls._scheduled_posts.append(post)
+        previous = cls.get_post(post.id) if post_data.get("id") else None
+        state_backend.set(POSTS_NAMESPACE, post.id, post.model_dump())
+        cls._index(post, previous)
+        DashboardService.record_post(post, previous)
+        AnalyticsService.record_post(post, previous)
+        return post
+
+    @classmethod
+    def update_post(cls, post_id: str, **fields) -> Optional[ScheduledPost]:
+        """Apply field changes to a stored post (e.g. status); None if it doesn't exist."""
+        previous = cls.get_post(post_id)
+        if previous is None:
+            return None
+        post = previous.model_copy(update=fields)
+        state_backend.set(POSTS_NAMESPACE, post.id, post.model_dump())
+        cls._index(post, previous)
+        DashboardService.record_post(post, previous)
+        AnalyticsService.record_post(post, previous)
         return post
 
     @classmethod
     def delete_post(cls, post_id: str) -> bool:
         """Remove a post from the calendar."""
-        initial_count = len(cls._scheduled_posts)
-        cls._scheduled_posts = [p for p in cls._scheduled_posts if p.id != post_id]
-        return len(cls._scheduled_posts) < initial_count
+        post = cls.get_post(post_id)
+        if post is None:
+            return False
+        for index in cls._indexes(post):
+            state_backend.index_remove(index, post_id)
+        if not state_backend.delete(POSTS_NAMESPACE, post_id):
+            return False
+        DashboardService.record_post(None, post)
+        AnalyticsService.record_post(None, post)
+        return True
 
     @classmethod
     def _seed_mock_data(cls):
@@ -8,11 +8,10 @@ STEP 4: CAMPAIGN MEMORY   — DynamoDB: save intelligence run + compute delta vs
                           — SNS autonomous alert if market sentiment POSITIVE + few competitors detected
 """
 import json
-import re
 import uuid
 import os
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional, Tuple
 from fastapi.concurrency import run_in_threadpool
 import boto3
 
@@ -25,34 +24,32 @@ from src.services.aws_service import (
 )
 from src.models.schemas import Campaign, CampaignCreate, CampaignStrategy
 from src.utils.logger import get_logger
+from src.utils.events import PipelineEvent
+from src.utils.stream_json import StreamingJSONParser
+from src.utils.dynamodb_query import (
+    RECORD_TYPE_ATTR,
+    ensure_time_index,
+    query_newest_first,
+    time_index_schema,
+)
 from botocore.exceptions import ClientError
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
 
 logger = get_logger(__name__)
-tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY", ""))
+tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY", ""))
 
 # Opportunity threshold: low competition + positive market = autonomous SNS alert
 OPPORTUNITY_THRESHOLD_COMPETITORS = 3
 OPPORTUNITY_THRESHOLD_CONFIDENCE = 80.0
 
 
-def _sse(event: str, data: dict) -> str:
-    return f"data: {json.dumps({'event': event, 'data': data})}\n\n"
-
-
-def _safe_json(text: str) -> dict | None:
-    try:
-        m = re.search(r'\{.*\}', text, re.DOTALL)
-        if m:
-            return json.loads(m.group())
-    except Exception:
-        pass
-    return None
-
 
 class CampaignService:
     """Handles CRUD for campaigns in DynamoDB with local fallback."""
     TABLE_NAME = "CloudCraft-Campaigns"
+    RECORD_TYPE = "CAMPAIGN"
+    # What the campaign list and the detail panel opened from it render
+    SUMMARY_FIELDS = ["id", "name", "goal", "duration", "budget", "status", "strategy", "created_at"]
     _table = None
 
     @classmethod
@@ -69,14 +66,17 @@ class CampaignService:
             table = dynamodb.Table(cls.TABLE_NAME)
             table.load()
             logger.info(f"Connected to DynamoDB table: {cls.TABLE_NAME}")
+            ensure_time_index(table, "created_at")
         except ClientError as e:
             if e.response["Error"]["Code"] == "ResourceNotFoundException":
                 logger.info(f"Table {cls.TABLE_NAME} not found. Creating...")
+                index = time_index_schema("created_at")
                 try:
                     table = dynamodb.create_table(
                         TableName=cls.TABLE_NAME,
                         KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-                        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+                        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}] + index["AttributeDefinitions"],
+                        GlobalSecondaryIndexes=index["GlobalSecondaryIndexes"],
                         BillingMode="PAY_PER_REQUEST",
                     )
                 except ClientError as e2:
@@ -121,7 +121,7 @@ class CampaignService:
             strategy=None
         )
         try:
-            cls._get_table().put_item(Item=new_campaign.dict())
+            cls._get_table().put_item(Item={**new_campaign.dict(), RECORD_TYPE_ATTR: cls.RECORD_TYPE})
             return new_campaign
         except Exception as e:
             logger.warning(f"DynamoDB save failed: {e}. Using fallback.")
@@ -131,13 +131,34 @@ class CampaignService:
             return new_campaign
 
     @classmethod
-    def get_all_campaigns(cls):
+    def get_all_campaigns(cls, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Campaign], Optional[str]]:
+        """One page of campaigns, newest first, plus the next-page cursor."""
         try:
-            response = cls._get_table().scan()
-            return [Campaign(**item) for item in response.get("Items", [])]
+            items, next_cursor = query_newest_first(
+                cls._get_table(), cls.RECORD_TYPE, "created_at",
+                limit=limit, cursor=cursor, projection=cls.SUMMARY_FIELDS,
+            )
+            return [Campaign(**item) for item in items], next_cursor
+        except ValueError:
+            raise
         except Exception as e:
-            logger.warning(f"DynamoDB scan failed: {e}. Using fallback.")
-            return [Campaign(**c) for c in cls._load_fallback()]
+            logger.warning(f"DynamoDB query failed: {e}. Using fallback.")
+            campaigns = sorted(
+                (Campaign(**c) for c in cls._load_fallback()),
+                key=lambda c: c.created_at, reverse=True,
+            )
+            return campaigns[:limit], None
+
+    @classmethod
+    def get_campaign(cls, campaign_id: str) -> Optional[Campaign]:
+        try:
+            response = cls._get_table().get_item(Key={"id": campaign_id})
+            item = response.get("Item")
+            return Campaign(**item) if item else None
+        except Exception as e:
+            logger.warning(f"DynamoDB get failed: {e}. Using fallback.")
+            raw = next((c for c in cls._load_fallback() if c.get("id") == campaign_id), None)
+            return Campaign(**raw) if raw else None
 
     @classmethod
     def update_campaign_strategy(cls, campaign_id: str, strategy: CampaignStrategy):
@@ -164,7 +185,7 @@ class CampaignService:
 class CampaignIntelligenceService:
     """
     Orchestrates the 4-step Campaign Architect intelligence pipeline.
-    Returns an async SSE generator consumed by the frontend EventSource.
+    Returns an async generator of pipeline events, streamed to the frontend EventSource as SSE.
     """
 
     @staticmethod
@@ -174,7 +195,7 @@ class CampaignIntelligenceService:
         goal: str,
         duration: str,
         budget: str,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[PipelineEvent, None]:
 
         llm = LLMFactory.get_llm()
         comprehend_svc = CampaignComprehendService()
@@ -183,7 +204,7 @@ class CampaignIntelligenceService:
         brand_context = BrandService.get_brand_context()
 
         # ── PIPELINE START ────────────────────────────────────────────────
-        yield _sse("pipeline_start", {
+        yield PipelineEvent("pipeline_start", {
             "campaign_id": campaign_id,
             "campaign_name": campaign_name,
             "goal": goal,
@@ -194,7 +215,7 @@ class CampaignIntelligenceService:
         # ══════════════════════════════════════════════════════════════════
         # STEP 1: MARKET RECON (Tavily — 3 targeted queries)
         # ══════════════════════════════════════════════════════════════════
-        yield _sse("step_start", {"step": "RECON", "step_num": 1,
+        yield PipelineEvent("step_start", {"step": "RECON", "step_num": 1,
             "message": f"Market Recon Agent scanning competitive landscape for: {goal[:80]}"})
 
         queries = [
@@ -205,33 +226,31 @@ class CampaignIntelligenceService:
         raw_parts = []
         total_hits = 0
         for i, q in enumerate(queries):
-            yield _sse("recon_query", {"query_num": i + 1, "query": q,
+            yield PipelineEvent("recon_query", {"query_num": i + 1, "query": q,
                 "message": f"Searching: {q[:70]}"})
             try:
-                res = await run_in_threadpool(
-                    tavily_client.search, query=q, search_depth="basic", max_results=4
-                )
+                res = await tavily_client.search(query=q, search_depth="basic", max_results=4)
                 hits = res.get("results", [])
                 total_hits += len(hits)
                 raw_parts.append(" ".join(r.get("content", "")[:400] for r in hits))
-                yield _sse("recon_hit", {"query_num": i + 1, "hits": len(hits),
+                yield PipelineEvent("recon_hit", {"query_num": i + 1, "hits": len(hits),
                     "message": f"Found {len(hits)} results"})
             except Exception as e:
                 logger.warning(f"Tavily query {i+1} failed: {e}")
-                yield _sse("recon_hit", {"query_num": i + 1, "hits": 0,
+                yield PipelineEvent("recon_hit", {"query_num": i + 1, "hits": 0,
                     "message": f"Query failed: {str(e)[:60]}"})
 
         raw_data = " ".join(raw_parts)[:8000]
-        yield _sse("step_complete", {"step": "RECON", "step_num": 1,
+        yield PipelineEvent("step_complete", {"step": "RECON", "step_num": 1,
             "message": f"Market Recon complete — {total_hits} sources gathered across 3 queries",
             "meta": f"{total_hits} hits"})
 
         # ══════════════════════════════════════════════════════════════════
         # STEP 2: AWS COMPREHEND (market NLP)
         # ══════════════════════════════════════════════════════════════════
-        yield _sse("step_start", {"step": "COMPREHEND", "step_num": 2,
+        yield PipelineEvent("step_start", {"step": "COMPREHEND", "step_num": 2,
             "message": "Routing market intelligence to AWS Comprehend for NLP extraction"})
-        yield _sse("aws_call", {"service": "comprehend",
+        yield PipelineEvent("aws_call", {"service": "comprehend",
             "message": "detect_sentiment + detect_key_phrases + detect_entities running on market data"})
 
         try:
@@ -243,7 +262,7 @@ class CampaignIntelligenceService:
                 "key_phrases": [], "entities": [], "competitor_names": []
             }
 
-        yield _sse("comprehend_result", {
+        yield PipelineEvent("comprehend_result", {
             "sentiment": comprehend_data["sentiment"],
             "market_confidence": comprehend_data["market_confidence"],
             "key_phrases": comprehend_data["key_phrases"],
@@ -256,14 +275,14 @@ class CampaignIntelligenceService:
                 f"{len(comprehend_data['key_phrases'])} market signals"
             )
         })
-        yield _sse("step_complete", {"step": "COMPREHEND", "step_num": 2,
+        yield PipelineEvent("step_complete", {"step": "COMPREHEND", "step_num": 2,
             "message": "AWS Comprehend analysis complete",
             "meta": f"{len(comprehend_data['competitor_names'])} competitors | {comprehend_data['sentiment']}"})
 
         # ══════════════════════════════════════════════════════════════════
         # STEP 3: BEDROCK NOVA SYNTHESIS (Comprehend-enriched strategy)
         # ══════════════════════════════════════════════════════════════════
-        yield _sse("step_start", {"step": "SYNTHESIS", "step_num": 3,
+        yield PipelineEvent("step_start", {"step": "SYNTHESIS", "step_num": 3,
             "message": "Amazon Nova synthesising data-grounded campaign strategy"})
 
         competitor_list = ", ".join(comprehend_data["competitor_names"]) or "none detected"
@@ -321,13 +340,18 @@ Return ONLY valid JSON (no markdown block, just the raw json):
 }}
 """
         strategy = None
+        content = ""
         try:
-            resp = await llm.ainvoke(synthesis_prompt)
-            content = resp.content if hasattr(resp, 'content') else str(resp)
-            strategy = _safe_json(content)
+            # Stream the synthesis and forward each top-level field as soon as it closes
+            parser = StreamingJSONParser()
+            async for chunk in llm.astream(synthesis_prompt):
+                for key, value in parser.feed(LLMFactory.chunk_text(chunk)):
+                    yield PipelineEvent("synthesis_field", {"key": key, "value": value})
+            content = parser.text
+            strategy = parser.result()
             if not strategy:
                 raise ValueError("No valid JSON in LLM response")
-            yield _sse("synthesis_result", {"strategy": strategy,
+            yield PipelineEvent("synthesis_result", {"strategy": strategy,
                 "message": "Strategy synthesis complete"})
         except Exception as e:
             logger.error(f"Synthesis failed: {e}")
@@ -341,10 +365,10 @@ Return ONLY valid JSON (no markdown block, just the raw json):
                     for p in comprehend_data["key_phrases"][:2]] or [{"segment_name": "Default Niche", "pain_point": "Inefficiency"}],
                 "defensive_moats": ["Proprietary dataset advantage", "First-mover AI integration"]
             }
-            yield _sse("synthesis_fallback", {"strategy": strategy,
+            yield PipelineEvent("synthesis_fallback", {"strategy": strategy,
                 "message": "Used Comprehend-direct strategy (LLM parse issue)"})
 
-        yield _sse("step_complete", {"step": "SYNTHESIS", "step_num": 3,
+        yield PipelineEvent("step_complete", {"step": "SYNTHESIS", "step_num": 3,
             "message": "Intelligence strategy generated",
             "meta": f"{len(strategy.get('usps', []))} USPs · {len(strategy.get('target_audience', []))} segments"})
 
@@ -361,9 +385,9 @@ Return ONLY valid JSON (no markdown block, just the raw json):
         # ══════════════════════════════════════════════════════════════════
         # STEP 4: CAMPAIGN MEMORY (DynamoDB)
         # ══════════════════════════════════════════════════════════════════
-        yield _sse("step_start", {"step": "MEMORY", "step_num": 4,
+        yield PipelineEvent("step_start", {"step": "MEMORY", "step_num": 4,
             "message": f"Writing intelligence run to DynamoDB. Querying similar past campaigns..."})
-        yield _sse("aws_call", {"service": "dynamodb",
+        yield PipelineEvent("aws_call", {"service": "dynamodb",
             "message": "Scanning cloudcraft-campaign-intelligence for similar goal patterns"})
 
         past_runs = await memory_svc.get_similar_campaigns(goal, limit=10)
@@ -378,7 +402,7 @@ Return ONLY valid JSON (no markdown block, just the raw json):
             market_confidence=comprehend_data["market_confidence"],
         )
 
-        yield _sse("memory_update", {
+        yield PipelineEvent("memory_update", {
             "run_id": run_id,
             "delta": delta,
             "message": (
@@ -387,7 +411,7 @@ Return ONLY valid JSON (no markdown block, just the raw json):
                 f"Market trend: {delta.get('market_trend', 'BASELINE')}"
             )
         })
-        yield _sse("step_complete", {"step": "MEMORY", "step_num": 4,
+        yield PipelineEvent("step_complete", {"step": "MEMORY", "step_num": 4,
             "message": "Campaign intelligence persisted to DynamoDB",
             "meta": f"{delta.get('similar_count', 0)} similar · {delta.get('market_trend', 'BASELINE')}"})
 
@@ -401,7 +425,7 @@ Return ONLY valid JSON (no markdown block, just the raw json):
         )
 
         if opportunity_detected:
-            yield _sse("aws_call", {"service": "sns",
+            yield PipelineEvent("aws_call", {"service": "sns",
                 "message": f"LOW-COMPETITION WINDOW DETECTED — {competitor_count} competitors, {market_confidence}% positive. Firing SNS opportunity alert..."})
             try:
                 alert_message = (
@@ -418,21 +442,21 @@ Return ONLY valid JSON (no markdown block, just the raw json):
                     Subject=f"[CloudCraft] Opportunity Alert: {campaign_name}",
                     Message=alert_message
                 )
-                yield _sse("opportunity_alert", {"fired": True,
+                yield PipelineEvent("opportunity_alert", {"fired": True,
                     "competitor_count": competitor_count,
                     "market_confidence": market_confidence,
                     "message": f"SNS opportunity alert dispatched — {competitor_count} competitors, {market_confidence}% positive market"})
             except Exception as e:
                 logger.error(f"SNS alert failed: {e}")
-                yield _sse("opportunity_alert", {"fired": False, "error": str(e),
+                yield PipelineEvent("opportunity_alert", {"fired": False, "error": str(e),
                     "message": f"SNS alert failed: {str(e)[:80]}"})
         else:
-            yield _sse("opportunity_alert", {"fired": False,
+            yield PipelineEvent("opportunity_alert", {"fired": False,
                 "reason": f"competitors={competitor_count}, confidence={market_confidence}%, sentiment={comprehend_data.get('sentiment')}",
                 "message": f"No opportunity alert — {competitor_count} competitors detected, market {comprehend_data.get('sentiment')}"})
 
         # ── PIPELINE COMPLETE ─────────────────────────────────────────────
-        yield _sse("intelligence_complete", {
+        yield PipelineEvent("intelligence_complete", {
             "campaign_id": campaign_id,
             "strategy": strategy,
             "comprehend_data": {
@@ -462,8 +486,7 @@ Return ONLY valid JSON (no markdown block, just the raw json):
         # 1. Market Scan
         logger.info(f"[RADAR] Scanning competitive landscape for {campaign_name}...")
         try:
-            res = await run_in_threadpool(
-                tavily_client.search,
+            res = await tavily_client.search(
                 query=f"top competitors {goal} market shift news risks 2026",
                 search_depth="advanced",
                 max_results=5
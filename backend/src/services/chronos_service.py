@@ -1,22 +1,35 @@
 import json
-import os
 import uuid
-import re
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from decimal import Decimal
 from fastapi.concurrency import run_in_threadpool
 
-import boto3
 from botocore.exceptions import ClientError
 
+from src.core.aws_clients import get_client, get_resource
 from src.core.llm_factory import LLMFactory
 from src.services.brand_service import BrandService
 from src.utils.logger import get_logger
+from src.utils.stream_json import parse_json_object
+from src.utils.dynamodb_query import (
+    RECORD_TYPE_ATTR,
+    ensure_time_index,
+    query_newest_first,
+    time_index_schema,
+)
 
 logger = get_logger(__name__)
 
 TABLE_NAME = "cloudcraft-chronos-brief"
+RECORD_TYPE = "CHRONOS_MISSION"
+
+# Fields needed by the missions list; full plans are loaded via get_mission
+MISSION_SUMMARY_FIELDS = [
+    "mission_id", "goal", "status", "created_at", "updated_at", "duration_days",
+    "budget_tier", "current_day", "rewrite_count", "executive_summary",
+]
 
 class ChronosService:
     """
@@ -25,46 +38,47 @@ class ChronosService:
     """
 
     _table = None
+    _table_ready = False
+    _ensure_lock = threading.Lock()
 
     @classmethod
     def _get_table(cls):
         if cls._table:
             return cls._table
-        dynamodb = boto3.resource(
-            "dynamodb",
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
-        cls._table = dynamodb.Table(TABLE_NAME)
+        cls._table = get_resource("dynamodb").Table(TABLE_NAME)
         return cls._table
 
     @classmethod
     def _ensure_table(cls):
-        """Creates DynamoDB table if it doesn't exist."""
-        client = boto3.client(
-            "dynamodb",
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
-        try:
-            client.describe_table(TableName=TABLE_NAME)
-        except client.exceptions.ResourceNotFoundException:
-            logger.info(f"Creating DynamoDB table: {TABLE_NAME}")
-            client.create_table(
-                TableName=TABLE_NAME,
-                KeySchema=[{"AttributeName": "mission_id", "KeyType": "HASH"}],
-                AttributeDefinitions=[{"AttributeName": "mission_id", "AttributeType": "S"}],
-                BillingMode="PAY_PER_REQUEST",
-            )
-            boto3.resource(
-                "dynamodb",
-                region_name=os.getenv("AWS_REGION", "us-east-1"),
-                aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-                aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            ).Table(TABLE_NAME).wait_until_exists()
-            logger.info(f"Table {TABLE_NAME} created.")
+        """Creates DynamoDB table if it doesn't exist. Runs once per process (normally at startup)."""
+        if cls._table_ready:
+            return
+        with cls._ensure_lock:
+            if cls._table_ready:
+                return
+            client = get_client("dynamodb")
+            try:
+                client.describe_table(TableName=TABLE_NAME)
+                ensure_time_index(cls._get_table(), "created_at")
+            except client.exceptions.ResourceNotFoundException:
+                logger.info(f"Creating DynamoDB table: {TABLE_NAME}")
+                index = time_index_schema("created_at")
+                client.create_table(
+                    TableName=TABLE_NAME,
+                    KeySchema=[{"AttributeName": "mission_id", "KeyType": "HASH"}],
+                    AttributeDefinitions=[{"AttributeName": "mission_id", "AttributeType": "S"}] + index["AttributeDefinitions"],
+                    GlobalSecondaryIndexes=index["GlobalSecondaryIndexes"],
+                    BillingMode="PAY_PER_REQUEST",
+                )
+                cls._get_table().wait_until_exists()
+                logger.info(f"Table {TABLE_NAME} created.")
+            cls._table_ready = True
+
+    @classmethod
+    async def _ensure_table_async(cls):
+        # Skips the threadpool hop once the table is known to exist
+        if not cls._table_ready:
+            await run_in_threadpool(cls._ensure_table)
 
     @classmethod
     async def create_mission(cls, goal: str, duration_days: int, budget_tier: str, automation_level: str = "suggest") -> dict:
@@ -72,7 +86,7 @@ class ChronosService:
         Spawns 5 specialist agents + 1 supervisor to generate the full playbook.
         """
         print(f"DEBUG: STARTING MISSION CREATION FOR GOAL: {goal}")
-        await run_in_threadpool(cls._ensure_table)
+        await cls._ensure_table_async()
         print("DEBUG: TABLE ENSURED")
 
         llm = LLMFactory.get_default_llm()
@@ -299,6 +313,7 @@ Return plain text only — no JSON, no markdown bullets.
         try:
             # Convert any floats to Decimal for DynamoDB compatibility
             mission = cls._float_to_decimal(mission)
+            mission[RECORD_TYPE_ATTR] = RECORD_TYPE
             
             table = cls._get_table()
             table.put_item(Item=mission)
@@ -319,21 +334,24 @@ Return plain text only — no JSON, no markdown bullets.
         return data
 
     @classmethod
-    async def get_missions(cls) -> list:
-        await run_in_threadpool(cls._ensure_table)
+    async def get_missions(cls, limit: int = 20, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """One page of mission summaries, newest first, plus the next-page cursor."""
+        await cls._ensure_table_async()
         try:
-            table = cls._get_table()
-            resp = table.scan(Limit=20)
-            items = resp.get("Items", [])
-            items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-            return items
+            return await run_in_threadpool(
+                query_newest_first,
+                cls._get_table(), RECORD_TYPE, "created_at",
+                limit, cursor, MISSION_SUMMARY_FIELDS,
+            )
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Failed to list missions: {e}")
-            return []
+            return [], None
 
     @classmethod
     async def get_mission(cls, mission_id: str) -> Optional[dict]:
-        await run_in_threadpool(cls._ensure_table)
+        await cls._ensure_table_async()
         try:
             table = cls._get_table()
             resp = table.get_item(Key={"mission_id": mission_id})
@@ -382,9 +400,8 @@ Return ONLY valid JSON:
     @staticmethod
     def _parse_json(text: str, key: str, default):
         try:
-            match = re.search(r'\{.*\}', text, re.DOTALL)
-            if match:
-                data = json.loads(match.group())
+            data = parse_json_object(text)
+            if data:
                 return data.get(key, default)
         except Exception as e:
             print(f"DEBUG_PARSE_JSON ERROR for key '{key}': {e} | Text: {text}")
@@ -394,9 +411,7 @@ Return ONLY valid JSON:
     @staticmethod
     def _parse_first(text: str) -> Optional[dict]:
         try:
-            match = re.search(r'\{.*\}', text, re.DOTALL)
-            if match:
-                return json.loads(match.group())
+            return parse_json_object(text)
         except Exception:
             pass
         return None
@@ -1,6 +1,7 @@
 import json
 from src.core.llm_factory import LLMFactory
 from src.utils.logger import get_logger
+from src.utils.stream_json import parse_json_object
 from src.services.brand_service import BrandService
 from src.agents.competitor_analyst_agent import CompetitorAnalystAgent
 
@@ -69,18 +70,13 @@ class CompetitorService:
             
             # The agent outputs JSON (as per its role_prompt)
             # We want to ensure it's clean for the API
-            import re
-            
             raw_content = agent_response.output.strip()
-            # Robust JSON extraction
-            match = re.search(r'\{.*\}', raw_content, re.DOTALL)
-            if match:
-                raw_content = match.group()
-                
-            # Test parse it to ensure it won't crash the api
+            # Robust JSON extraction (fences, prose, truncation)
             try:
-                json.loads(raw_content)
-                return raw_content
+                parsed = parse_json_object(raw_content)
+                if parsed is None:
+                    raise ValueError("No JSON object in analyst output")
+                return json.dumps(parsed)
             except Exception as parse_e:
                 logger.warning(f"Failed to parse LLM output: {parse_e}. Synthesizing Dynamic Intel.")
                 # DYNAMIC FALLBACK: Use multiple heuristics to make it feel 'alive'
@@ -0,0 +1,213 @@
+"""
+Mission Control aggregates, maintained on write instead of recomputed per request.
+
+Calendar and Oracle writes report their deltas here: mission counts by
+status, running score sums / counts, language coverage (each post is
+classified once when its content is written) and a ring buffer of recently
+touched missions. The counters live in the shared state backend and are
+updated with atomic `incr`, so every worker sees the same totals.
+`get_stats()` reads one small namespace plus a handful of posts and caches
+the response for DASHBOARD_CACHE_SECONDS, so its cost no longer depends on
+how many posts or predictions exist.
+
+Stores written before these counters existed are aggregated once per
+backend on first use. Each post's counted contribution is kept in
+COUNTED_NAMESPACE, so a post written while that aggregation runs is
+counted once whichever side reaches it first.
+"""
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from src.core.state_backend import state_backend
+from src.models.schemas import ScheduledPost
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATS_NAMESPACE = "dashboard_stats"
+META_NAMESPACE = "dashboard_meta"
+ACTIVITY_NAMESPACE = "dashboard_activity"
+# post id -> what the counters currently hold for it
+COUNTED_NAMESPACE = "dashboard_counted"
+
+CACHE_SECONDS = float(os.getenv("DASHBOARD_CACHE_SECONDS", "5"))
+# Ring buffer slots; more than the feed shows so repeated updates to one post don't empty it
+ACTIVITY_SLOTS = 20
+FEED_SIZE = 5
+# Oracle predictions counted when aggregating an existing history
+ORACLE_BOOTSTRAP_LIMIT = 20
+# Score used before anything has been scored
+DEFAULT_SCORE = 82.0
+
+LANGUAGES = ["English", "Hinglish", "Hindi", "Regional"]
+_DEVANAGARI = re.compile("[\u0900-\u097f]")
+# Bengali/Assamese, Gurmukhi, Gujarati, Odia, Tamil, Telugu, Kannada, Malayalam
+_OTHER_INDIC = re.compile("[\u0980-\u0d7f]")
+_HINGLISH = re.compile(r"\b(?:yaar|kya|hai|accha|namaste|chalo)\b", re.IGNORECASE)
+
+
+class DashboardService:
+    _cached: Optional[Dict[str, Any]] = None
+    _cached_at = 0.0
+
+    @staticmethod
+    def classify_language(content: str) -> str:
+        if _DEVANAGARI.search(content):
+            return "Hindi"
+        if _OTHER_INDIC.search(content):
+            return "Regional"
+        if _HINGLISH.search(content):
+            return "Hinglish"
+        return "English"
+
+    # --- Write path ---
+
+    @classmethod
+    def _aggregated(cls, source: str) -> bool:
+        # Until the Oracle history is aggregated, predictions are picked up by the aggregation itself
+        return state_backend.get(META_NAMESPACE, source) is not None
+
+    @classmethod
+    def _contribution(cls, post: ScheduledPost, language: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "status": post.status,
+            "lang": language or cls.classify_language(post.content),
+            "score": post.performance_score or 0,
+        }
+
+    @staticmethod
+    def _count(counted: Dict[str, Any], sign: int):
+        state_backend.incr(STATS_NAMESPACE, "posts", sign)
+        state_backend.incr(STATS_NAMESPACE, f"status:{counted['status']}", sign)
+        state_backend.incr(STATS_NAMESPACE, f"lang:{counted['lang']}", sign)
+        if counted["score"]:
+            state_backend.incr(STATS_NAMESPACE, "post_score_sum", sign * counted["score"])
+            state_backend.incr(STATS_NAMESPACE, "post_score_count", sign)
+
+    @classmethod
+    def _push_activity(cls, post_id: str):
+        seq = state_backend.incr(META_NAMESPACE, "activity_seq")
+        state_backend.set(ACTIVITY_NAMESPACE, str(seq % ACTIVITY_SLOTS), {"seq": seq, "id": post_id})
+
+    @classmethod
+    def record_post(cls, post: Optional[ScheduledPost], previous: Optional[ScheduledPost] = None):
+        """
+        Applies a calendar write: `post` is the stored version (None when
+        deleted), `previous` the version it replaced (None when new).
+        """
+        post_id = (post or previous).id
+        # Whatever is counted for the post, whether by an earlier write or the aggregation
+        counted = state_backend.get(COUNTED_NAMESPACE, post_id)
+        if counted is not None:
+            cls._count(counted, -1)
+        if post is not None:
+            # Only re-classify when the text changed
+            same_text = counted is not None and previous is not None and previous.content == post.content
+            counted = cls._contribution(post, counted["lang"] if same_text else None)
+            cls._count(counted, 1)
+            state_backend.set(COUNTED_NAMESPACE, post_id, counted)
+            cls._push_activity(post.id)
+        elif counted is not None:
+            state_backend.delete(COUNTED_NAMESPACE, post_id)
+        cls._cached = None
+
+    @classmethod
+    def record_prediction(cls, viral_score: int):
+        if cls._aggregated("oracle"):
+            state_backend.incr(STATS_NAMESPACE, "oracle_score_sum", viral_score)
+            state_backend.incr(STATS_NAMESPACE, "oracle_count", 1)
+        cls._cached = None
+
+    # --- One-off aggregation of existing data ---
+
+    @classmethod
+    def _ensure_aggregated(cls):
+        from src.services.calendar_service import CalendarService
+
+        # Seeds the demo calendar before it is counted
+        CalendarService.ensure_ready()
+        if state_backend.add(META_NAMESPACE, "posts", True):
+            posts = CalendarService.get_all_posts()
+            for post in posts:
+                # Posts written since the snapshot are already counted by record_post
+                counted = cls._contribution(post)
+                if state_backend.add(COUNTED_NAMESPACE, post.id, counted):
+                    cls._count(counted, 1)
+            for post in posts[-ACTIVITY_SLOTS:]:
+                cls._push_activity(post.id)
+            logger.info(f"Dashboard aggregated {len(posts)} calendar posts")
+
+        if state_backend.get(META_NAMESPACE, "oracle") is None:
+            from src.services.oracle_service import OracleService
+
+            history, _ = OracleService.get_history(ORACLE_BOOTSTRAP_LIMIT)
+            if state_backend.add(META_NAMESPACE, "oracle", True):
+                for item in history:
+                    state_backend.incr(STATS_NAMESPACE, "oracle_score_sum", item.viral_score)
+                    state_backend.incr(STATS_NAMESPACE, "oracle_count", 1)
+
+    # --- Read path ---
+
+    @classmethod
+    def _recent_activity(cls) -> List[Dict[str, Any]]:
+        from src.services.calendar_service import CalendarService
+
+        entries = sorted(state_backend.items(ACTIVITY_NAMESPACE).values(), key=lambda e: e["seq"], reverse=True)
+        post_ids: List[str] = []
+        for entry in entries:
+            if entry["id"] not in post_ids:
+                post_ids.append(entry["id"])
+        feed = []
+        # Deleted posts drop out of the feed
+        for p in CalendarService.get_posts(post_ids):
+            feed.append({
+                "id": p.id,
+                "type": "mission",
+                "content": p.content[:60] + "...",
+                "platform": p.platform,
+                "status": p.status,
+                "time": p.scheduled_time
+            })
+            if len(feed) == FEED_SIZE:
+                break
+        return feed
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Mission Control metrics, served from the response cache when fresh."""
+        if cls._cached is not None and time.monotonic() - cls._cached_at < CACHE_SECONDS:
+            return cls._cached
+
+        cls._ensure_aggregated()
+        counters = state_backend.items(STATS_NAMESPACE)
+        total_posts = int(counters.get("posts", 0))
+        oracle_count = int(counters.get("oracle_count", 0))
+
+        score_sum = counters.get("post_score_sum", 0) + counters.get("oracle_score_sum", 0)
+        score_count = counters.get("post_score_count", 0) + oracle_count
+        avg_score = round(score_sum / score_count, 1) if score_count else DEFAULT_SCORE
+
+        lang_counts = {lang: int(counters.get(f"lang:{lang}", 0)) for lang in LANGUAGES}
+        # Add base distribution if counts are low
+        if total_posts < 5:
+            lang_counts["English"] += 12
+            lang_counts["Hinglish"] += 8
+            lang_counts["Hindi"] += 5
+            lang_counts["Regional"] += 3
+
+        stats = {
+            "metrics": {
+                "active_missions": int(counters.get("status:scheduled", 0)),
+                "completed_missions": int(counters.get("status:dispatched", 0)),
+                "avg_oracle_score": avg_score,
+                "total_assets": total_posts + oracle_count
+            },
+            "cultural_coverage": [{"name": k, "value": v} for k, v in lang_counts.items() if v > 0],
+            "recent_activity": cls._recent_activity(),
+            "efficiency_gain": f"{min(200 + (total_posts * 45), 850)}%"
+        }
+        cls._cached = stats
+        cls._cached_at = time.monotonic()
+        return stats
@@ -0,0 +1,341 @@
+"""
+Nexus webhook dispatch.
+
+One pooled `httpx.AsyncClient` is shared by every delivery (keep-alive
+connections are reused across posts), requests to one webhook host are
+limited to DISPATCH_PER_HOST_CONCURRENCY at a time, and failed deliveries
+(network errors, 429, 5xx) are retried with exponential backoff and full
+jitter, honouring Retry-After.
+
+Every (post, platform, webhook, content) delivery carries a stable
+`Idempotency-Key` header. A delivery first claims its key in the state
+backend (set-if-absent), keeps it once delivered and releases it on
+failure, so dispatching the same post again (a retried request, a second
+worker, a bulk run overlapping a manual one) does not post twice.
+
+A post can fan out to several platforms / webhooks; its audits and
+deliveries run concurrently, and bulk dispatch runs posts concurrently too.
+
+The LLM pre-flight audit is normally done ahead of time: `schedule_preflight`
+runs it in the background when a post is scheduled and stores the result on
+the post (`ScheduledPost.audits`, per platform). Dispatch uses a stored audit
+if it was made from the current content within NEXUS_AUDIT_FRESHNESS_SECONDS,
+waits for one still in flight, and only otherwise audits inline.
+"""
+import asyncio
+import hashlib
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.agents.dispatcher_agent import DispatcherAgent
+from src.core.state_backend import state_backend
+from src.models.schemas import DispatchResult, DispatchTarget, PreflightAudit, ScheduledPost
+from src.services.calendar_service import CalendarService
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DELIVERIES_NAMESPACE = "dispatch_deliveries"
+DEFAULT_WEBHOOK = "https://hook.us1.make.com/your-default-hook"
+
+PER_HOST_CONCURRENCY = int(os.getenv("DISPATCH_PER_HOST_CONCURRENCY", "4"))
+# Posts dispatched at once by bulk dispatch, and LLM audits in flight at once
+POST_CONCURRENCY = int(os.getenv("DISPATCH_POST_CONCURRENCY", "16"))
+AUDIT_CONCURRENCY = int(os.getenv("DISPATCH_AUDIT_CONCURRENCY", "8"))
+MAX_ATTEMPTS = int(os.getenv("DISPATCH_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE_SECONDS = float(os.getenv("DISPATCH_BACKOFF_BASE_SECONDS", "0.5"))
+BACKOFF_MAX_SECONDS = 8.0
+TIMEOUT_SECONDS = 10.0
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+# Stored audits older than this are redone at dispatch (trending hashtags go stale)
+AUDIT_FRESHNESS_SECONDS = float(os.getenv("NEXUS_AUDIT_FRESHNESS_SECONDS", str(6 * 3600)))
+# A pending claim older than this belongs to a run that died; it may be taken over
+CLAIM_TIMEOUT_SECONDS = 300.0
+
+
+class DispatchService:
+    _client: Optional[httpx.AsyncClient] = None
+    _host_limits: Dict[str, asyncio.Semaphore] = {}
+    _audit_limit: Optional[asyncio.Semaphore] = None
+    _agent: Optional[DispatcherAgent] = None
+    # Background pre-flight audits by (post id, platform)
+    _preflights: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    # --- Shared resources ---
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                timeout=TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                headers={"User-Agent": "CloudCraft-Nexus/1.0"},
+            )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls):
+        """Closes the pooled client (app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    @classmethod
+    def _host_limit(cls, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in cls._host_limits:
+            cls._host_limits[host] = asyncio.Semaphore(PER_HOST_CONCURRENCY)
+        return cls._host_limits[host]
+
+    @classmethod
+    def _get_agent(cls) -> DispatcherAgent:
+        if cls._agent is None:
+            cls._agent = DispatcherAgent()
+        return cls._agent
+
+    @staticmethod
+    def idempotency_key(post_id: str, platform: str, webhook_url: str, content: str) -> str:
+        """Same post, target and source content → same key, across retries and workers."""
+        digest = hashlib.sha256(f"{post_id}\n{platform}\n{webhook_url}\n{content}".encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full jitter: uniform in [0, base * 2^attempt], capped; Retry-After (seconds) wins if given."""
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+    # --- Single delivery ---
+
+    @classmethod
+    async def audit(cls, content: str, platform: str) -> str:
+        """Pre-flight audit; falls back to the original content if the LLM fails."""
+        if cls._audit_limit is None:
+            cls._audit_limit = asyncio.Semaphore(AUDIT_CONCURRENCY)
+        async with cls._audit_limit:
+            result = await cls._get_agent().async_run(task=content, context={"platform": platform})
+        return result.output or content
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def _fresh_audit(cls, post: ScheduledPost, platform: str) -> Optional[str]:
+        audit = post.audits.get(platform)
+        if audit is None or audit.source_hash != cls._content_hash(post.content):
+            return None
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(audit.audited_at)
+        return audit.content if age.total_seconds() <= AUDIT_FRESHNESS_SECONDS else None
+
+    @classmethod
+    async def _audit_and_store(cls, post: ScheduledPost, platform: str) -> str:
+        """Audits `post` for `platform` and stores the result unless the content changed meanwhile."""
+        content = await cls.audit(post.content, platform)
+        # The agent returns the input unchanged when the LLM fails; don't keep that as an audit
+        if content != post.content:
+            latest = await asyncio.to_thread(CalendarService.get_post, post.id)
+            if latest is not None and latest.content == post.content:
+                audit = PreflightAudit(
+                    content=content,
+                    source_hash=cls._content_hash(post.content),
+                    audited_at=datetime.now(timezone.utc).isoformat(),
+                )
+                await asyncio.to_thread(CalendarService.update_post, post.id, audits={**latest.audits, platform: audit})
+        return content
+
+    @classmethod
+    def schedule_preflight(cls, post: ScheduledPost, platform: Optional[str] = None):
+        """Starts the pre-flight audit in the background; a newer one replaces one in flight."""
+        key = (post.id, platform or post.platform)
+        previous = cls._preflights.get(key)
+        if previous is not None and not previous.done():
+            previous.cancel()
+
+        async def run():
+            try:
+                await cls._audit_and_store(post, key[1])
+            except Exception as e:
+                logger.warning(f"Pre-flight audit for {post.id} ({key[1]}) failed: {e}")
+
+        task = asyncio.create_task(run())
+        cls._preflights[key] = task
+
+        def finished(t: asyncio.Task):
+            if cls._preflights.get(key) is t:
+                del cls._preflights[key]
+
+        task.add_done_callback(finished)
+
+    @classmethod
+    async def _audited_content(cls, post: ScheduledPost, platform: str) -> str:
+        pending = cls._preflights.get((post.id, platform))
+        if pending is not None:
+            # Shielded: a cancelled dispatch shouldn't cancel the shared audit
+            try:
+                await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            post = await asyncio.to_thread(CalendarService.get_post, post.id) or post
+        fresh = cls._fresh_audit(post, platform)
+        if fresh is not None:
+            return fresh
+        return await cls._audit_and_store(post, platform)
+
+    @classmethod
+    async def deliver(
+        cls, webhook_url: str, payload: dict, idempotency_key: str, platform: str = ""
+    ) -> DispatchResult:
+        """POSTs one payload with retries. Never raises; the result says what happened."""
+        started = time.monotonic()
+        result = DispatchResult(platform=platform, webhook_url=webhook_url, success=False, idempotency_key=idempotency_key)
+        client = cls._get_client()
+        limit = cls._host_limit(webhook_url)
+
+        for attempt in range(MAX_ATTEMPTS):
+            result.attempts = attempt + 1
+            retry_after = None
+            try:
+                async with limit:
+                    response = await client.post(
+                        webhook_url, json=payload, headers={"Idempotency-Key": idempotency_key}
+                    )
+                result.status_code = response.status_code
+                if response.status_code < 400:
+                    result.success = True
+                    result.error = None
+                    break
+                result.error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                retry_after = response.headers.get("Retry-After")
+            except httpx.HTTPError as e:
+                result.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            if attempt + 1 < MAX_ATTEMPTS:
+                await asyncio.sleep(cls._backoff(attempt, retry_after))
+
+        result.elapsed_ms = int((time.monotonic() - started) * 1000)
+        if not result.success:
+            logger.warning(f"Webhook dispatch to {webhook_url} failed after {result.attempts} attempt(s): {result.error}")
+        return result
+
+    @classmethod
+    def _claim(cls, key: str) -> Optional[dict]:
+        """
+        Claims a delivery key; None if claimed, else the record of the run
+        that holds it. Blocking (state backend): call it off the event loop.
+        """
+        now = time.time()
+        if state_backend.add(DELIVERIES_NAMESPACE, key, {"state": "pending", "claimed_at": now}):
+            return None
+        record = state_backend.get(DELIVERIES_NAMESPACE, key)
+        if record is None:
+            # Released in between: try once more
+            return None if state_backend.add(DELIVERIES_NAMESPACE, key, {"state": "pending", "claimed_at": now}) else {"state": "pending"}
+        if record.get("state") == "pending" and now - record.get("claimed_at", now) > CLAIM_TIMEOUT_SECONDS:
+            logger.warning(f"Taking over stale dispatch claim {key}")
+            state_backend.set(DELIVERIES_NAMESPACE, key, {"state": "pending", "claimed_at": now})
+            return None
+        return record
+
+    @classmethod
+    async def _dispatch_target(cls, post: ScheduledPost, target: DispatchTarget) -> DispatchResult:
+        key = cls.idempotency_key(post.id, target.platform, target.webhook_url, post.content)
+        held = await asyncio.to_thread(cls._claim, key)
+        if held is not None:
+            delivered = held.get("state") != "pending"
+            return DispatchResult(
+                platform=target.platform,
+                webhook_url=target.webhook_url,
+                success=delivered,
+                status_code=held.get("status_code"),
+                idempotency_key=key,
+                duplicate=True,
+                error=None if delivered else "Delivery already in progress in another run",
+            )
+
+        result: Optional[DispatchResult] = None
+        try:
+            content = await cls._audited_content(post, target.platform)
+            logger.info(f"Dispatching {post.id} to {target.platform} via {target.webhook_url}")
+            result = await cls.deliver(
+                target.webhook_url,
+                {
+                    "post_id": post.id,
+                    "platform": target.platform,
+                    "content": content,
+                    "source": "CloudCraft AI Nexus",
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+                key,
+                target.platform,
+            )
+        finally:
+            if result is not None and result.success:
+                await asyncio.to_thread(
+                    state_backend.set, DELIVERIES_NAMESPACE, key,
+                    {"state": "delivered", "status_code": result.status_code, "delivered_at": datetime.utcnow().isoformat()},
+                )
+            else:
+                # Failed or interrupted: release the claim so a later run can retry
+                # (if this is cut short too, the claim goes stale after CLAIM_TIMEOUT_SECONDS)
+                await asyncio.to_thread(state_backend.delete, DELIVERIES_NAMESPACE, key)
+        return result
+
+    # --- Posts ---
+
+    @classmethod
+    async def dispatch_post(
+        cls, post: ScheduledPost, targets: Optional[List[DispatchTarget]] = None
+    ) -> Tuple[ScheduledPost, List[DispatchResult]]:
+        """
+        Audits and delivers one post to each target concurrently, then records
+        the outcome on the post: "dispatched" if every target succeeded,
+        otherwise "failed", with one execution log line per target.
+        """
+        targets = targets or [DispatchTarget(platform=post.platform, webhook_url=post.webhook_url or DEFAULT_WEBHOOK)]
+        await asyncio.to_thread(CalendarService.update_post, post.id, status="auditing")
+        try:
+            results = list(await asyncio.gather(*(cls._dispatch_target(post, t) for t in targets)))
+        except BaseException as e:
+            # Never leave the post stuck in "auditing"
+            await asyncio.to_thread(
+                CalendarService.update_post, post.id, status="failed",
+                execution_logs=post.execution_logs + [f"{datetime.utcnow().isoformat()} dispatch aborted: {e!r}"],
+            )
+            raise
+
+        logs = [
+            f"{datetime.utcnow().isoformat()} {r.platform} → {r.webhook_url}: "
+            + (("already delivered" if r.duplicate else f"delivered (HTTP {r.status_code}, {r.attempts} attempt(s))")
+               if r.success else (r.error if r.duplicate else f"failed ({r.error}, {r.attempts} attempt(s))"))
+            for r in results
+        ]
+        fields = {"execution_logs": post.execution_logs + logs}
+        # A target still being delivered by another run: that run records the final status
+        if not any(r.duplicate and not r.success for r in results):
+            fields["status"] = "dispatched" if all(r.success for r in results) else "failed"
+        updated = await asyncio.to_thread(CalendarService.update_post, post.id, **fields)
+        return updated or post, results
+
+    @classmethod
+    async def dispatch_many(cls, posts: List[ScheduledPost]) -> List[Tuple[ScheduledPost, List[DispatchResult]]]:
+        """Dispatches posts concurrently, at most DISPATCH_POST_CONCURRENCY at a time."""
+        limit = asyncio.Semaphore(POST_CONCURRENCY)
+
+        async def run(post: ScheduledPost):
+            async with limit:
+                return await cls.dispatch_post(post)
+
+        return list(await asyncio.gather(*(run(p) for p in posts)))
@@ -0,0 +1,181 @@
+"""
+Versioned in-memory graph for a Genesis process.
+
+Nodes and edges are kept in dicts keyed by id, so updating a node is O(1)
+instead of a scan over the node list. Every mutation bumps `version` and
+stamps what it touched (a node, a single data field, an edge, the status,
+a progress entry) with that version, so `diff_since(v)` returns only what
+changed after the client's version, with current values: ten token-level
+updates to one node between two pushes become one field in the diff.
+
+`snapshot()` keeps the shape `GET /genesis/{id}` has always returned;
+`to_state()` / `from_state()` carry the version stamps too, so a graph
+persisted by one worker keeps producing correct diffs in another.
+"""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Separator for (node_id, field) keys in persisted state
+_FIELD_SEP = "\x1f"
+
+
+class GenesisGraph:
+    def __init__(self, process_id: str, status: str):
+        self.id = process_id
+        self.status = status
+        self.version = 0
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: Dict[str, Dict[str, Any]] = {}
+        self.progress: Optional[Dict[str, Any]] = None
+
+        # What changed at which version
+        self._status_version = 0
+        self._node_versions: Dict[str, int] = {}
+        self._field_versions: Dict[Tuple[str, str], int] = {}
+        self._edge_versions: Dict[str, int] = {}
+        self._progress_version = 0
+        self._run_version = 0
+        self._asset_versions: Dict[str, int] = {}
+        self._changed = asyncio.Event()
+        # Called after every mutation (the service schedules persistence with it)
+        self.on_change: Optional[Callable[[], None]] = None
+
+    # --- Mutations ---
+
+    def _bump(self) -> int:
+        self.version += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+        if self.on_change is not None:
+            self.on_change()
+        return self.version
+
+    def set_status(self, status: str):
+        if status != self.status:
+            self.status = status
+            self._status_version = self._bump()
+
+    def add_node(self, node: Dict[str, Any]):
+        self.nodes[node["id"]] = node
+        self._node_versions[node["id"]] = self._bump()
+
+    def update_node(self, node_id: str, **fields: Any):
+        """Sets fields in a node's `data`."""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return
+        version = self._bump()
+        for key, value in fields.items():
+            node["data"][key] = value
+            self._field_versions[(node_id, key)] = version
+
+    def add_edge(self, edge: Dict[str, Any]):
+        self.edges[edge["id"]] = edge
+        self._edge_versions[edge["id"]] = self._bump()
+
+    def start_progress(self, run: str):
+        self.progress = {"run": run, "assets": {}, "failed": [], "ms": None}
+        self._asset_versions.clear()
+        self._run_version = self._progress_version = self._bump()
+
+    def set_progress(self, **fields: Any):
+        self.progress.update(fields)
+        self._progress_version = self._bump()
+
+    def update_asset(self, node_id: str, **fields: Any):
+        self.progress["assets"].setdefault(node_id, {}).update(fields)
+        self._asset_versions[node_id] = self._bump()
+
+    # --- Reads ---
+
+    def asset(self, node_id: str) -> Dict[str, Any]:
+        return self.progress["assets"][node_id]
+
+    def nodes_of_type(self, *types: str) -> List[Dict[str, Any]]:
+        return [n for n in self.nodes.values() if n["type"] in types]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "version": self.version,
+            "nodes": list(self.nodes.values()),
+            "edges": list(self.edges.values()),
+            "progress": self.progress,
+        }
+
+    def diff_since(self, version: int) -> Dict[str, Any]:
+        """
+        Changes after `version`: `nodes` added (full), `node_data` field
+        updates for nodes the client already has, `edges` added, `status`,
+        and progress: the whole object (with `assets`) after a new run
+        started, otherwise changed top-level fields plus changed `assets`.
+        """
+        added = [nid for nid, v in self._node_versions.items() if v > version]
+        node_data: Dict[str, Dict[str, Any]] = {}
+        for (nid, key), v in self._field_versions.items():
+            if v > version and nid not in added:
+                node_data.setdefault(nid, {})[key] = self.nodes[nid]["data"][key]
+
+        diff: Dict[str, Any] = {"from": version, "version": self.version}
+        if added:
+            diff["nodes"] = [self.nodes[nid] for nid in added]
+        if node_data:
+            diff["node_data"] = node_data
+        edges = [self.edges[eid] for eid, v in self._edge_versions.items() if v > version]
+        if edges:
+            diff["edges"] = edges
+        if self._status_version > version:
+            diff["status"] = self.status
+        if self.progress is not None:
+            if self._run_version > version:
+                # A new run replaces the asset table: send the whole progress object
+                diff["progress"] = self.progress
+            else:
+                if self._progress_version > version:
+                    diff["progress"] = {k: v for k, v in self.progress.items() if k != "assets"}
+                assets = {nid: self.progress["assets"][nid] for nid, v in self._asset_versions.items() if v > version}
+                if assets:
+                    diff["assets"] = assets
+        return diff
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            **self.snapshot(),
+            "stamps": {
+                "status": self._status_version,
+                "progress": self._progress_version,
+                "run": self._run_version,
+                "nodes": self._node_versions,
+                "fields": {f"{nid}{_FIELD_SEP}{key}": v for (nid, key), v in self._field_versions.items()},
+                "edges": self._edge_versions,
+                "assets": self._asset_versions,
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "GenesisGraph":
+        graph = cls(state["id"], state["status"])
+        graph.version = state["version"]
+        graph.nodes = {n["id"]: n for n in state["nodes"]}
+        graph.edges = {e["id"]: e for e in state["edges"]}
+        graph.progress = state.get("progress")
+        stamps = state["stamps"]
+        graph._status_version = stamps["status"]
+        graph._progress_version = stamps["progress"]
+        graph._run_version = stamps["run"]
+        graph._node_versions = dict(stamps["nodes"])
+        graph._field_versions = {tuple(k.split(_FIELD_SEP, 1)): v for k, v in stamps["fields"].items()}
+        graph._edge_versions = dict(stamps["edges"])
+        graph._asset_versions = dict(stamps["assets"])
+        return graph
+
+    async def wait_for_change(self, version: int, timeout: Optional[float] = None) -> bool:
+        """Waits until the graph is past `version`; False on timeout."""
+        if self.version > version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
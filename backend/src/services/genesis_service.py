@@ -1,19 +1,56 @@
 
 
 import asyncio
+import contextlib
+import copy
+import hashlib
+import os
+import time
 import uuid
 import random
-from typing import Dict, List, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import re
 from src.core.llm_factory import LLMFactory
+from src.core.state_backend import state_backend
+from src.utils.events import PipelineEvent
 from src.utils.logger import get_logger
+from src.utils.host_slots import HostSlots
 from src.services.brand_service import BrandService
+from src.services.genesis_graph import GenesisGraph
 from src.agents.marketing_strategist_agent import MarketingStrategistAgent
 
 logger = get_logger(__name__)
 
+# Concurrent LLM calls per worker process
+MAX_CONCURRENCY = int(os.getenv("GENESIS_MAX_CONCURRENCY", "3"))
+# Concurrent LLM calls across all workers on the host (0 disables the host bound)
+HOST_SLOTS = int(os.getenv("GENESIS_HOST_SLOTS", "6"))
+# Extra attempts for an asset whose generation failed
+ASSET_RETRIES = int(os.getenv("GENESIS_ASSET_RETRIES", "1"))
+RETRY_BACKOFF_SECONDS = 1.5
+# Memoised trend-jack / tune rewrites kept per worker (LRU)
+REWRITE_CACHE_SIZE = int(os.getenv("GENESIS_REWRITE_CACHE_SIZE", "512"))
+
+PLACEHOLDER = "Generating..."
+
+# Graph push: batch window for diffs, and how often an idle stream rechecks the process exists
+GRAPH_PUSH_INTERVAL = 0.1
+GRAPH_IDLE_CHECK_SECONDS = 30.0
+
+# Shared state (STATE_BACKEND other than memory): graphs are written through,
+# debounced, and streams for a graph run by another worker poll its version
+STATE_NAMESPACE = "genesis"
+VERSION_NAMESPACE = "genesis_versions"
+PERSIST_INTERVAL = 0.25
+GRAPH_POLL_SECONDS = 0.5
+# A run whose worker hasn't saved for this long is presumed dead
+RUN_STALE_SECONDS = 600
+BUSY_STATUSES = {"analyzing", "generating", "trend_jacking", "tuning", "retrying"}
+
 class GenesisService:
     """
     The Engine Room for 'The Genesis Engine'.
@@ -22,10 +59,46 @@ class GenesisService:
     2. Node Graph Construction (Recursive Spawning)
     3. Content Generation (Parallel Execution)
     4. Trend Jacking (Live Updates)
+
+    Every run (initial generation, trend-jack, tune, retry) is a task held in
+    `_runs`; starting a new rewrite cancels the one in flight for the same
+    process. LLM calls go through `_llm_slot`, which bounds them per worker
+    and across workers on the host. Per-asset status, attempts and timing are
+    published in the graph's progress, and only failed assets are retried.
+
+    Graphs are GenesisGraph objects: O(1) node updates and a version counter,
+    so `stream_graph` can push diffs instead of clients re-polling the graph.
+
+    Rewrites are layered rather than compounded: trend-jack rewrites a node's
+    generated ("base") content, tune rewrites the trend-jacked content (or the
+    base). Each rewrite is memoised under (operation, parameter, source hash,
+    strategy hash), so toggling Hinglish -> Corporate -> Hinglish reuses the
+    first Hinglish result, and only nodes whose source changed hit the LLM.
+
+    With a shared state backend, the worker running a process owns its graph
+    and writes it through to the backend; once the run ends the local copy is
+    dropped, reads go to the backend, and the next rewrite is adopted by
+    whichever worker receives it.
     """
 
-    # In-memory store for active processes (MVP only - use Redis/DB in prod)
-    _active_processes: Dict[str, Dict[str, Any]] = {}
+    # Graphs owned by this worker (all of them with the memory backend)
+    _active_processes: Dict[str, GenesisGraph] = {}
+    _persist_pending: set = set()
+    # Backend writes run off the event loop, one at a time so they land in order
+    _persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="genesis-persist")
+
+    # process_id -> (run kind, task) for the run currently in flight
+    _runs: Dict[str, Tuple[str, asyncio.Task]] = {}
+    # process_id -> node_id -> {"node_id", "prompt", "strategy", "layer", "cache_key"} of the last run, for retries
+    _asset_specs: Dict[str, Dict[str, Dict[str, str]]] = {}
+    # process_id -> node_id -> {"base": generated content, "trended": trend-jacked content}
+    _sources: Dict[str, Dict[str, Dict[str, Optional[str]]]] = {}
+    # cache key -> rewritten content
+    _rewrite_cache: "OrderedDict[str, str]" = OrderedDict()
+
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _host_slots = HostSlots("cloudcraft-genesis", HOST_SLOTS)
+    _content_agent = None
 
     @classmethod
     async def start_genesis(cls, input_source: str) -> Dict[str, Any]:
@@ -36,27 +109,22 @@ class GenesisService:
         process_id = str(uuid.uuid4())
         
         # 1. Initialize the Graph
-        initial_graph = {
-            "id": process_id,
-            "status": "analyzing", # analyzing -> generating -> complete
-            "nodes": [
-                {
-                    "id": "root",
-                    "type": "source",
-                    "data": {"label": "Source Input", "content": input_source},
-                    "position": {"x": 0, "y": 0}
-                }
-            ],
-            "edges": []
-        }
+        graph = GenesisGraph(process_id, "analyzing") # analyzing -> generating -> complete
+        graph.add_node({
+            "id": "root",
+            "type": "source",
+            "data": {"label": "Source Input", "content": input_source},
+            "position": {"x": 0, "y": 0}
+        })
 
         # Store state
-        cls._active_processes[process_id] = initial_graph
+        cls._track(process_id, graph)
+        cls._persist(process_id)
 
-        # 2. Fire and Forget Background Task
-        asyncio.create_task(cls._run_genesis_pipeline(process_id, input_source))
+        # 2. Background run, tracked so it can be cancelled / awaited
+        cls._launch(process_id, "genesis", cls._run_genesis_pipeline(process_id, input_source))
 
-        return {"process_id": process_id, "message": "Genesis initialized", "graph": initial_graph}
+        return {"process_id": process_id, "message": "Genesis initialized", "graph": graph.snapshot()}
 
     @classmethod
     async def _run_genesis_pipeline(cls, process_id: str, input_source: str):
@@ -74,13 +142,16 @@ class GenesisService:
             from fastapi.concurrency import run_in_threadpool
             brand_context = await run_in_threadpool(BrandService.get_brand_context)
             
-            strategy_result = await strategist.async_run(
-                task=f"""
+            async with cls._llm_slot():
+                strategy_result = await strategist.async_run(
+                    task=f"""
                 {brand_context}
                 
                 Analyze this input and create a campaign strategy: {input_source}
                 """
-            )
+                )
+            if cls._failed(strategy_result):
+                raise RuntimeError(f"Strategist failed: {strategy_result.thought}")
             
             
             # Update Graph with Strategy Node
@@ -88,7 +159,6 @@ class GenesisService:
             display_content = strategy_result.output
             try:
                 # Attempt to parse and pretty print
-                import json
                 clean_json = strategy_result.output.replace("```json", "").replace("```", "").strip()
                 data = json.loads(clean_json)
                 
@@ -109,6 +179,7 @@ class GenesisService:
                 logger.warning(f"Failed to format strategy display: {e}")
 
             cls._add_node(process_id, "strategy", "strategy", "Campaign Strategy", display_content, "root")
+            cls._sources[process_id] = {"strategy": {"base": display_content, "trended": None}}
             
             # Step B: Spawn Asset Nodes (The "Explosion")
             # In a real app, the Strategist would decide WHICH assets to create. 
@@ -122,41 +193,335 @@ class GenesisService:
                 {"id": "tiktok_script", "label": "TikTok Script", "prompt": "Write a funny, fast-paced 30s TikTok script."}
             ]
 
-            tasks = []
+            specs = []
             for asset in assets_to_create:
                 # Add placeholder nodes first (visual feedback)
-                cls._add_node(process_id, asset["id"], "asset", asset["label"], "Generating...", "strategy")
-                
-                # Queue generation task
-                tasks.append(
-                    cls._generate_asset_content(process_id, asset["id"], asset["prompt"], strategy_result.output)
-                )
+                cls._add_node(process_id, asset["id"], "asset", asset["label"], PLACEHOLDER, "strategy")
+                specs.append({"node_id": asset["id"], "prompt": asset["prompt"], "strategy": strategy_result.output, "layer": "base"})
 
-            # Step C: Parallel Execution
-            await asyncio.gather(*tasks)
+            # Step C: Bounded Parallel Execution
+            cls._update_status(process_id, "generating")
+            progress = await cls._run_assets(process_id, "genesis", specs)
 
-            # Mark Complete
+            # Mark Complete (failed assets are listed in progress and can be retried)
             cls._update_status(process_id, "complete")
-            logger.info(f"[{process_id}] Pipeline complete.")
+            logger.info(f"[{process_id}] Pipeline complete in {progress['ms']}ms, {len(progress['failed'])} asset(s) failed.")
 
+        except asyncio.CancelledError:
+            logger.info(f"[{process_id}] Pipeline cancelled.")
+            raise
         except Exception as e:
             logger.error(f"[{process_id}] Pipeline failed: {e}")
             cls._update_status(process_id, "error")
 
+    # --- Execution engine ---
+
+    @classmethod
+    def _launch(cls, process_id: str, kind: str, coro) -> asyncio.Task:
+        """Runs `coro` as the process's current run, cancelling the one it supersedes."""
+        previous = cls._runs.get(process_id)
+        if previous is not None and not previous[1].done():
+            logger.info(f"[{process_id}] Cancelling superseded {previous[0]} run.")
+            previous[1].cancel()
+
+        task = asyncio.create_task(coro)
+        cls._runs[process_id] = (kind, task)
+
+        def finished(t: asyncio.Task):
+            if cls._runs.get(process_id, (None, None))[1] is t:
+                del cls._runs[process_id]
+                if state_backend.shared:
+                    cls._release(process_id)
+            if not t.cancelled() and t.exception() is not None:
+                logger.error(f"[{process_id}] {kind} run failed: {t.exception()}")
+
+        task.add_done_callback(finished)
+        return task
+
+    # --- Ownership & shared state ---
+
+    @classmethod
+    def _track(cls, process_id: str, graph: GenesisGraph):
+        cls._active_processes[process_id] = graph
+        if state_backend.shared:
+            graph.on_change = lambda: cls._schedule_persist(process_id)
+
+    @classmethod
+    def _schedule_persist(cls, process_id: str):
+        if process_id in cls._persist_pending:
+            return
+        cls._persist_pending.add(process_id)
+        asyncio.get_running_loop().call_later(PERSIST_INTERVAL, cls._persist, process_id)
+
     @classmethod
-    async def _generate_asset_content(cls, process_id: str, node_id: str, prompt: str, strategy: str):
+    def _persist(cls, process_id: str):
+        """Snapshots the graph on the loop and queues the backend write on the persist thread."""
+        cls._persist_pending.discard(process_id)
+        graph = cls._active_processes.get(process_id)
+        if graph is None or not state_backend.shared:
+            return
+        # Copied here: the graph keeps changing on the loop while the write runs
+        state = copy.deepcopy({
+            "graph": graph.to_state(),
+            "specs": cls._asset_specs.get(process_id, {}),
+            "sources": cls._sources.get(process_id, {}),
+            "saved_at": time.time(),
+        })
+        cls._persist_executor.submit(cls._write_state, process_id, state, graph.version)
+
+    @staticmethod
+    def _write_state(process_id: str, state: Dict[str, Any], version: int):
+        try:
+            state_backend.set(STATE_NAMESPACE, process_id, state)
+            state_backend.set(VERSION_NAMESPACE, process_id, version)
+        except Exception as e:
+            logger.error(f"[{process_id}] Failed to persist graph: {e}")
+
+    @classmethod
+    def _release(cls, process_id: str):
+        """Final write-through, then hand the process back to the shared backend."""
+        cls._persist(process_id)
+        graph = cls._active_processes.pop(process_id, None)
+        if graph is not None:
+            graph.on_change = None
+        cls._asset_specs.pop(process_id, None)
+        cls._sources.pop(process_id, None)
+
+    @classmethod
+    async def _acquire(cls, process_id: str) -> Tuple[Optional[GenesisGraph], Optional[str]]:
+        """
+        The graph a new run will mutate, adopting it from the shared backend
+        when another worker ran it last. Returns (graph, error).
+        """
+        graph = cls._active_processes.get(process_id)
+        if graph is not None:
+            return graph, None
+        state = await asyncio.to_thread(state_backend.get, STATE_NAMESPACE, process_id) if state_backend.shared else None
+        # Adopted by another request while the backend was read
+        graph = cls._active_processes.get(process_id)
+        if graph is not None:
+            return graph, None
+        if state is None:
+            return None, "Process not found"
+        graph = GenesisGraph.from_state(state["graph"])
+        if graph.status in BUSY_STATUSES and time.time() - state["saved_at"] < RUN_STALE_SECONDS:
+            return None, "Campaign is busy on another worker"
+        cls._track(process_id, graph)
+        cls._asset_specs[process_id] = state.get("specs", {})
+        cls._sources[process_id] = state.get("sources", {})
+        logger.info(f"[{process_id}] Adopted graph at version {graph.version}")
+        return graph, None
+
+    @classmethod
+    def _is_generating(cls, process_id: str) -> bool:
+        run = cls._runs.get(process_id)
+        return run is not None and run[0] == "genesis" and not run[1].done()
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def _llm_slot(cls):
+        """One LLM call's worth of capacity: a per-process slot, then a host-wide one."""
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        async with cls._semaphore:
+            async with cls._host_slots.acquire():
+                yield
+
+    @staticmethod
+    def _failed(response) -> bool:
+        # BaseAgent.async_run reports errors as a zero-confidence response rather than raising
+        return response.confidence == 0.0 and response.needs_more_info
+
+    @classmethod
+    def _agent(cls):
+        if cls._content_agent is None:
+            from src.agents.content_creator_agent import ContentCreatorAgent
+            cls._content_agent = ContentCreatorAgent()
+        return cls._content_agent
+
+    @classmethod
+    async def _generate_asset_content(cls, prompt: str, strategy: str) -> str:
         """
         Generates content for a specific asset node using the Strategy as context.
+        Raises if the agent reports a failure.
         """
-        from src.agents.content_creator_agent import ContentCreatorAgent
-        agent = ContentCreatorAgent() # dedicated agent for text
-        
-        response = await agent.async_run(
-            task=f"{prompt}\n\nStrictly follow this strategy context:\n{strategy}"
+        task = f"{prompt}\n\nStrictly follow this strategy context:\n{strategy}" if strategy else prompt
+        async with cls._llm_slot():
+            response = await cls._agent().async_run(task=task)
+        if cls._failed(response):
+            raise RuntimeError(response.thought or "Content generation failed")
+        return response.output
+
+    # --- Rewrite memoisation ---
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def _rewrite_key(cls, operation: str, parameter: str, source: str, strategy: str) -> str:
+        return f"{operation}:{parameter.strip().lower()}:{cls._digest(source)}:{cls._digest(strategy)}"
+
+    @classmethod
+    def _recall(cls, key: Optional[str]) -> Optional[str]:
+        if key is None or key not in cls._rewrite_cache:
+            return None
+        cls._rewrite_cache.move_to_end(key)
+        return cls._rewrite_cache[key]
+
+    @classmethod
+    def _remember(cls, key: str, content: str):
+        cls._rewrite_cache[key] = content
+        cls._rewrite_cache.move_to_end(key)
+        while len(cls._rewrite_cache) > REWRITE_CACHE_SIZE:
+            cls._rewrite_cache.popitem(last=False)
+
+    @classmethod
+    def _strategy(cls, process_id: str) -> str:
+        """The campaign strategy as generated, which rewrites keep following."""
+        return (cls._sources.get(process_id, {}).get("strategy") or {}).get("base") or ""
+
+    @classmethod
+    def _source(cls, process_id: str, node: Dict[str, Any], layer: str) -> str:
+        """
+        The content a rewrite starts from: `base` is the generated content,
+        `trended` the trend-jacked content, falling back to the base.
+        """
+        sources = cls._sources.setdefault(process_id, {}).setdefault(
+            node["id"], {"base": node["data"]["content"], "trended": None}
         )
+        if layer == "trended" and sources["trended"] is not None:
+            return sources["trended"]
+        return sources["base"]
 
-        # Update Node with real content
-        cls._update_node_content(process_id, node_id, response.output)
+    @classmethod
+    def _apply_output(cls, process_id: str, spec: Dict[str, str], content: str):
+        """Writes a generated/rewritten result to its node, source layer and the rewrite cache."""
+        node_id = spec["node_id"]
+        cls._update_node_content(process_id, node_id, content)
+        layer = spec.get("layer")
+        if layer is not None:
+            sources = cls._sources.setdefault(process_id, {}).setdefault(node_id, {"base": content, "trended": None})
+            sources[layer] = content
+            if layer == "base":
+                sources["trended"] = None
+        if spec.get("cache_key"):
+            cls._remember(spec["cache_key"], content)
+
+    @classmethod
+    async def _run_asset(cls, process_id: str, spec: Dict[str, str]):
+        graph = cls._active_processes[process_id]
+        node_id = spec["node_id"]
+        cached = cls._recall(spec.get("cache_key"))
+        if cached is not None:
+            cls._apply_output(process_id, spec, cached)
+            graph.update_asset(node_id, status="done", ms=0, cached=True)
+            cls._set_node_state(process_id, node_id, "done")
+            return
+
+        attempts = 0
+        error: Optional[str] = None
+        graph.update_asset(node_id, status="running", error=None)
+        cls._set_node_state(process_id, node_id, "running")
+        started = time.perf_counter()
+
+        def elapsed() -> int:
+            return round((time.perf_counter() - started) * 1000)
+
+        try:
+            for attempt in range(ASSET_RETRIES + 1):
+                attempts += 1
+                graph.update_asset(node_id, attempts=attempts)
+                try:
+                    content = await cls._generate_asset_content(spec["prompt"], spec["strategy"])
+                    cls._apply_output(process_id, spec, content)
+                    graph.update_asset(node_id, status="done", ms=elapsed())
+                    cls._set_node_state(process_id, node_id, "done")
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    error = str(e)
+                    logger.warning(f"[{process_id}] Asset {node_id} attempt {attempts} failed: {e}")
+                    if attempt < ASSET_RETRIES:
+                        await asyncio.sleep(RETRY_BACKOFF_SECONDS * (attempt + 1))
+            graph.update_asset(node_id, status="error", error=error, ms=elapsed())
+            cls._set_node_state(process_id, node_id, "error", error)
+        except asyncio.CancelledError:
+            graph.update_asset(node_id, status="cancelled", ms=elapsed())
+            cls._set_node_state(process_id, node_id, "cancelled")
+            raise
+
+    @classmethod
+    async def _run_assets(
+        cls,
+        process_id: str,
+        run: str,
+        specs: List[Dict[str, str]],
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Generates `specs` concurrently (bounded by `_llm_slot`) and records
+        per-asset progress on the graph. With `resume` the entries are
+        updated in the current progress (retries); otherwise a new run's
+        progress replaces it.
+        """
+        graph = cls._active_processes[process_id]
+        if not resume or graph.progress is None:
+            graph.start_progress(run)
+            cls._asset_specs[process_id] = {}
+        else:
+            graph.set_progress(run=run)
+        for spec in specs:
+            graph.update_asset(spec["node_id"], status="queued", attempts=0, ms=None, error=None, cached=False)
+            cls._asset_specs[process_id][spec["node_id"]] = spec
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(cls._run_asset(process_id, spec)) for spec in specs]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for node_id, entry in graph.progress["assets"].items():
+                if entry["status"] in ("queued", "running"):
+                    graph.update_asset(node_id, status="cancelled")
+            raise
+        finally:
+            graph.set_progress(
+                ms=round((time.perf_counter() - started) * 1000),
+                failed=[
+                    node_id for node_id, entry in graph.progress["assets"].items()
+                    if entry["status"] in ("error", "cancelled")
+                ],
+            )
+        return graph.progress
+
+    @classmethod
+    async def _rewrite_run(cls, process_id: str, run: str, specs: List[Dict[str, str]], resume: bool = False):
+        result = await cls._run_assets(process_id, run, specs, resume)
+        cls._update_status(process_id, "complete")
+        return result
+
+    @classmethod
+    async def _rewrite(
+        cls,
+        process_id: str,
+        run: str,
+        status: str,
+        specs: List[Dict[str, str]],
+        message: str,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """Starts a rewrite run (superseding any in flight) and waits for it."""
+        cls._update_status(process_id, status)
+        task = cls._launch(process_id, run, cls._rewrite_run(process_id, run, specs, resume))
+        await asyncio.wait({task})
+        if task.cancelled():
+            return {"message": "Superseded by a newer run", "superseded": True}
+        result = task.result()
+        return {"message": message, "failed": result["failed"], "ms": result["ms"]}
 
     @classmethod
     async def trend_jack(cls, process_id: str, trend: str) -> Dict[str, Any]:
@@ -165,31 +530,30 @@ class GenesisService:
         """
         logger.info(f"[{process_id}] Trend Jacking: {trend}")
         
-        graph = cls.get_graph(process_id)
-        if not graph:
-            return {"error": "Process not found"}
+        graph, error = await cls._acquire(process_id)
+        if error:
+            return {"error": error}
+        if cls._is_generating(process_id):
+            return {"error": "Campaign is still generating"}
 
-        # 1. Update Strategy Node
-        cls._update_status(process_id, "trend_jacking")
-        
         # In a real app, we'd re-run the whole pipeline.
-        # For MVP, we'll just append local tasks to re-write content.
+        # For MVP, we'll just re-write the content of each asset.
         
         prompt_modifier = f"RE-WRITE THIS to fit the viral trend: '{trend}'. Make it relevant but keep core values."
         
-        tasks = []
-        for node in graph["nodes"]:
-            if node["type"] == "asset":
-                 current_content = node["data"]["content"]
-                 # Re-generate
-                 tasks.append(
-                     cls._generate_asset_content(process_id, node["id"], f"{prompt_modifier}\nOriginal Content: {current_content}", "")
-                 )
-        
-        await asyncio.gather(*tasks)
-        cls._update_status(process_id, "complete")
-        
-        return {"message": "Trend Jack complete"}
+        strategy = cls._strategy(process_id)
+        specs = []
+        for node in graph.nodes_of_type("asset"):
+            # Always from the generated content, so switching trends doesn't compound rewrites
+            source = cls._source(process_id, node, "base")
+            specs.append({
+                "node_id": node["id"],
+                "prompt": f"{prompt_modifier}\nOriginal Content: {source}",
+                "strategy": strategy,
+                "layer": "trended",
+                "cache_key": cls._rewrite_key("trend_jack", trend, source, strategy),
+            })
+        return await cls._rewrite(process_id, "trend_jack", "trend_jacking", specs, "Trend Jack complete")
 
     @classmethod
     async def tune_campaign(cls, process_id: str, dialect: str) -> Dict[str, Any]:
@@ -198,11 +562,11 @@ class GenesisService:
         """
         logger.info(f"[{process_id}] Tuning Campaign to: {dialect}")
         
-        graph = cls.get_graph(process_id)
-        if not graph:
-            return {"error": "Process not found"}
-        
-        cls._update_status(process_id, "tuning")
+        graph, error = await cls._acquire(process_id)
+        if error:
+            return {"error": error}
+        if cls._is_generating(process_id):
+            return {"error": "Campaign is still generating"}
 
         # Define Persona Prompts
         personas = {
@@ -214,22 +578,93 @@ class GenesisService:
         
         persona_prompt = personas.get(dialect.lower(), "Rewrite this content to be more engaging.")
 
-        tasks = []
-        for node in graph["nodes"]:
-            if node["type"] == "asset" or node["type"] == "strategy":
-                 current_content = node["data"]["content"]
-                 tasks.append(
-                     cls._generate_asset_content(process_id, node["id"], f"{persona_prompt}\n\nOriginal Content: {current_content}", "")
-                 )
-        
-        await asyncio.gather(*tasks)
-        cls._update_status(process_id, "complete")
-        
-        return {"message": f"Tuned to {dialect}"}
+        strategy = cls._strategy(process_id)
+        specs = []
+        for node in graph.nodes_of_type("asset", "strategy"):
+            # From the trend-jacked (or generated) content, never from another dialect
+            source = cls._source(process_id, node, "trended")
+            # The strategy node is the strategy: it needs no copy of itself as context
+            context = strategy if node["type"] == "asset" else ""
+            specs.append({
+                "node_id": node["id"],
+                "prompt": f"{persona_prompt}\n\nOriginal Content: {source}",
+                "strategy": context,
+                "cache_key": cls._rewrite_key("tune", dialect, source, context),
+            })
+        return await cls._rewrite(process_id, "tune", "tuning", specs, f"Tuned to {dialect}")
+
+    @classmethod
+    async def retry_failed(cls, process_id: str) -> Dict[str, Any]:
+        """
+        Re-runs only the assets that failed or were cancelled in the last run,
+        with the same prompts.
+        """
+        graph, error = await cls._acquire(process_id)
+        if error:
+            return {"error": error}
+        if process_id in cls._runs:
+            return {"error": "A run is already in progress"}
+
+        failed = list(graph.progress["failed"]) if graph.progress else []
+        if not failed:
+            return {"message": "Nothing to retry", "failed": []}
+
+        logger.info(f"[{process_id}] Retrying {len(failed)} asset(s): {failed}")
+        specs = [cls._asset_specs[process_id][node_id] for node_id in failed]
+        return await cls._rewrite(process_id, "retry", "retrying", specs, "Retry complete", resume=True)
 
     @classmethod
-    def get_graph(cls, process_id: str) -> Dict[str, Any]:
-        return cls._active_processes.get(process_id)
+    async def get_graph(cls, process_id: str) -> Optional[GenesisGraph]:
+        """The live graph if this worker owns it, otherwise the last persisted copy."""
+        graph = cls._active_processes.get(process_id)
+        if graph is None and state_backend.shared:
+            state = await asyncio.to_thread(state_backend.get, STATE_NAMESPACE, process_id)
+            if state is not None:
+                graph = GenesisGraph.from_state(state["graph"])
+        return graph
+
+    @classmethod
+    async def stream_graph(cls, process_id: str, version: int = 0) -> AsyncIterator[PipelineEvent]:
+        """
+        Pushes the graph as it changes: a `snapshot` first when the client
+        has nothing (version 0) or a version from another server process,
+        a `diff` with everything since its version otherwise, then one `diff`
+        per batch of changes. Event ids are graph versions, so an EventSource
+        reconnect (Last-Event-ID) resumes from the last diff it applied.
+        """
+        graph = await cls.get_graph(process_id)
+        if graph is None:
+            return
+        if version <= 0 or version > graph.version:
+            yield PipelineEvent("snapshot", graph.snapshot(), id=str(graph.version))
+        elif version < graph.version:
+            yield PipelineEvent("diff", graph.diff_since(version), id=str(graph.version))
+        version = graph.version
+
+        while True:
+            local = cls._active_processes.get(process_id)
+            if local is not None:
+                graph = local
+                if not await graph.wait_for_change(version, timeout=GRAPH_IDLE_CHECK_SECONDS):
+                    continue
+                # Let a burst of updates land so they go out as one diff
+                await asyncio.sleep(GRAPH_PUSH_INTERVAL)
+            elif state_backend.shared:
+                # Owned by another worker (or idle): follow the persisted copy
+                await asyncio.sleep(GRAPH_POLL_SECONDS)
+                latest = await asyncio.to_thread(state_backend.get, VERSION_NAMESPACE, process_id)
+                if latest is None:
+                    return
+                if latest <= version:
+                    continue
+                graph = await cls.get_graph(process_id)
+                if graph is None:
+                    return
+            else:
+                return
+            if graph.version > version:
+                yield PipelineEvent("diff", graph.diff_since(version), id=str(graph.version))
+                version = graph.version
 
     # --- Helper methods for Graph Manipulation ---
 
@@ -249,39 +684,42 @@ class GenesisService:
             
         else:
             # Temporary placeholder — frontend recalculates radial positions
-            asset_nodes = [n for n in graph["nodes"] if n["type"] == "asset" or n["type"] == "asset-pending"]
-            index = len(asset_nodes)
+            index = len(graph.nodes_of_type("asset", "asset-pending"))
             x = 900
             y = index * 560 - 1400  # rough vertical stack, overridden client-side
 
-        new_node = {
+        graph.add_node({
             "id": node_id,
             "type": type,
             "data": {"label": label, "content": content},
             "position": {"x": x, "y": y},
             "draggable": True
-        }
-        
-        graph["nodes"].append(new_node)
+        })
         
         if parent_id:
-            edge = {
+            graph.add_edge({
                 "id": f"e-{parent_id}-{node_id}",
                 "source": parent_id,
                 "target": node_id,
                 "animated": True
-            }
-            graph["edges"].append(edge)
+            })
 
     @classmethod
     def _update_node_content(cls, process_id: str, node_id: str, content: str):
+        cls._active_processes[process_id].update_node(node_id, content=content)
+
+    @classmethod
+    def _set_node_state(cls, process_id: str, node_id: str, state: str, error: Optional[str] = None):
         graph = cls._active_processes[process_id]
-        for node in graph["nodes"]:
-            if node["id"] == node_id:
-                node["data"]["content"] = content
-                break
+        node = graph.nodes.get(node_id)
+        if node is None:
+            return
+        fields: Dict[str, Any] = {"status": state, "error": error}
+        if state in ("error", "cancelled") and node["data"]["content"] == PLACEHOLDER:
+            fields["content"] = "Generation failed. Retry to regenerate this asset."
+        graph.update_node(node_id, **fields)
 
     @classmethod
     def _update_status(cls, process_id: str, status: str):
         if process_id in cls._active_processes:
-            cls._active_processes[process_id]["status"] = status
+            cls._active_processes[process_id].set_status(status)
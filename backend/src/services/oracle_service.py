@@ -1,16 +1,18 @@
-import json
 import os
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-import re
+from typing import List, Optional, Dict, Any, Tuple
 import boto3
 from botocore.exceptions import ClientError
 
 from src.core.llm_factory import LLMFactory
 from src.utils.logger import get_logger
+from src.utils.stream_json import parse_json_object
+from src.utils.dynamodb_query import RECORD_TYPE_ATTR, ensure_time_index, query_newest_first
+from src.services.analytics_service import AnalyticsService
 from src.services.brand_service import BrandService
-from src.models.schemas import OracleResponse, OracleHistoryItem, MetricScore, TimePoint, VisualAudit
+from src.services.dashboard_service import DashboardService
+from src.models.schemas import OracleResponse, OracleHistorySummary, MetricScore, TimePoint, VisualAudit
 
 logger = get_logger(__name__)
 
@@ -19,6 +21,8 @@ class OracleService:
     Service for the Performance Oracle, enhanced with AWS DynamoDB and Rekognition.
     """
     TABLE_NAME = os.getenv("DYNAMODB_ORACLE_HISTORY_TABLE", "cloudcraft-performance-oracle-history")
+    RECORD_TYPE = "ORACLE_PREDICTION"
+    SUMMARY_FIELDS = ["id", "timestamp", "input_content", "response.viral_score", "response.confidence_level"]
     _table = None
 
     @classmethod
@@ -34,6 +38,7 @@ class OracleService:
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
         )
         cls._table = dynamodb.Table(cls.TABLE_NAME)
+        ensure_time_index(cls._table, "timestamp")
         return cls._table
 
     @classmethod
@@ -124,11 +129,9 @@ class OracleService:
             
             # 6. Parse JSON Output
             output_text = response.content
-            json_match = re.search(r'\{.*\}', output_text, re.DOTALL)
-            if not json_match:
+            data = parse_json_object(output_text)
+            if not data:
                 raise ValueError("LLM failed to produce valid JSON output")
-            
-            data = json.loads(json_match.group())
 
             result = OracleResponse(
                 viral_score=data.get("viral_score", 0),
@@ -199,6 +202,7 @@ class OracleService:
         """
         item = {
             "id": str(uuid.uuid4()),
+            RECORD_TYPE_ATTR: cls.RECORD_TYPE,
             "timestamp": datetime.utcnow().isoformat(),
             "input_content": input_content,
             "response": result.dict(),
@@ -209,26 +213,37 @@ class OracleService:
             table = cls._get_table()
             table.put_item(Item=item)
             logger.info(f"Oracle prediction saved to DynamoDB: {item['id']}")
+            DashboardService.record_prediction(result.viral_score)
+            AnalyticsService.record_prediction(result.viral_score, item["timestamp"])
         except Exception as e:
             logger.error(f"Failed to save Oracle history to DynamoDB: {e}")
             # Fallback to local file could be added here if needed
 
     @classmethod
-    def get_history(cls) -> List[OracleHistoryItem]:
+    def get_history(cls, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[OracleHistorySummary], Optional[str]]:
         """
-        Retrieves history from DynamoDB, optimized for high performance.
+        Returns one page of prediction summaries, newest first, plus the next-page cursor.
+        Full responses are not projected — the history list only needs the score.
         """
         try:
             table = cls._get_table()
-            # In a real production app, we would use a GSI with timestamp for sorted results,
-            # but for this demo, a scan (limited) is used.
-            response = table.scan(Limit=20)
-            items = response.get("Items", [])
-            
-            # Sort manually by timestamp descending
-            items.sort(key=lambda x: x["timestamp"], reverse=True)
-            
-            return [OracleHistoryItem(**item) for item in items]
+            items, next_cursor = query_newest_first(
+                table, cls.RECORD_TYPE, "timestamp",
+                limit=limit, cursor=cursor, projection=cls.SUMMARY_FIELDS,
+            )
+            summaries = []
+            for item in items:
+                response = item.get("response", {})
+                summaries.append(OracleHistorySummary(
+                    id=item["id"],
+                    timestamp=item["timestamp"],
+                    input_content=item.get("input_content", ""),
+                    viral_score=int(response.get("viral_score", 0)),
+                    confidence_level=response.get("confidence_level", "Medium"),
+                ))
+            return summaries, next_cursor
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch Oracle history from DynamoDB: {e}")
-            return []
+            return [], None
@@ -4,7 +4,7 @@ Persona Service - Handles multi-persona content generation
 from src.agents.persona_agent import PersonaAgent
 from src.core.personas import get_persona, get_all_personas, get_persona_prompt_modifier
 from src.models.schemas import PersonaVariant, PersonaResponse, PersonaInfo
-from typing import List
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,11 +14,14 @@ class PersonaService:
     
     def __init__(self):
         self.agent = PersonaAgent()
+        self._catalog: Optional[List[PersonaInfo]] = None
     
     def get_available_personas(self) -> List[PersonaInfo]:
-        """Get list of all available personas"""
+        """Get list of all available personas (static, built once)"""
+        if self._catalog is not None:
+            return self._catalog
         personas = get_all_personas()
-        return [
+        self._catalog = [
             PersonaInfo(
                 id=persona_id,
                 name=config["name"],
@@ -28,6 +31,7 @@ class PersonaService:
             )
             for persona_id, config in personas.items()
         ]
+        return self._catalog
     
     async def generate_persona_variants(
         self, 
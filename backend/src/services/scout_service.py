@@ -9,14 +9,11 @@ This is NOT a single LLM call. It's a fully orchestrated multi-step agent loop:
   STEP 4: MEMORY AGENT     — DynamoDB: save run + compute trend delta vs past runs
   STEP 5: ALERT AGENT      — SNS: autonomously fire hot signal if viral_score >= 80
 
-Every step yields SSE events consumed by the frontend live feed.
+Every step yields typed pipeline events, streamed to the frontend live feed as SSE.
 """
 
-import json
-import re
 import asyncio
 from typing import AsyncGenerator
-from fastapi.concurrency import run_in_threadpool
 
 from src.core.llm_factory import LLMFactory
 from src.services.brand_service import BrandService
@@ -26,38 +23,25 @@ from src.services.aws_service import (
     ScoutDynamoDBService
 )
 from src.utils.logger import get_logger
-from tavily import TavilyClient
+from src.utils.events import PipelineEvent, first_event
+from src.utils.stream_json import StreamingJSONParser
+from tavily import AsyncTavilyClient
 import os
 
 logger = get_logger(__name__)
 
-# Shared Tavily client
-tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY", ""))
+# Shared Tavily client (async, so a client disconnect aborts the in-flight search)
+tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY", ""))
 
 # SNS hot-signal threshold
 HOT_SIGNAL_THRESHOLD = 78
 
 
-def _sse(event: str, data: dict) -> str:
-    """Format a Server-Sent Event string."""
-    return f"data: {json.dumps({'event': event, 'data': data})}\n\n"
-
-
-def _safe_json_parse(text: str) -> dict | None:
-    """Extract and parse first JSON object found in text."""
-    try:
-        match = re.search(r'\{.*\}', text, re.DOTALL)
-        if match:
-            return json.loads(match.group())
-    except Exception:
-        pass
-    return None
-
 
 class LocalScoutService:
     """
     Orchestrates the full 5-step Scout Agent pipeline.
-    Returns an async SSE generator for real-time frontend streaming.
+    Returns an async generator of pipeline events for real-time frontend streaming.
     """
 
     @staticmethod
@@ -65,10 +49,10 @@ class LocalScoutService:
         city: str,
         lat: float,
         lng: float
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[PipelineEvent, None]:
         """
-        Main entry point. Yields SSE events for each agent step.
-        Designed to be consumed by FastAPI StreamingResponse.
+        Main entry point. Yields a PipelineEvent for each agent step;
+        the endpoint serialises them (SSE / NDJSON).
         """
         llm = LLMFactory.get_llm()
         comprehend_svc = AWSComprehendService()
@@ -78,7 +62,7 @@ class LocalScoutService:
         # ══════════════════════════════════════════════════════
         # PIPELINE START
         # ══════════════════════════════════════════════════════
-        yield _sse("pipeline_start", {
+        yield PipelineEvent("pipeline_start", {
             "city": city,
             "lat": lat,
             "lng": lng,
@@ -91,7 +75,7 @@ class LocalScoutService:
         # ══════════════════════════════════════════════════════
         # STEP 1: RECON AGENT (Tavily — 3 targeted searches)
         # ══════════════════════════════════════════════════════
-        yield _sse("step_start", {
+        yield PipelineEvent("step_start", {
             "step": "RECON",
             "step_num": 1,
             "icon": "🔭",
@@ -108,14 +92,13 @@ class LocalScoutService:
         total_hits = 0
 
         for i, query in enumerate(search_queries):
-            yield _sse("recon_query", {
+            yield PipelineEvent("recon_query", {
                 "query_num": i + 1,
                 "query": query,
                 "message": f"Query {i+1}/3: Scanning \"{query[:50]}...\""
             })
             try:
-                results = await run_in_threadpool(
-                    tavily_client.search,
+                results = await tavily_client.search(
                     query=query,
                     search_depth="basic",
                     max_results=4
@@ -124,14 +107,14 @@ class LocalScoutService:
                 total_hits += len(hits)
                 chunk = " ".join([r.get("content", "")[:400] for r in hits])
                 raw_data_parts.append(chunk)
-                yield _sse("recon_hit", {
+                yield PipelineEvent("recon_hit", {
                     "query_num": i + 1,
                     "hits": len(hits),
                     "message": f"✓ Found {len(hits)} results"
                 })
             except Exception as e:
                 logger.warning(f"Tavily query {i+1} failed: {e}")
-                yield _sse("recon_hit", {
+                yield PipelineEvent("recon_hit", {
                     "query_num": i + 1,
                     "hits": 0,
                     "message": f"⚠ Query failed: {str(e)[:60]}"
@@ -139,7 +122,7 @@ class LocalScoutService:
 
         raw_data = " ".join(raw_data_parts)[:8000]
 
-        yield _sse("step_complete", {
+        yield PipelineEvent("step_complete", {
             "step": "RECON",
             "step_num": 1,
             "message": f"✅ RECON complete — {total_hits} intelligence hits gathered across 3 queries"
@@ -148,14 +131,14 @@ class LocalScoutService:
         # ══════════════════════════════════════════════════════
         # STEP 2: COMPREHEND AGENT (AWS NLP — real calls)
         # ══════════════════════════════════════════════════════
-        yield _sse("step_start", {
+        yield PipelineEvent("step_start", {
             "step": "COMPREHEND",
             "step_num": 2,
             "icon": "🧠",
             "message": "Routing raw intelligence to Amazon Comprehend for NLP extraction..."
         })
 
-        yield _sse("aws_call", {
+        yield PipelineEvent("aws_call", {
             "service": "comprehend",
             "action": "detect_sentiment + detect_key_phrases + detect_entities",
             "message": "☁ AWS Comprehend: running 3 NLP operations on raw recon data..."
@@ -173,7 +156,7 @@ class LocalScoutService:
                 "entities": []
             }
 
-        yield _sse("comprehend_result", {
+        yield PipelineEvent("comprehend_result", {
             "sentiment": comprehend_data["sentiment"],
             "compliance_score": comprehend_data["compliance_score"],
             "key_phrases": comprehend_data["key_phrases"],
@@ -186,7 +169,7 @@ class LocalScoutService:
             )
         })
 
-        yield _sse("step_complete", {
+        yield PipelineEvent("step_complete", {
             "step": "COMPREHEND",
             "step_num": 2,
             "message": "✅ COMPREHEND complete — AWS NLP intelligence package ready"
@@ -195,7 +178,7 @@ class LocalScoutService:
         # ══════════════════════════════════════════════════════
         # STEP 3: SYNTHESIS AGENT (Bedrock Nova LLM)
         # ══════════════════════════════════════════════════════
-        yield _sse("step_start", {
+        yield PipelineEvent("step_start", {
             "step": "SYNTHESIS",
             "step_num": 3,
             "icon": "⚗️",
@@ -250,14 +233,17 @@ Return ONLY the JSON. No markdown. No explanation.
 
         insights = None
         try:
-            response = await llm.ainvoke(synthesis_prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
-            insights = _safe_json_parse(content)
+            # Stream the synthesis and forward each top-level field as soon as it closes
+            parser = StreamingJSONParser()
+            async for chunk in llm.astream(synthesis_prompt):
+                for key, value in parser.feed(LLMFactory.chunk_text(chunk)):
+                    yield PipelineEvent("synthesis_field", {"key": key, "value": value})
+            insights = parser.result()
 
             if not insights:
                 raise ValueError("LLM returned no valid JSON")
 
-            yield _sse("synthesis_result", {
+            yield PipelineEvent("synthesis_result", {
                 "insights": insights,
                 "message": "✅ Amazon Nova synthesis complete — Intel brief generated"
             })
@@ -274,12 +260,12 @@ Return ONLY the JSON. No markdown. No explanation.
                 "trending_hashtags": [f"#{city.replace(' ', '')}", "#trending", "#local"],
                 "comprehend_summary": f"AWS detected {len(comprehend_data['key_phrases'])} signals with {comprehend_data['sentiment']} sentiment."
             }
-            yield _sse("synthesis_fallback", {
+            yield PipelineEvent("synthesis_fallback", {
                 "insights": insights,
                 "message": "⚠ Synthesis used Comprehend-direct fallback (LLM parse issue)"
             })
 
-        yield _sse("step_complete", {
+        yield PipelineEvent("step_complete", {
             "step": "SYNTHESIS",
             "step_num": 3,
             "message": "✅ SYNTHESIS complete — Intel brief ready"
@@ -288,7 +274,7 @@ Return ONLY the JSON. No markdown. No explanation.
         # ══════════════════════════════════════════════════════
         # STEP 4: MEMORY AGENT (DynamoDB — save + trend delta)
         # ══════════════════════════════════════════════════════
-        yield _sse("step_start", {
+        yield PipelineEvent("step_start", {
             "step": "MEMORY",
             "step_num": 4,
             "icon": "🗄️",
@@ -300,7 +286,7 @@ Return ONLY the JSON. No markdown. No explanation.
         # Read past runs BEFORE saving current (so delta is accurate)
         past_runs = await db_svc.get_past_scout_runs(city, limit=5)
 
-        yield _sse("aws_call", {
+        yield PipelineEvent("aws_call", {
             "service": "dynamodb",
             "action": "query + put_item",
             "message": f"☁ DynamoDB: fetched {len(past_runs)} past runs for '{city}'"
@@ -318,7 +304,7 @@ Return ONLY the JSON. No markdown. No explanation.
             lng=lng
         )
 
-        yield _sse("memory_update", {
+        yield PipelineEvent("memory_update", {
             "run_id": run_id,
             "trend_delta": trend_delta,
             "past_runs_count": len(past_runs),
@@ -330,7 +316,7 @@ Return ONLY the JSON. No markdown. No explanation.
             )
         })
 
-        yield _sse("step_complete", {
+        yield PipelineEvent("step_complete", {
             "step": "MEMORY",
             "step_num": 4,
             "message": "✅ MEMORY complete — Trend delta computed, run persisted to DynamoDB"
@@ -339,7 +325,7 @@ Return ONLY the JSON. No markdown. No explanation.
         # ══════════════════════════════════════════════════════
         # STEP 5: ALERT AGENT (SNS — autonomous hot signal)
         # ══════════════════════════════════════════════════════
-        yield _sse("step_start", {
+        yield PipelineEvent("step_start", {
             "step": "ALERT",
             "step_num": 5,
             "icon": "📡",
@@ -348,7 +334,7 @@ Return ONLY the JSON. No markdown. No explanation.
 
         alert_fired = False
         if viral_score >= HOT_SIGNAL_THRESHOLD:
-            yield _sse("aws_call", {
+            yield PipelineEvent("aws_call", {
                 "service": "sns",
                 "action": "publish",
                 "message": f"☁ 🔥 THRESHOLD BREACHED ({viral_score} ≥ {HOT_SIGNAL_THRESHOLD})! Firing SNS hot signal..."
@@ -359,7 +345,7 @@ Return ONLY the JSON. No markdown. No explanation.
                     viral_score=viral_score,
                     insights=insights
                 )
-                yield _sse("alert_sent", {
+                yield PipelineEvent("alert_sent", {
                     "fired": True,
                     "viral_score": viral_score,
                     "channel": "SNS Email",
@@ -367,20 +353,20 @@ Return ONLY the JSON. No markdown. No explanation.
                 })
             except Exception as e:
                 logger.error(f"SNS alert failed: {e}")
-                yield _sse("alert_sent", {
+                yield PipelineEvent("alert_sent", {
                     "fired": False,
                     "error": str(e),
                     "message": f"⚠ SNS alert failed: {str(e)[:80]}"
                 })
         else:
-            yield _sse("alert_skipped", {
+            yield PipelineEvent("alert_skipped", {
                 "fired": False,
                 "viral_score": viral_score,
                 "threshold": HOT_SIGNAL_THRESHOLD,
                 "message": f"📊 No alert needed — Score {viral_score} below threshold {HOT_SIGNAL_THRESHOLD}"
             })
 
-        yield _sse("step_complete", {
+        yield PipelineEvent("step_complete", {
             "step": "ALERT",
             "step_num": 5,
             "message": "✅ ALERT step complete"
@@ -389,7 +375,7 @@ Return ONLY the JSON. No markdown. No explanation.
         # ══════════════════════════════════════════════════════
         # PIPELINE COMPLETE
         # ══════════════════════════════════════════════════════
-        yield _sse("scout_complete", {
+        yield PipelineEvent("scout_complete", {
             "insights": insights,
             "comprehend_data": {
                 "sentiment": comprehend_data["sentiment"],
@@ -408,15 +394,8 @@ Return ONLY the JSON. No markdown. No explanation.
     async def get_localized_insights(city: str, lat: float, lng: float):
         """
         Legacy blocking endpoint — kept for backward compatibility.
-        Collects all SSE events and returns the final insights JSON.
+        Runs the pipeline until `scout_complete` and returns its insights.
         """
-        final = None
-        async for event_str in LocalScoutService.run_scout_agent_stream(city, lat, lng):
-            if event_str.startswith("data: "):
-                try:
-                    payload = json.loads(event_str[6:])
-                    if payload.get("event") == "scout_complete":
-                        final = payload["data"]["insights"]
-                except Exception:
-                    pass
-        return final or {"error": "Scout pipeline completed with no insights"}
\ No newline at end of file
+        final = await first_event(LocalScoutService.run_scout_agent_stream(city, lat, lng), "scout_complete")
+        insights = final.data.get("insights") if final else None
+        return insights or {"error": "Scout pipeline completed with no insights"}
\ No newline at end of file
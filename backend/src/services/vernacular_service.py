@@ -1,14 +1,58 @@
-import json
-import re
+import os
+import time
 import asyncio
-from typing import Dict, Any, List
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from src.core.llm_factory import LLMFactory
 from src.utils.logger import get_logger
+from src.utils.events import PipelineEvent
+from src.utils.stream_json import parse_json_object
 from langchain_core.messages import HumanMessage, SystemMessage
 from src.services.aws_service import AWSPollyService, AWSS3Service, AWSComprehendService, AWSDynamoDBService, EventBridgeService
 
 logger = get_logger(__name__)
 
+# Strong references to fire-and-forget tasks (S3 archive uploads) so they are not GC'd mid-flight
+_background_tasks = set()
+
+# Culture analysis depends only on (state, content), so repeat runs of the same copy
+# for the same state reuse it instead of paying for another LLM call.
+CULTURE_CACHE_TTL_SECONDS = float(os.getenv("CULTURE_CACHE_TTL_SECONDS", "3600"))
+CULTURE_CACHE_MAX_ENTRIES = 256
+_culture_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _culture_cache_key(state: str, content: str) -> Tuple[str, str]:
+    return state, hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _culture_cache_get(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    entry = _culture_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, data = entry
+    if time.monotonic() - stored_at > CULTURE_CACHE_TTL_SECONDS:
+        _culture_cache.pop(key, None)
+        return None
+    _culture_cache.move_to_end(key)
+    return data
+
+
+def _culture_cache_put(key: Tuple[str, str], data: Dict[str, Any]) -> None:
+    _culture_cache[key] = (time.monotonic(), data)
+    _culture_cache.move_to_end(key)
+    while len(_culture_cache) > CULTURE_CACHE_MAX_ENTRIES:
+        _culture_cache.popitem(last=False)
+
+
+
+def _spawn_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 STATE_LANGUAGE_MAP = {
     "Maharashtra": {"language": "Marathi", "dialect": "Puneri/Standard", "key_festivals": ["Ganesh Chaturthi", "Gudi Padwa"]},
     "Punjab": {"language": "Punjabi", "dialect": "Majhi", "key_festivals": ["Baisakhi", "Lohri"]},
@@ -37,9 +81,117 @@ class VernacularService:
         self.polly_service = AWSPollyService()
         self.s3_service = AWSS3Service()
 
-    async def transmute_content(self, content: str, state: str) -> Dict[str, Any]:
+    async def generate_audio_url(self, text: str, language: str) -> Optional[str]:
+        """
+        Returns an S3 URL for `text` spoken in `language`. Audio is keyed by
+        hash(voice, normalised text), so identical copy reuses the existing object;
+        otherwise edge-tts chunks are piped into S3 as they are synthesised.
+        """
+        spoken = self.polly_service.normalise_text(text)
+        if not spoken:
+            return None
+        key = self.s3_service.audio_cache_key(self.polly_service.voice_for(language), spoken)
+
+        cached_url = await self.s3_service.find_audio(key)
+        if cached_url:
+            logger.info(f"[TTS] Audio cache hit for {language} ({key})")
+            return cached_url
+
+        return await self.s3_service.upload_audio_stream(
+            self.polly_service.stream_speech(spoken, language), key
+        )
+
+    async def open_audio_stream(self, text: str, language: str) -> Tuple[Optional[AsyncIterator[bytes]], Optional[str]]:
+        """
+        Returns (mp3_chunks, archive_url) for direct playback. Cached audio is streamed
+        from S3; otherwise edge-tts chunks go to the caller as they are produced while
+        a background task writes the archive copy to S3 under the same content key.
+        Returns (None, None) when there is nothing to speak.
+        """
+        spoken = self.polly_service.normalise_text(text)
+        if not spoken:
+            return None, None
+        key = self.s3_service.audio_cache_key(self.polly_service.voice_for(language), spoken)
+        url = self.s3_service.public_url(key)
+
+        if await self.s3_service.find_audio(key):
+            logger.info(f"[TTS] Streaming cached {language} audio ({key})")
+            return self.s3_service.stream_object(key), url
+
+        return self._tee_to_s3(self.polly_service.stream_speech(spoken, language), key), url
+
+    async def _tee_to_s3(self, audio: AsyncIterator[bytes], key: str) -> AsyncIterator[bytes]:
+        """Yields `audio` unchanged while mirroring every chunk into a background S3 upload."""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def archive_chunks():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+
+        _spawn_background(self.s3_service.upload_audio_stream(archive_chunks(), key))
+
+        completed = False
+        try:
+            async for chunk in audio:
+                queue.put_nowait(chunk)
+                yield chunk
+            completed = True
+        finally:
+            # A partial clip must not land under the content key: abort the upload
+            queue.put_nowait(None if completed else RuntimeError("audio stream interrupted"))
+
+    @staticmethod
+    def _translation_prompt(content: str, language: str, dialect: str, region: str) -> str:
+        return f"""
+        ACT AS: Elite Regional Creative Director & Native {language} Speaker (Dialect: {dialect}).
+        TASK: Do not just literally translate. TRANSCREATE a high-converting, highly engaging localized marketing masterpiece based on the provided content.
+        
+        RULES:
+        1. Write entirely in native {language} script.
+        2. Inject natural {region} emotion, idioms, and flair. Make it sound like a street-smart local wrote it, not a robot.
+        3. Structure it as a highly engaging social media post (with a catchy hook, engaging body, and strong localized call-to-action).
+        4. Include 2-3 hyper-local emojis if appropriate.
+        
+        ORIGINAL CONTENT: {content}
+        
+        OUTPUT: Only output the final high-converting {language} copy. Nothing else.
+        """
+
+    @staticmethod
+    def _dialect_prompt(base_translation: str, language: str, dialect: str, state: str) -> str:
+        return f"""
+        ACT AS: Native {language} Speaker from {state} (Dialect: {dialect}).
+        TASK: Adjust the {language} marketing copy below for a {state} audience.
+        
+        RULES:
+        1. Keep the structure, hook, offer and call-to-action exactly as they are.
+        2. Only swap words, idioms and phrasing for natural {dialect} usage in {state}.
+        3. Stay in native {language} script.
+        
+        COPY: {base_translation}
+        
+        OUTPUT: Only output the adjusted {language} copy. Nothing else.
+        """
+
+    async def translate_base(self, content: str, language: str) -> str:
+        """One standard-dialect transcreation shared by every state that speaks `language`."""
+        res = await self.llm.ainvoke([
+            SystemMessage(content=self._translation_prompt(content, language, "Standard", f"{language}-speaking India")),
+            HumanMessage(content=content),
+        ])
+        return res.content.strip()
+
+    async def transmute_content(self, content: str, state: str, base_translation: Optional[str] = None) -> Dict[str, Any]:
         """
         Agentic workflow to culturally and linguistically pivot content.
+        With `base_translation` (a shared standard-dialect transcreation, see
+        transmute_states_stream) the translation stage only applies dialect
+        adjustments, and is skipped entirely for "Standard" dialect states.
         """
         config = STATE_LANGUAGE_MAP.get(state, {"language": "Hindi", "dialect": "Standard", "key_festivals": ["General Indian"]})
         language = config["language"]
@@ -72,70 +224,80 @@ class VernacularService:
         """
         
         # 2. Linguistic Pivot
-        translation_prompt = f"""
-        ACT AS: Elite Regional Creative Director & Native {language} Speaker (Dialect: {dialect}).
-        TASK: Do not just literally translate. TRANSCREATE a high-converting, highly engaging localized marketing masterpiece based on the provided content.
-        
-        RULES:
-        1. Write entirely in native {language} script.
-        2. Inject natural {state} emotion, idioms, and flair. Make it sound like a street-smart local wrote it, not a robot.
-        3. Structure it as a highly engaging social media post (with a catchy hook, engaging body, and strong localized call-to-action).
-        4. Include 2-3 hyper-local emojis if appropriate.
-        
-        ORIGINAL CONTENT: {content}
-        
-        OUTPUT: Only output the final high-converting {language} copy. Nothing else.
-        """
+        translation_prompt = self._translation_prompt(content, language, dialect, state)
 
-        try:
-            # Run LLM calls
-            culture_task = self.llm.ainvoke([SystemMessage(content=culture_prompt), HumanMessage(content="Give me the analysis.")])
-            translation_task = self.llm.ainvoke([SystemMessage(content=translation_prompt), HumanMessage(content=content)])
-            
-            culture_res, trans_res = await asyncio.gather(culture_task, translation_task)
-            
+        async def analyze_culture() -> Dict[str, Any]:
+            cache_key = _culture_cache_key(state, content)
+            cached = _culture_cache_get(cache_key)
+            if cached is not None:
+                logger.info(f"[Vernacular] Culture analysis cache hit for {state}")
+                return cached
+
+            culture_res = await self.llm.ainvoke([SystemMessage(content=culture_prompt), HumanMessage(content="Give me the analysis.")])
             # Extract JSON from culture response using robust regex
             try:
-                # Find JSON block using regex to avoid markdown/text wrappers
-                match = re.search(r'\{.*\}', culture_res.content, re.DOTALL)
-                if match:
-                    culture_data = json.loads(match.group(0))
-                else:
+                # Tolerates markdown/text wrappers and truncated output
+                culture_data = parse_json_object(culture_res.content)
+                if not culture_data:
                     raise ValueError("No valid JSON block found in response.")
             except Exception as e:
                 logger.error(f"JSON Parsing failed: {str(e)} - Raw LLM Output: {culture_res.content}")
-                culture_data = {
+                return {
                     "cultural_nuances": ["Emphasize local community values and deep-rooted traditions.", "Align messaging with regional pride."],
                     "local_slang_to_use": [f"Native {language} phrasing"],
                     "visual_direction": f"Vibrant, culturally resonant colors specific to {state}.",
                     "tone_strategy": "Authentic, connected, and highly local."
                 }
+            _culture_cache_put(cache_key, culture_data)
+            return culture_data
 
-            translated_content = trans_res.content.strip()
-
-            # -------------------------------------------------------------
-            # AWS Integration: Amazon Comprehend (Cultural Safety Shield)
-            # -------------------------------------------------------------
-            comprehend_service = AWSComprehendService()
-            # Analyze sentiment and calculate a simulated "Cultural Safety" score
-            # We pass the English cultural meaning / translated content to Comprehend
-            safety_analysis = await comprehend_service.analyze_compliance_sentiment(translated_content)
-            
-            # -------------------------------------------------------------
+        async def synthesize_audio(translated_content: str) -> Optional[str]:
             # AWS Integration: Generate Regional Audio Track (Polly -> S3)
-            # -------------------------------------------------------------
-            audio_url = None
             try:
-                # 1. Synthesize Speech with native language settings
-                audio_bytes = await self.polly_service.synthesize_speech(translated_content, language)
-                if audio_bytes:
-                    # 2. Upload to S3 immediately
-                    filename = f"darshan_{state.lower().replace(' ', '_')}"
-                    audio_url = await self.s3_service.upload_audio(audio_bytes, filename)
+                # Synthesize with native language settings, streaming straight into S3
+                return await self.generate_audio_url(translated_content, language)
             except Exception as aws_e:
                 logger.error(f"Failed in AWS Polly/S3 pipeline: {str(aws_e)}")
                 # We do not use a fallback url; let the UI handle the missing AWS keys.
-                audio_url = None
+                return None
+
+        timings: Dict[str, float] = {}
+
+        async def timed(stage: str, coro):
+            start = time.perf_counter()
+            try:
+                return await coro
+            finally:
+                timings[stage] = round((time.perf_counter() - start) * 1000, 1)
+
+        # Stage graph (Comprehend and TTS depend only on the translation):
+        #
+        #   culture ─────────────────────────────┐
+        #   translation ─┬─ comprehend ──────────┼─ result ─> dynamodb log (background)
+        #                └─ tts (Polly -> S3) ───┘
+        total_start = time.perf_counter()
+        culture_task = asyncio.create_task(timed("culture", analyze_culture()))
+        try:
+            if base_translation is None:
+                trans_res = await timed("translation", self.llm.ainvoke([SystemMessage(content=translation_prompt), HumanMessage(content=content)]))
+                translated_content = trans_res.content.strip()
+            elif dialect == "Standard":
+                translated_content = base_translation
+                timings["translation"] = 0.0
+            else:
+                dialect_prompt = self._dialect_prompt(base_translation, language, dialect, state)
+                trans_res = await timed("translation", self.llm.ainvoke([SystemMessage(content=dialect_prompt), HumanMessage(content=base_translation)]))
+                translated_content = trans_res.content.strip()
+
+            # AWS Integration: Amazon Comprehend (Cultural Safety Shield)
+            # Analyze sentiment and calculate a simulated "Cultural Safety" score
+            comprehend_service = AWSComprehendService()
+            safety_analysis, audio_url = await asyncio.gather(
+                timed("comprehend", comprehend_service.analyze_compliance_sentiment(translated_content)),
+                timed("tts", synthesize_audio(translated_content)),
+            )
+            culture_data = await culture_task
+            timings["total"] = round((time.perf_counter() - total_start) * 1000, 1)
 
             result = {
                 "original_content": content,
@@ -154,16 +316,12 @@ class VernacularService:
                 "audio_url": audio_url,
                 "comprehend_sentiment": safety_analysis.get("sentiment", "UNKNOWN"),
                 "comprehend_score": float(safety_analysis.get("compliance_score", 0.0)),
-                "comprehend_raw": safety_analysis.get("raw_scores", {})
+                "comprehend_raw": safety_analysis.get("raw_scores", {}),
+                "stage_timings": timings,
             }
 
-            # ---------------------------------------------------------------
-            # AWS Integration: Log to DynamoDB (Campaign History Vault)
-            # ---------------------------------------------------------------
-            try:
-                await self.dynamodb_service.log_transmutation(result)
-            except Exception as db_e:
-                logger.error(f"DynamoDB log failed (non-blocking): {str(db_e)}")
+            # AWS Integration: Log to DynamoDB (Campaign History Vault) without blocking the response
+            _spawn_background(self.dynamodb_service.log_transmutation(result))
 
             return result
 
@@ -173,3 +331,61 @@ class VernacularService:
                 "error": f"Failed to transmute: {str(e)}",
                 "original_content": content
             }
+        finally:
+            if not culture_task.done():
+                culture_task.cancel()
+
+    async def transmute_states_stream(self, content: str, states: List[str], max_concurrency: int = 4) -> AsyncIterator[PipelineEvent]:
+        """
+        Streaming fan-out of one piece of content to many states.
+        States that share a language share one standard-dialect transcreation
+        (translate_base) and only get dialect adjustments on top; all LLM,
+        Comprehend and TTS work runs with at most `max_concurrency` states in flight.
+        Events: plan -> translation (per shared language) -> state_result / state_error -> complete
+        """
+        groups: Dict[str, List[str]] = {}
+        for state in states:
+            groups.setdefault(STATE_LANGUAGE_MAP[state]["language"], []).append(state)
+
+        start = time.perf_counter()
+        yield PipelineEvent("plan", {"languages": groups, "states": len(states)})
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run_state(state: str, base_translation: Optional[str]):
+            async with semaphore:
+                result = await self.transmute_content(content, state, base_translation=base_translation)
+            if "error" in result:
+                await queue.put(PipelineEvent("state_error", {"state": state, "error": result["error"]}))
+            else:
+                await queue.put(PipelineEvent("state_result", result))
+
+        async def run_group(language: str, group_states: List[str]):
+            base_translation = None
+            if len(group_states) > 1:
+                try:
+                    async with semaphore:
+                        base_translation = await self.translate_base(content, language)
+                    await queue.put(PipelineEvent("translation", {"language": language, "states": group_states}))
+                except Exception as e:
+                    # Fall back to independent transcreation per state
+                    logger.error(f"[Vernacular] Shared {language} translation failed: {str(e)}")
+            await asyncio.gather(*(run_state(state, base_translation) for state in group_states))
+
+        tasks = [asyncio.create_task(run_group(language, group_states)) for language, group_states in groups.items()]
+        done = asyncio.gather(*tasks)
+        done.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            yield PipelineEvent("complete", {
+                "states": len(states),
+                "total_ms": round((time.perf_counter() - start) * 1000, 1),
+            })
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,185 @@
+"""
+Newest-first history queries for DynamoDB tables.
+
+History tables carry a constant ``record_type`` attribute and a time-sorted
+GSI keyed on (record_type, <time attribute>). Listing endpoints query that
+index with ScanIndexForward=False instead of scanning the whole table, so the
+newest items come back first and read cost no longer grows with table size.
+Pagination cursors are opaque base64 strings wrapping LastEvaluatedKey.
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+TIME_INDEX_NAME = "record_type-time-index"
+RECORD_TYPE_ATTR = "record_type"
+
+# Fallback scans (index missing or still backfilling) stop after this many items.
+MAX_FALLBACK_SCAN_ITEMS = 2000
+
+
+def encode_cursor(last_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Wrap a LastEvaluatedKey (or fallback offset) into an opaque cursor."""
+    if not last_key:
+        return None
+    raw = json.dumps(last_key, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid pagination cursor")
+    return data
+
+
+def time_index_schema(time_attr: str) -> Dict[str, Any]:
+    """
+    Extra create_table kwargs for a table that should be listable newest-first.
+    Merge into the table's own AttributeDefinitions.
+    """
+    return {
+        "AttributeDefinitions": [
+            {"AttributeName": RECORD_TYPE_ATTR, "AttributeType": "S"},
+            {"AttributeName": time_attr, "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [{
+            "IndexName": TIME_INDEX_NAME,
+            "KeySchema": [
+                {"AttributeName": RECORD_TYPE_ATTR, "KeyType": "HASH"},
+                {"AttributeName": time_attr, "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        }],
+    }
+
+
+def ensure_time_index(table, time_attr: str) -> bool:
+    """
+    Adds the time-sorted GSI to an existing table if it is missing.
+    Returns True if the index already exists (it may still be backfilling if
+    we just requested it — query_newest_first falls back to a scan meanwhile).
+    """
+    try:
+        indexes = table.global_secondary_indexes or []
+        if any(i.get("IndexName") == TIME_INDEX_NAME for i in indexes):
+            return True
+
+        index = time_index_schema(time_attr)["GlobalSecondaryIndexes"][0]
+        billing = (table.billing_mode_summary or {}).get("BillingMode", "PROVISIONED")
+        if billing != "PAY_PER_REQUEST":
+            throughput = table.provisioned_throughput or {}
+            index["ProvisionedThroughput"] = {
+                "ReadCapacityUnits": throughput.get("ReadCapacityUnits", 5),
+                "WriteCapacityUnits": throughput.get("WriteCapacityUnits", 5),
+            }
+
+        table.meta.client.update_table(
+            TableName=table.name,
+            AttributeDefinitions=time_index_schema(time_attr)["AttributeDefinitions"],
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        logger.info(f"[DynamoDB] Creating {TIME_INDEX_NAME} on {table.name}")
+    except ClientError as e:
+        # LimitExceeded / ResourceInUse: another worker is already adding it
+        logger.warning(f"[DynamoDB] Could not ensure {TIME_INDEX_NAME} on {table.name}: {e}")
+    except Exception as e:
+        logger.warning(f"[DynamoDB] Time index check failed for {table.name}: {e}")
+    return False
+
+
+def _projection_kwargs(projection: Optional[List[str]]) -> Dict[str, Any]:
+    """Builds ProjectionExpression with placeholders (timestamp/status/name are reserved words)."""
+    if not projection:
+        return {}
+    names: Dict[str, str] = {}
+    paths = []
+    for path in projection:
+        parts = []
+        for part in path.split("."):
+            placeholder = f"#p{len(names)}"
+            names[placeholder] = part
+            parts.append(placeholder)
+        paths.append(".".join(parts))
+    return {"ProjectionExpression": ", ".join(paths), "ExpressionAttributeNames": names}
+
+
+def query_newest_first(
+    table,
+    record_type: str,
+    time_attr: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    projection: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns (items, next_cursor) for one page of `record_type` items, newest first.
+    Raises ValueError for a malformed cursor.
+    """
+    start_key = decode_cursor(cursor)
+    if start_key and "__offset" in start_key:
+        return _scan_newest_first(table, time_attr, limit, int(start_key["__offset"]), projection)
+
+    kwargs: Dict[str, Any] = {
+        "IndexName": TIME_INDEX_NAME,
+        "KeyConditionExpression": Key(RECORD_TYPE_ATTR).eq(record_type),
+        "ScanIndexForward": False,
+        "Limit": limit,
+        **_projection_kwargs(projection),
+    }
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+
+    try:
+        response = table.query(**kwargs)
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ValidationException":
+            raise
+        # Index not created yet, or still backfilling
+        logger.warning(f"[DynamoDB] {TIME_INDEX_NAME} unavailable on {table.name} ({e}). Falling back to scan.")
+        return _scan_newest_first(table, time_attr, limit, 0, projection)
+
+    return response.get("Items", []), encode_cursor(response.get("LastEvaluatedKey"))
+
+
+def _scan_newest_first(
+    table,
+    time_attr: str,
+    limit: int,
+    offset: int,
+    projection: Optional[List[str]],
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Bounded paginated scan + sort, used only until the time index is ready."""
+    fields = list(projection or [])
+    if fields and time_attr not in fields:
+        fields.append(time_attr)
+    kwargs = _projection_kwargs(fields)
+
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = table.scan(**kwargs)
+        items.extend(response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key or len(items) >= MAX_FALLBACK_SCAN_ITEMS:
+            break
+        kwargs["ExclusiveStartKey"] = last_key
+
+    items.sort(key=lambda x: x.get(time_attr, ""), reverse=True)
+    page = items[offset:offset + limit]
+    next_offset = offset + limit
+    next_cursor = encode_cursor({"__offset": next_offset}) if next_offset < len(items) else None
+    return page, next_cursor
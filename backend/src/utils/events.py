@@ -0,0 +1,151 @@
+"""
+Typed events yielded by streaming pipelines.
+
+Pipelines (forge, focus group, autopilot, transmute matrix, scout, campaign
+intelligence, vernacular fan-out) yield PipelineEvent objects rather than
+pre-encoded `data: {...}` strings. Serialisation happens once, at the edge:
+SSE and NDJSON adapters in src/utils/sse.py for streaming endpoints, and
+`first_event` for blocking endpoints that only need the final result — they
+read the object directly and stop the pipeline as soon as it arrives, with
+no encode-then-`json.loads` round trip.
+
+Token chunks are ChunkEvents; `coalesce_chunks` merges consecutive chunks
+with the same metadata so clients get one frame per ~50ms instead of one
+per token, flushing on a timer when the producer stalls mid-run.
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Token coalescing: flush buffered chunks after 50ms or 1k characters
+COALESCE_INTERVAL = 0.05
+COALESCE_CHARS = 1024
+
+
+@dataclass
+class PipelineEvent:
+    name: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    # Set by the stream job that buffers the event (`<job_id>:<seq>`)
+    id: Optional[str] = None
+    _encoded: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def payload(self) -> Dict[str, Any]:
+        return self.data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": self.name, "data": self.payload()}
+
+    def to_json(self) -> str:
+        """JSON body `{"event": ..., "data": ...}`, encoded once and shared by every subscriber."""
+        if self._encoded is None:
+            self._encoded = json.dumps(self.to_dict(), ensure_ascii=False)
+        return self._encoded
+
+
+@dataclass
+class ChunkEvent(PipelineEvent):
+    """A streamed piece of LLM output. `text` is sent in `data[key]`."""
+    text: str = ""
+    key: str = "chunk"
+
+    def payload(self) -> Dict[str, Any]:
+        return {**self.data, self.key: self.text}
+
+
+async def aclose(events: AsyncIterator[Any]) -> None:
+    """Closes an async generator (no-op for other iterators), running its finally blocks."""
+    close = getattr(events, "aclose", None)
+    if close is not None:
+        await close()
+
+
+def _merge(chunks: List[ChunkEvent]) -> ChunkEvent:
+    first = chunks[0]
+    if len(chunks) == 1:
+        return first
+    return ChunkEvent(first.name, first.data, text="".join(c.text for c in chunks), key=first.key)
+
+
+async def coalesce_chunks(
+    events: AsyncIterator[PipelineEvent],
+    interval: float = COALESCE_INTERVAL,
+    max_chars: int = COALESCE_CHARS,
+) -> AsyncIterator[PipelineEvent]:
+    """
+    Merges runs of ChunkEvents with the same name/data/key. A run is emitted
+    once it spans `interval` seconds (even if the producer goes quiet) or
+    `max_chars` characters, or when any other event arrives; event order is
+    preserved.
+    """
+    iterator = events.__aiter__()
+    # The producer's next event, kept across a timed-out wait so nothing is lost
+    upcoming: Optional[asyncio.Future] = None
+    pending: List[ChunkEvent] = []
+    size = 0
+    since = 0.0
+    try:
+        while True:
+            if upcoming is None and not pending:
+                try:
+                    event = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+            else:
+                if upcoming is None:
+                    upcoming = asyncio.ensure_future(iterator.__anext__())
+                timeout = max(0.0, interval - (time.monotonic() - since)) if pending else None
+                done, _ = await asyncio.wait({upcoming}, timeout=timeout)
+                if not done:
+                    yield _merge(pending)
+                    pending, size = [], 0
+                    continue
+                finished, upcoming = upcoming, None
+                try:
+                    event = finished.result()
+                except StopAsyncIteration:
+                    break
+
+            if isinstance(event, ChunkEvent):
+                if pending and (
+                    event.name != pending[0].name
+                    or event.data != pending[0].data
+                    or event.key != pending[0].key
+                ):
+                    yield _merge(pending)
+                    pending, size = [], 0
+                if not pending:
+                    since = time.monotonic()
+                pending.append(event)
+                size += len(event.text)
+                if size >= max_chars or time.monotonic() - since >= interval:
+                    yield _merge(pending)
+                    pending, size = [], 0
+                continue
+            if pending:
+                yield _merge(pending)
+                pending, size = [], 0
+            yield event
+        if pending:
+            yield _merge(pending)
+    finally:
+        try:
+            if upcoming is not None and not upcoming.done():
+                # The producer can't be closed while its __anext__ is running
+                upcoming.cancel()
+                await asyncio.wait({upcoming})
+        finally:
+            await aclose(events)
+
+
+async def first_event(events: AsyncIterator[PipelineEvent], name: str) -> Optional[PipelineEvent]:
+    """Consumes `events` until one called `name` arrives, then closes the pipeline."""
+    try:
+        async for event in events:
+            if event.name == name:
+                return event
+        return None
+    finally:
+        await aclose(events)
@@ -0,0 +1,63 @@
+"""
+Counting semaphore shared by every worker process on the host.
+
+An asyncio.Semaphore only bounds one uvicorn worker; with `--workers 4` a
+limit of 3 becomes 12 concurrent calls. HostSlots backs the count with
+`slots` lock files: holding an exclusive flock on one of them is holding one
+slot, and the kernel releases it if the worker dies. Acquisition is
+non-blocking and polled, so the event loop never blocks on the lock.
+
+On platforms without fcntl (Windows dev machines) or with slots <= 0 it is a
+no-op and the per-process semaphore is the only bound.
+"""
+import asyncio
+import contextlib
+import os
+import random
+import tempfile
+from typing import AsyncIterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class HostSlots:
+    def __init__(self, name: str, slots: int, directory: Optional[str] = None, poll_seconds: float = 0.2):
+        self.name = name
+        self.slots = slots
+        self.directory = directory or tempfile.gettempdir()
+        self.poll_seconds = poll_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return fcntl is not None and self.slots > 0
+
+    def _try_acquire(self) -> Optional[int]:
+        # Random start spreads workers across the lock files
+        offset = random.randrange(self.slots)
+        for i in range(self.slots):
+            path = os.path.join(self.directory, f"{self.name}-{(offset + i) % self.slots}.lock")
+            fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if not self.enabled:
+            yield
+            return
+        fd = self._try_acquire()
+        while fd is None:
+            await asyncio.sleep(self.poll_seconds)
+            fd = self._try_acquire()
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
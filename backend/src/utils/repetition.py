@@ -0,0 +1,98 @@
+"""
+Incremental detection of degenerate generation loops.
+
+Models (especially on Indic-language output) sometimes fall into a loop and
+repeat the same phrase until max_tokens. RepetitionDetector is fed streamed
+text chunk by chunk and flags a loop as soon as the tail of the output is a
+tandem repeat: the same block, back to back, several times over.
+
+It keeps a rolling (Rabin-Karp) hash of the last `ngram` characters and the
+last position each hash was seen. When consecutive positions keep matching
+at the same distance p, the text is periodic with period p; once that
+periodic run covers `min_repeats` periods and at least `min_chars`
+characters, the output is looping. Working on characters rather than words
+makes it script-agnostic (no tokenizer, works without spaces), and
+structured output with repeated keys but varying values does not trigger it.
+Cost is O(1) per character.
+"""
+from typing import Dict, List, Optional
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+class RepetitionDetector:
+    def __init__(
+        self,
+        ngram: int = 16,
+        max_period: int = 400,
+        min_repeats: int = 3,
+        min_chars: int = 120,
+    ):
+        self.ngram = ngram
+        self.max_period = max_period
+        self.min_repeats = min_repeats
+        self.min_chars = min_chars
+
+        self._chars: List[int] = []
+        self._hash = 0
+        self._drop = pow(_BASE, ngram - 1, _MOD)  # weight of the char leaving the window
+        self._last_seen: Dict[int, int] = {}
+        self._period = 0
+        self._run = 0
+        self.detected = False
+        self.period: Optional[int] = None
+
+    @property
+    def length(self) -> int:
+        return len(self._chars)
+
+    def feed(self, text: str) -> bool:
+        """Consumes the next chunk of output. Returns True once a loop has been detected."""
+        if self.detected:
+            return True
+        n = self.ngram
+        for ch in text:
+            code = ord(ch)
+            self._chars.append(code)
+            i = len(self._chars) - 1
+            if i >= n:
+                self._hash = (self._hash - self._chars[i - n] * self._drop) % _MOD
+            self._hash = (self._hash * _BASE + code) % _MOD
+            if i < n - 1:
+                continue
+
+            prev = self._last_seen.get(self._hash)
+            self._last_seen[self._hash] = i
+            p = i - prev if prev is not None else 0
+            if 0 < p <= self.max_period:
+                if p == self._period:
+                    self._run += 1
+                else:
+                    self._period, self._run = p, 1
+            else:
+                self._period, self._run = 0, 0
+                continue
+
+            # _run consecutive n-grams equal their counterpart p chars back:
+            # the last (_run + n - 1 + p) chars are periodic with period p.
+            covered = self._run + n - 1 + p
+            if covered >= self.min_chars and covered >= p * self.min_repeats:
+                self.detected = True
+                self.period = p
+                return True
+        return False
+
+
+def detect_repetition(text: str, **kwargs) -> bool:
+    """One-shot check of a complete text."""
+    return RepetitionDetector(**kwargs).feed(text)
+
+
+class RepetitionLoopError(RuntimeError):
+    """Raised when generation was aborted because the output started looping."""
+
+    def __init__(self, partial_output: str, period: Optional[int]):
+        super().__init__(f"Generation aborted: output repeating with period {period} chars")
+        self.partial_output = partial_output
+        self.period = period
@@ -0,0 +1,210 @@
+"""
+Edge serialisation for streaming pipelines.
+
+Pipelines yield typed events (src/utils/events.py); this module turns them
+into bytes on the wire, and is the only place that does:
+
+  sse_stream     — Server-Sent Events. Runs the pipeline in its own task,
+                   writes every frame that is already queued as a single body
+                   chunk (one send per batch instead of one per frame), and
+                   emits a `: keep-alive` comment whenever the pipeline has
+                   been silent for `heartbeat` seconds so proxies and load
+                   balancers don't drop the connection during long LLM / AWS
+                   stages. Given the request, a watcher task waits on the ASGI
+                   receive channel for `http.disconnect` and cancels the
+                   pipeline task the moment the client goes away — including
+                   whatever LLM or Tavily call it is awaiting, not just at the
+                   next chunk.
+  ndjson_stream  — the same transport as one JSON object per line, for
+                   clients that send `Accept: application/x-ndjson`.
+
+stream_response picks between them; token chunks are coalesced first unless
+the caller already did (stream jobs coalesce before buffering).
+
+Comment lines and `id:` lines are ignored by both EventSource and the
+frontend's fetch readers (which only look at `data: ` lines).
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Callable, List, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from src.utils.events import PipelineEvent, coalesce_chunks, aclose
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive",
+}
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+KEEPALIVE = ": keep-alive\n\n"
+HEARTBEAT_SECONDS = 15.0
+
+# Upper bound for one batched body write
+BATCH_CHARS = 16384
+
+# Events buffered between the pipeline task and the socket
+QUEUE_SIZE = 256
+
+_END = object()
+
+
+def format_sse(event: PipelineEvent) -> str:
+    """One SSE frame; `id:` line included when the event carries an id."""
+    if event.id is None:
+        return f"data: {event.to_json()}\n\n"
+    return f"id: {event.id}\ndata: {event.to_json()}\n\n"
+
+
+def format_ndjson(event: PipelineEvent) -> str:
+    if event.id is None:
+        return event.to_json() + "\n"
+    return json.dumps({"id": event.id, **event.to_dict()}, ensure_ascii=False) + "\n"
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """
+    Returns once the client has disconnected. Reads the ASGI receive channel
+    directly, so it must be the only reader once the body has been consumed.
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _transport(
+    events: AsyncIterator[PipelineEvent],
+    encode: Callable[[PipelineEvent], str],
+    label: str,
+    request: Optional[Request],
+    keepalive: str,
+    heartbeat: float = HEARTBEAT_SECONDS,
+    max_batch: int = BATCH_CHARS,
+) -> AsyncIterator[str]:
+    """
+    Runs `events` in its own task and writes their encodings: queued events
+    are batched into one write, `keepalive` is sent during silence. The
+    pipeline is cancelled (and the generator closed) when the client
+    disconnects or the response ends for any other reason.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    async def pump():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[{label}] Stream producer failed: {e}", exc_info=True)
+        finally:
+            await aclose(events)
+        await queue.put(_END)
+
+    producer = asyncio.create_task(pump())
+    watcher = asyncio.create_task(wait_for_disconnect(request)) if request is not None else None
+    getter: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(queue.get())
+            waiters = {getter} if watcher is None else {getter, watcher}
+            done, _ = await asyncio.wait(waiters, timeout=heartbeat, return_when=asyncio.FIRST_COMPLETED)
+            if watcher is not None and watcher in done:
+                if watcher.exception() is None:
+                    logger.info(f"[{label}] Client disconnected — cancelling stream.")
+                    return
+                logger.warning(f"[{label}] Disconnect watcher failed: {watcher.exception()}")
+                watcher = None
+            if getter not in done:
+                if not done:
+                    yield keepalive
+                continue
+            item = getter.result()
+            getter = None
+
+            batch: List[str] = []
+            size = 0
+            while item is not _END:
+                frame = encode(item)
+                batch.append(frame)
+                size += len(frame)
+                if size >= max_batch or queue.empty():
+                    break
+                item = queue.get_nowait()
+            if batch:
+                yield "".join(batch)
+            if item is _END:
+                return
+    finally:
+        for task in (getter, watcher, producer):
+            if task is not None:
+                task.cancel()
+
+
+def sse_stream(
+    events: AsyncIterator[PipelineEvent],
+    label: str = "SSE",
+    request: Optional[Request] = None,
+) -> AsyncIterator[str]:
+    return _transport(events, format_sse, label, request, KEEPALIVE)
+
+
+def ndjson_stream(
+    events: AsyncIterator[PipelineEvent],
+    label: str = "NDJSON",
+    request: Optional[Request] = None,
+) -> AsyncIterator[str]:
+    # A blank line is skipped by NDJSON readers, so it doubles as a keep-alive
+    return _transport(events, format_ndjson, label, request, "\n")
+
+
+def sse_response(
+    events: AsyncIterator[PipelineEvent],
+    label: str = "SSE",
+    request: Optional[Request] = None,
+) -> StreamingResponse:
+    """StreamingResponse with the standard SSE headers. Pass the request to cancel on disconnect."""
+    return StreamingResponse(
+        sse_stream(events, label, request),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+def ndjson_response(
+    events: AsyncIterator[PipelineEvent],
+    label: str = "NDJSON",
+    request: Optional[Request] = None,
+) -> StreamingResponse:
+    return StreamingResponse(
+        ndjson_stream(events, label, request),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+    )
+
+
+def stream_response(
+    request: Request,
+    events: AsyncIterator[PipelineEvent],
+    label: str,
+    coalesce: bool = True,
+) -> StreamingResponse:
+    """
+    Serialises a pipeline's events for the client: NDJSON when the request
+    asks for it, SSE otherwise. Token chunks are coalesced unless `coalesce`
+    is False (the caller already did it).
+    """
+    if coalesce:
+        events = coalesce_chunks(events)
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return ndjson_response(events, label, request)
+    return sse_response(events, label, request)
@@ -0,0 +1,223 @@
+"""
+Tolerant, incremental JSON parsing for structured LLM output.
+
+Agents are asked for "ONLY valid JSON" but models wrap it in markdown fences,
+prefix prose, leave trailing commas or get cut off at max_tokens. Parsing used
+to wait for the full response and then run `re.search(r'\\{.*\\}')` +
+`json.loads`, which fails on every one of those.
+
+StreamingJSONParser is fed text as it streams (e.g. from `llm.astream`) and
+returns each top-level field of the first JSON object as soon as that field's
+value closes, so SSE endpoints can forward `local_vibe` long before
+`viral_hooks` has finished generating. `result()` returns the whole object,
+repairing a truncated tail (unterminated string, missing closers, dangling
+key) and trailing commas.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drops commas directly followed by } or ] (outside strings)."""
+    out: List[str] = []
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == ",":
+            j = i + 1
+            while j < len(text) and text[j].isspace():
+                j += 1
+            if j < len(text) and text[j] in "}]":
+                continue
+        out.append(ch)
+    return "".join(out)
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(_strip_trailing_commas(text))
+
+
+def repair_truncated(text: str) -> Optional[Any]:
+    """
+    Best-effort completion of a JSON document that was cut off mid-way.
+    First tries closing it where it stopped (keeps a partial final string);
+    failing that, drops everything after the last complete element.
+    """
+    stack: List[str] = []
+    in_string = escape = False
+    last_comma: Optional[Tuple[int, List[str]]] = None
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            last_comma = (i, list(stack))
+
+    candidates = []
+    tail = text[:-1] if escape else text
+    candidates.append(tail + ('"' if in_string else "") + "".join(_CLOSERS[b] for b in reversed(stack)))
+    if last_comma is not None:
+        pos, comma_stack = last_comma
+        candidates.append(text[:pos] + "".join(_CLOSERS[b] for b in reversed(comma_stack)))
+
+    for candidate in candidates:
+        try:
+            return _loads(candidate)
+        except (json.JSONDecodeError, ValueError):
+            continue
+    return None
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for the first JSON object in a text stream.
+
+        parser = StreamingJSONParser()
+        async for chunk in llm.astream(prompt):
+            for key, value in parser.feed(chunk.content):
+                ...  # a top-level field just closed
+        data = parser.result()
+    """
+
+    def __init__(self):
+        self._buf: List[str] = []
+        self._started = False
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Top-level object state: expecting "key" -> "colon" -> "value"
+        self._state = "key"
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start: Optional[int] = None
+        self.fields: Dict[str, Any] = {}
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buf)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consumes more output; returns top-level (key, value) pairs completed by it."""
+        completed: List[Tuple[str, Any]] = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._started:
+                # Skips markdown fences / preamble prose before the object
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._buf.append(ch)
+                continue
+
+            self._buf.append(ch)
+            pos = len(self._buf) - 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        try:
+                            self._key = json.loads("".join(self._buf[self._key_start:pos + 1]))
+                        except json.JSONDecodeError:
+                            self._key = None
+                        self._state = "colon"
+                continue
+
+            if ch.isspace():
+                continue
+            top = self._depth == 1
+            if ch == '"':
+                self._in_string = True
+                if top and self._state == "key":
+                    self._key_start = pos
+                elif top and self._state == "value" and self._value_start is None:
+                    self._value_start = pos
+            elif ch == ":" and top and self._state == "colon":
+                self._state = "value"
+                self._value_start = None
+            elif ch in "{[":
+                if top and self._state == "value" and self._value_start is None:
+                    self._value_start = pos
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_field(pos, completed)
+                    self.done = True
+            elif ch == "," and top:
+                self._close_field(pos, completed)
+                self._state = "key"
+            elif top and self._state == "value" and self._value_start is None:
+                self._value_start = pos  # number / true / false / null
+        return completed
+
+    def _close_field(self, end: int, completed: List[Tuple[str, Any]]):
+        if self._key is not None and self._value_start is not None:
+            raw = "".join(self._buf[self._value_start:end]).strip()
+            try:
+                value = _loads(raw)
+            except (json.JSONDecodeError, ValueError):
+                value = repair_truncated(raw)
+            if value is not None:
+                self.fields[self._key] = value
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The parsed object (repaired if the stream was truncated), or None if none was found."""
+        if not self._started:
+            return None
+        text = self.text
+        data: Any = None
+        if self.done:
+            try:
+                data = _loads(text)
+            except (json.JSONDecodeError, ValueError):
+                data = None
+        else:
+            data = repair_truncated(text)
+        if isinstance(data, dict):
+            # Fields that parsed individually survive a broken sibling
+            return {**self.fields, **data}
+        return dict(self.fields) if self.fields else None
+
+
+def parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """One-shot tolerant parse of the first JSON object in `text` (fences, prose, truncation)."""
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    return parser.result()
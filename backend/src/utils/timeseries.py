@@ -0,0 +1,158 @@
+"""
+Columnar time-series rollups on NumPy arrays.
+
+Each metric keeps, per resolution (hour, day), a 2D array of sums and one of
+counts: one row per label (e.g. platform), one column per time bucket.
+Samples are added into their bucket as they arrive (a negative weight takes
+one back out), so queries never touch raw samples: a trend is a slice of
+columns summed over rows. A year of hourly buckets is ~8.8k columns, so
+queries stay well under a millisecond.
+
+The columns are a fixed-size ring covering a retention window around now
+(`past_days` back, `future_days` ahead): timestamps come from clients, so the
+arrays must not grow with whatever date a sample carries. Samples outside the
+window are left out of the rollups; a column is cleared when the window moves
+on and a newer bucket takes it over. Per-label totals (`totals`) are kept
+separately for all time, one number per label.
+
+The number of labels is capped at `max_labels`; later labels share OTHER_LABEL.
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+RESOLUTIONS = {"hour": 3600, "day": 86400}
+OTHER_LABEL = "Other"
+
+
+class RollupSeries:
+    """Sums and counts per (row, bucket) for one metric at one resolution, over a ring of buckets."""
+
+    def __init__(self, bucket_seconds: int, past_buckets: int, future_buckets: int, rows: int = 4):
+        self.bucket_seconds = bucket_seconds
+        self.past_buckets = past_buckets
+        self.future_buckets = future_buckets
+        capacity = past_buckets + future_buckets + 1
+        self.sums = np.zeros((rows, capacity), dtype=np.float64)
+        self.counts = np.zeros((rows, capacity), dtype=np.int64)
+        # Bucket number (epoch // bucket_seconds) each column currently holds; -1 = empty
+        self.buckets = np.full(capacity, -1, dtype=np.int64)
+
+    def _grow_rows(self, rows: int):
+        extra = rows - self.sums.shape[0]
+        self.sums = np.pad(self.sums, ((0, extra), (0, 0)))
+        self.counts = np.pad(self.counts, ((0, extra), (0, 0)))
+
+    def add(self, row: int, timestamp: float, value: float, weight: int = 1, now: Optional[float] = None):
+        """Adds a sample; ignored if its bucket is outside the window around `now`."""
+        bucket = int(timestamp // self.bucket_seconds)
+        current = int((time.time() if now is None else now) // self.bucket_seconds)
+        if not current - self.past_buckets <= bucket <= current + self.future_buckets:
+            return
+        col = bucket % len(self.buckets)
+        held = self.buckets[col]
+        if held != bucket:
+            # A removal of a sample that expired (or was never added) has nothing to undo
+            if weight < 0 or held > bucket:
+                return
+            self.sums[:, col] = 0
+            self.counts[:, col] = 0
+            self.buckets[col] = bucket
+        if row >= self.sums.shape[0]:
+            self._grow_rows(max(row + 1, self.sums.shape[0] * 2))
+        self.sums[row, col] += value * weight
+        self.counts[row, col] += weight
+
+    def window(self, start_bucket: int, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(sums, counts) of shape (rows, buckets) from `start_bucket`; zeros outside the data."""
+        wanted = start_bucket + np.arange(buckets)
+        cols = wanted % len(self.buckets)
+        held = self.buckets[cols] == wanted
+        return self.sums[:, cols] * held, self.counts[:, cols] * held
+
+
+class TimeSeriesStore:
+    """Named metrics, each rolled up per label at every resolution in RESOLUTIONS."""
+
+    def __init__(self, past_days: int = 366, future_days: int = 90, max_labels: int = 32):
+        self.past_days = past_days
+        self.future_days = future_days
+        self.max_labels = max_labels
+        self._labels: Dict[str, int] = {}
+        self._metrics: Dict[str, Dict[str, RollupSeries]] = {}
+        # metric -> (sums, counts) per row over all time
+        self._totals: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _row(self, label: str) -> int:
+        row = self._labels.get(label)
+        if row is None:
+            if len(self._labels) >= self.max_labels - 1 and label != OTHER_LABEL:
+                return self._row(OTHER_LABEL)
+            row = self._labels[label] = len(self._labels)
+        return row
+
+    def _series(self, metric: str) -> Dict[str, RollupSeries]:
+        series = self._metrics.get(metric)
+        if series is None:
+            series = self._metrics[metric] = {
+                name: RollupSeries(
+                    seconds,
+                    past_buckets=self.past_days * 86400 // seconds,
+                    future_buckets=self.future_days * 86400 // seconds,
+                )
+                for name, seconds in RESOLUTIONS.items()
+            }
+        return series
+
+    def add(self, metric: str, timestamp: float, value: float, label: str = "", weight: int = 1):
+        """Adds a sample (weight=-1 removes one added earlier)."""
+        now = time.time()
+        with self._lock:
+            row = self._row(label)
+            for rollup in self._series(metric).values():
+                rollup.add(row, timestamp, value, weight, now)
+
+            sums, counts = self._totals.get(metric) or (np.zeros(0), np.zeros(0, dtype=np.int64))
+            if row >= len(sums):
+                sums = np.pad(sums, (0, self.max_labels - len(sums)))
+                counts = np.pad(counts, (0, self.max_labels - len(counts)))
+                self._totals[metric] = (sums, counts)
+            sums[row] += value * weight
+            counts[row] += weight
+
+    def trend(
+        self, metrics: Iterable[str], resolution: str, buckets: int, end: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bucket start times, sums and counts for the `buckets` buckets ending
+        with the one containing `end`, summed over labels and `metrics`.
+        """
+        seconds = RESOLUTIONS[resolution]
+        start_bucket = int(end // seconds) - buckets + 1
+        sums = np.zeros(buckets, dtype=np.float64)
+        counts = np.zeros(buckets, dtype=np.int64)
+        with self._lock:
+            for metric in metrics:
+                series = self._metrics.get(metric)
+                if series is None:
+                    continue
+                s, c = series[resolution].window(start_bucket, buckets)
+                sums += s.sum(axis=0)
+                counts += c.sum(axis=0)
+        starts = (start_bucket + np.arange(buckets)) * seconds
+        return starts, sums, counts
+
+    def totals(self, metric: str) -> List[Tuple[str, float, int]]:
+        """(label, sum, count) over all time for each label with samples."""
+        with self._lock:
+            if metric not in self._totals:
+                return []
+            sums, counts = self._totals[metric]
+            return [
+                (label, float(sums[row]), int(counts[row]))
+                for label, row in self._labels.items()
+                if row < len(counts) and counts[row] > 0
+            ]
@@ -24,7 +24,6 @@ import {
 import { toast } from "sonner";
 
 import { AssetNode } from './nodes/AssetNode';
-import { useQuery } from '@tanstack/react-query';
 import { useBrandStore } from '@/stores/brand-store';
 import { Badge } from '@/components/ui/badge';
 
@@ -86,6 +85,31 @@ const AutoFitView = ({ nodeCount, isComplete }: { nodeCount: number; isComplete:
 
 const API_URL = `${API_BASE_URL}/api/v1/genesis`; // Hardcoded for hackathon speed
 
+/** Applies one diff from the graph stream (see GenesisGraph.diff_since on the backend) */
+const applyGraphDiff = (graph: any, diff: any): any => {
+    const nodes = graph.nodes.map((n: any) =>
+        diff.node_data?.[n.id] ? { ...n, data: { ...n.data, ...diff.node_data[n.id] } } : n
+    );
+    let progress = graph.progress;
+    if (diff.progress?.assets) {
+        progress = diff.progress; // new run: full progress object
+    } else if (diff.progress || diff.assets) {
+        progress = {
+            ...progress,
+            ...diff.progress,
+            assets: { ...progress?.assets, ...diff.assets }
+        };
+    }
+    return {
+        ...graph,
+        version: diff.version,
+        status: diff.status ?? graph.status,
+        nodes: diff.nodes ? [...nodes, ...diff.nodes] : nodes,
+        edges: diff.edges ? [...graph.edges, ...diff.edges] : graph.edges,
+        progress
+    };
+};
+
 interface GenesisCanvasProps {
     initialInput?: string;
     autoStart?: boolean;
@@ -115,19 +139,21 @@ export const GenesisCanvas = ({ initialInput, autoStart }: GenesisCanvasProps) =
     const [nodes, setNodes, onNodesChange] = useNodesState([]);
     const [edges, setEdges, onEdgesChange] = useEdgesState([]);
 
-    // Polling for updates
-    const { data: graphData, refetch } = useQuery({
-        queryKey: ['genesis-graph', processId],
-        queryFn: async () => {
-            if (!processId) return null;
-            const res = await axios.get(`${API_URL}/${processId}`);
-            return res.data as any;
-        },
-        enabled: !!processId,
-        refetchInterval: (query) => {
-            return query.state.data?.status === 'complete' ? false : 2000; // Poll every 2s until complete
-        }
-    });
+    // Live graph: one snapshot, then only the changes are pushed over SSE.
+    // EventSource reconnects with Last-Event-ID (the graph version) and gets the missed diff.
+    const [graphData, setGraphData] = useState<any>(null);
+    useEffect(() => {
+        if (!processId) return;
+        const es = new EventSource(`${API_URL}/${processId}/stream`);
+        es.onmessage = (e) => {
+            const { event, data } = JSON.parse(e.data);
+            setGraphData((prev: any) => (event === 'snapshot' || !prev ? data : applyGraphDiff(prev, data)));
+            if (data.status === 'complete') {
+                toast.success("Campaign Generation Complete!");
+            }
+        };
+        return () => es.close();
+    }, [processId]);
 
     // Sync Graph Data to React Flow
     useEffect(() => {
@@ -142,10 +168,6 @@ export const GenesisCanvas = ({ initialInput, autoStart }: GenesisCanvasProps) =
             });
 
             setEdges(graphData.edges);
-
-            if (graphData.status === 'complete') {
-                toast.success("Campaign Generation Complete!");
-            }
         }
     }, [graphData, setNodes, setEdges]);
 
@@ -178,7 +200,6 @@ export const GenesisCanvas = ({ initialInput, autoStart }: GenesisCanvasProps) =
                 process_id: processId,
                 dialect: dialect
             });
-            refetch();
         } catch (e) {
             toast.error("Tuning failed");
         }